@@ -4,14 +4,32 @@ Main application entry point
 """
 
 import dash
-from dash import html, dcc
+from dash import html
 import dash_bootstrap_components as dbc
-from dash.dependencies import Input, Output
+from src.routes.api import api
+from src.routes.embed import embed
+from src.routes.export import export
+from src.routes.prefetch import prefetch
+from src.routes.vendor import vendor
+from src.components.search import species_search
+import src.components.occurrence_map  # noqa: F401  (registers the map callback)
+import src.components.columnar_table  # noqa: F401  (registers the table decoder)
+import src.components.ranked_bar  # noqa: F401  (registers the ranking callbacks)
+from src.utils.assets import plotly_scripts, stylesheet_url, topojson_url
+from src.utils.page_loader import load_page
+from src.utils.profiling import profile_section
 
 # Initialize the Dash app
 app = dash.Dash(
     __name__,
-    external_stylesheets=[dbc.themes.BOOTSTRAP],
+    external_stylesheets=[stylesheet_url()],
+    external_scripts=plotly_scripts(),
+    # Pages are registered below rather than found in a pages folder, so
+    # that none of them is imported when the app starts
+    use_pages=True,
+    pages_folder='',
+    # Also keeps Dash from building every page at the first request to
+    # validate the callbacks against them
     suppress_callback_exceptions=True,
     meta_tags=[
         {"name": "viewport", "content": "width=device-width, initial-scale=1"}
@@ -21,14 +39,80 @@ app = dash.Dash(
 # Server instance for deployment
 server = app.server
 
+# JSON data API under /api/, single-chart embeds under /embed/, streaming
+# downloads under /export/, page prefetching under /prefetch/ and vendored
+# CSS/topojson under /vendor/
+server.register_blueprint(api)
+server.register_blueprint(embed)
+server.register_blueprint(export)
+server.register_blueprint(prefetch)
+server.register_blueprint(vendor)
+
+# URL path -> page module in src/pages. Pages build their data and figures
+# when first loaded (once per process, see src/utils/page_loader.py), so
+# they are only built on first visit (or when their navigation link is
+# hovered, see src/routes/prefetch.py).
+PAGES = {
+    '/': 'us_overview',
+    '/global': 'global_view',
+    '/domesticated': 'domesticated',
+    '/media': 'media',
+    '/farming': 'farming',
+}
+
+# Navigation label and the assets only that page needs, prefetched with it
+PAGE_INFO = {
+    '/': ("US Overview", [topojson_url('usa_110m.json')]),
+    '/global': ("Global View", [topojson_url('world_110m.json')]),
+    '/domesticated': ("Domesticated Snakes", []),
+    '/media': ("Snakes in Media", []),
+    '/farming': ("Farming Ethics", [topojson_url('world_110m.json')]),
+}
+
+def page_layout(module_name):
+    """Layout function for dash.page_registry returning the page's prebuilt layout"""
+    def layout(**query):
+        # A cold request's profile also covers the page build
+        with profile_section(f'page-{module_name}'):
+            return load_page(module_name).layout
+    return layout
+
+def species_page(key='', **query):
+    with profile_section('page-species'):
+        return load_page('species').species_layout(key.strip('/').lower())
+
+for order, (path, module_name) in enumerate(PAGES.items()):
+    name, assets = PAGE_INFO[path]
+    dash.register_page(
+        f'src.pages.{module_name}',
+        path=path,
+        name=name,
+        title=f"Snakey Dashboard - {name}",
+        order=order,
+        layout=page_layout(module_name),
+        assets=assets,
+    )
+dash.register_page(
+    'src.pages.species',
+    path_template='/species/<key>',
+    title="Snakey Dashboard - Species",
+    layout=species_page,
+)
+# Dash shows the page whose module is named not_found_404 for unknown paths
+dash.register_page(
+    'not_found_404',
+    path='/404',
+    title="Snakey Dashboard - Page not found",
+    layout=html.Div([
+        html.H1("404: Page not found", className="text-center"),
+        html.P("The page you're looking for doesn't exist.", className="text-center")
+    ]),
+)
+
 # Navigation bar
 navbar = dbc.NavbarSimple(
     children=[
-        dbc.NavItem(dbc.NavLink("US Overview", href="/")),
-        dbc.NavItem(dbc.NavLink("Global View", href="/global")),
-        dbc.NavItem(dbc.NavLink("Domesticated Snakes", href="/domesticated")),
-        dbc.NavItem(dbc.NavLink("Snakes in Media", href="/media")),
-        dbc.NavItem(dbc.NavLink("Farming Ethics", href="/farming")),
+        dbc.NavItem(dbc.NavLink(PAGE_INFO[path][0], href=path)) for path in PAGES
     ],
     brand="Snakey Dashboard",
     brand_href="/",
@@ -37,41 +121,13 @@ navbar = dbc.NavbarSimple(
     fluid=True,
 )
 
-# App layout with URL routing
+# App layout; dash.page_container holds the current page
 app.layout = html.Div([
-    dcc.Location(id='url', refresh=False),
     navbar,
-    html.Div(id='page-content', style={'padding': '20px'})
+    species_search(),
+    html.Div(dash.page_container, style={'padding': '20px'})
 ])
 
-# Callback for page routing
-@app.callback(
-    Output('page-content', 'children'),
-    Input('url', 'pathname')
-)
-def display_page(pathname):
-    """Route to different pages based on URL"""
-    if pathname == '/':
-        from src.pages import us_overview
-        return us_overview.layout
-    elif pathname == '/global':
-        from src.pages import global_view
-        return global_view.layout
-    elif pathname == '/domesticated':
-        from src.pages import domesticated
-        return domesticated.layout
-    elif pathname == '/media':
-        from src.pages import media
-        return media.layout
-    elif pathname == '/farming':
-        from src.pages import farming
-        return farming.layout
-    else:
-        return html.Div([
-            html.H1("404: Page not found", className="text-center"),
-            html.P("The page you're looking for doesn't exist.", className="text-center")
-        ])
-
 if __name__ == '__main__':
     import os
     port = int(os.environ.get('PORT', 8050))
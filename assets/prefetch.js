@@ -0,0 +1,42 @@
+// Prefetch a page when its navigation link is hovered or focused: the server
+// builds the page (src/routes/prefetch.py) and the browser fetches the assets
+// only that page needs, so the click that follows renders without waiting.
+(function () {
+    var requested = {};
+
+    function prefetch(event) {
+        var link = event.target.closest && event.target.closest('a.nav-link');
+        if (!link || link.origin !== window.location.origin) {
+            return;
+        }
+        var path = link.pathname;
+        if (requested[path] || path === window.location.pathname) {
+            return;
+        }
+        requested[path] = true;
+        fetch('/prefetch' + path)
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.json();
+            })
+            .then(function (page) {
+                page.assets.forEach(function (url) {
+                    var hint = document.createElement('link');
+                    hint.rel = 'prefetch';
+                    hint.href = url;
+                    // plotly.js fetches topojson in cors mode; match it so the
+                    // prefetched copy is the one it finds in the cache
+                    hint.crossOrigin = 'anonymous';
+                    document.head.appendChild(hint);
+                });
+            })
+            .catch(function () {
+                delete requested[path];
+            });
+    }
+
+    document.addEventListener('mouseover', prefetch);
+    document.addEventListener('focusin', prefetch);
+})();
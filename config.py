@@ -11,6 +11,14 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 RAW_DATA_DIR = os.path.join(DATA_DIR, 'raw')
 PROCESSED_DATA_DIR = os.path.join(DATA_DIR, 'processed')
+REFERENCE_DATA_DIR = os.path.join(DATA_DIR, 'reference')  # bundled lookup tables
+
+# Rows that fail schema validation (python -m src.utils.validation --write)
+QUARANTINE_DIR = os.path.join(PROCESSED_DATA_DIR, 'quarantine')
+
+# Derived artifacts and their build manifest (python -m src.utils.build_graph)
+ARTIFACTS_DIR = os.path.join(PROCESSED_DATA_DIR, 'artifacts')
+BUILD_MANIFEST = os.path.join(PROCESSED_DATA_DIR, 'build_manifest.json')
 
 # Assets directory
 ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
@@ -42,3 +50,65 @@ MAP_SETTINGS = {
     'world_center': [20, 0],
     'world_zoom': 2
 }
+
+# Profiling settings (opt-in, see src/utils/profiling.py)
+# SNAKEY_PROFILE=1 profiles every request; otherwise a request is profiled only
+# when it carries the PROFILE_HEADER with a value matching SNAKEY_PROFILE_TOKEN.
+PROFILE_ENABLED = os.environ.get('SNAKEY_PROFILE', '').lower() in ('1', 'true', 'yes')
+PROFILE_TOKEN = os.environ.get('SNAKEY_PROFILE_TOKEN', '')
+PROFILE_HEADER = 'X-Snakey-Profile'
+PROFILE_MODE = os.environ.get('SNAKEY_PROFILE_MODE', 'sample')  # 'sample' or 'cprofile'
+PROFILE_DIR = os.environ.get('SNAKEY_PROFILE_DIR', os.path.join(BASE_DIR, 'profiles'))
+PROFILE_RETENTION = int(os.environ.get('SNAKEY_PROFILE_RETENTION', 50))
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get('SNAKEY_PROFILE_INTERVAL', 0.001))
+
+# Cold-start budget (checked by `python -m src.utils.import_budget`)
+# Modules in LAZY_MODULES must not be imported when app.py loads; they are
+# pulled in by the first page request instead.
+IMPORT_BUDGET_MS = int(os.environ.get('SNAKEY_IMPORT_BUDGET_MS', 1500))
+LAZY_MODULES = [
+    'pandas',
+    'numpy',
+    'plotly.express',
+    'src.pages',
+    'src.utils.data_loader',
+    'src.utils.visualizations',
+]
+
+# JSON data API (src/routes/api.py)
+API_DEFAULT_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+API_CACHE_MAX_AGE = 300  # seconds; clients revalidate with the ETag afterwards
+
+# Streaming export (src/routes/export.py)
+EXPORT_CHUNK_ROWS = 50000  # rows read from disk and sent per chunk
+
+# Charts re-ranked in the browser (src/components/ranked_bar.py); larger
+# data stays on the server and each interaction is a callback round-trip
+CLIENTSIDE_MAX_ROWS = 5000
+
+# Point occurrence density map (src/utils/occurrences.py)
+# Sightings files with latitude/longitude columns go in OCCURRENCE_DATA_DIR.
+# Every 256 px map tile is split into 2**OCCURRENCE_CELL_BITS cells per side.
+OCCURRENCE_DATA_DIR = os.path.join(DATA_DIR, 'occurrences')
+OCCURRENCE_MAX_ZOOM = 12
+OCCURRENCE_CELL_BITS = 4
+OCCURRENCE_MAX_CELLS = 4000  # most cells sent for one map view
+
+# Vendored third-party assets (python -m src.utils.assets), served under
+# /vendor/ with content-hashed file names so browsers can cache them for good
+VENDOR_DIR = os.path.join(BASE_DIR, 'vendor')
+VENDOR_CACHE_MAX_AGE = 365 * 24 * 3600  # seconds
+
+# Trace types in the partial plotly.js bundle (python -m src.utils.plotly_bundle);
+# scattermap needs plotly.js 2.35+, which plotly 5.24+ ships
+PLOTLY_BUNDLE_TRACES = ['bar', 'choropleth', 'histogram', 'pie', 'scatter', 'scattermap']
+
+# Single-chart embeds under /embed/ (src/routes/embed.py) and their optional
+# pre-rendered PNG/SVG fallbacks (python -m src.utils.embed, needs kaleido)
+EMBED_CACHE_MAX_AGE = 3600  # seconds; clients revalidate with the ETag afterwards
+EMBED_IMAGE_DIR = os.path.join(BASE_DIR, 'build', 'embed')
+EMBED_IMAGE_SIZE = (900, 500)  # width, height in pixels
+
+# Static pre-rendered bundle (python -m src.utils.static_site)
+STATIC_BUILD_DIR = os.path.join(BASE_DIR, 'build', 'static')
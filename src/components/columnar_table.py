@@ -0,0 +1,52 @@
+"""
+DataTable whose rows are sent in the compact columnar encoding
+
+The data goes into a dcc.Store as column arrays (src/utils/columnar.py) and
+a clientside callback rebuilds the records for the table in the browser, so
+column names are not repeated on every row of the page payload.
+"""
+
+from dash import dash_table, dcc, html, clientside_callback
+from dash.dependencies import Input, Output, MATCH
+from src.utils.columnar import encode_columns
+
+STORE_TYPE = 'columnar-store'
+TABLE_TYPE = 'columnar-table'
+
+def columnar_table(name, df, **table_props):
+    """DataTable showing df; name must be unique among the tables of a page"""
+    return html.Div([
+        dcc.Store(id={'type': STORE_TYPE, 'table': name}, data=encode_columns(df)),
+        dash_table.DataTable(id={'type': TABLE_TYPE, 'table': name}, data=[], **table_props),
+    ])
+
+clientside_callback(
+    """
+    function (payload) {
+        if (!payload) {
+            return [];
+        }
+        var names = Object.keys(payload.columns);
+        var columns = names.map(function (name) {
+            var column = payload.columns[name];
+            if (Array.isArray(column)) {
+                return column;
+            }
+            return column.codes.map(function (code) {
+                return code === null ? null : column.values[code];
+            });
+        });
+        var rows = new Array(payload.length);
+        for (var i = 0; i < payload.length; i++) {
+            var row = {};
+            for (var j = 0; j < names.length; j++) {
+                row[names[j]] = columns[j][i];
+            }
+            rows[i] = row;
+        }
+        return rows;
+    }
+    """,
+    Output({'type': TABLE_TYPE, 'table': MATCH}, 'data'),
+    Input({'type': STORE_TYPE, 'table': MATCH}, 'data'),
+)
@@ -0,0 +1,65 @@
+"""
+Density map of point occurrence records, refreshed for the visible map area
+"""
+
+import math
+from dash import dcc, callback
+from dash.dependencies import Input, Output
+from dash.exceptions import PreventUpdate
+from config import MAP_SETTINGS
+
+# Assumed size of the map in pixels, used to estimate the visible area
+# before the browser reports it
+DEFAULT_VIEW_PIXELS = (1200, 600)
+
+def occurrence_map():
+    """Graph whose cells are reloaded from the density pyramid on pan and zoom"""
+    return dcc.Graph(id='occurrence-map', config={'scrollZoom': True})
+
+def view_bounds(relayout_data):
+    """(center, zoom, (south, west, north, east)) of the map view"""
+    relayout_data = relayout_data or {}
+    center = relayout_data.get('map.center')
+    center = (center['lat'], center['lon']) if center else tuple(MAP_SETTINGS['us_center'])
+    zoom = relayout_data.get('map.zoom', MAP_SETTINGS['us_zoom'])
+
+    corners = (relayout_data.get('map._derived') or {}).get('coordinates')
+    if corners:
+        lons = [corner[0] for corner in corners]
+        lats = [corner[1] for corner in corners]
+        return center, zoom, (min(lats), lons[0], max(lats), lons[1])
+
+    # Estimate from the center: the world is 256 * 2**zoom pixels wide
+    degrees_per_pixel = 360 / (256 * 2 ** zoom)
+    half_width = DEFAULT_VIEW_PIXELS[0] / 2 * degrees_per_pixel
+    half_height = DEFAULT_VIEW_PIXELS[1] / 2 * degrees_per_pixel * math.cos(math.radians(center[0]))
+    bounds = (
+        max(center[0] - half_height, -85), center[1] - half_width,
+        min(center[0] + half_height, 85), center[1] + half_width,
+    )
+    return center, zoom, bounds
+
+# The pyramid needs NumPy, so it is imported inside the callback
+@callback(
+    Output('occurrence-map', 'figure'),
+    Input('occurrence-map', 'relayoutData'),
+)
+def update_occurrence_map(relayout_data):
+    """Load the cells of the visible area at the current zoom"""
+    from src.utils.occurrences import get_density_pyramid
+    from src.utils.visualizations import create_occurrence_density_map, figure_patch
+
+    if relayout_data and not any(key.startswith('map.') for key in relayout_data):
+        raise PreventUpdate
+    pyramid = get_density_pyramid()
+    if pyramid is None:
+        raise PreventUpdate
+    center, zoom, bounds = view_bounds(relayout_data)
+    _, lat, lon, counts = pyramid.query(math.floor(zoom), bounds)
+    fig = create_occurrence_density_map(
+        lat, lon, counts, center, zoom,
+        title=f"Snake Sightings ({pyramid.total:,} records, {len(counts):,} cells shown)",
+    )
+    # The first call draws the map; after a pan or zoom only the cells and
+    # the title change, so the rest of the figure is not resent
+    return fig if relayout_data is None else figure_patch(fig, ['title.text'])
@@ -0,0 +1,127 @@
+"""
+Top-N bar chart with controls for the number of bars and their order
+
+When the data has at most CLIENTSIDE_MAX_ROWS rows, its two columns go to
+the browser in a dcc.Store (columnar encoding, src/utils/columnar.py) and a
+clientside callback re-ranks the bars, so changing the count or the order
+never waits on the server. Larger data stays on the server: the store only
+names the dataset and columns, and a server callback sends back a Patch of
+the bar data. Showing and hiding traces is plotly's own legend toggle and
+never involves a callback.
+"""
+
+from dash import callback, clientside_callback, dcc, html
+from dash.dependencies import Input, Output, State, MATCH
+import dash_bootstrap_components as dbc
+from config import CLIENTSIDE_MAX_ROWS
+from src.utils.columnar import encode_columns
+
+TOP_OPTIONS = [5, 10, 15, 20]
+ORDER_OPTIONS = [
+    {'label': 'Highest first', 'value': 'desc'},
+    {'label': 'Lowest first', 'value': 'asc'},
+    {'label': 'A-Z', 'value': 'name'},
+]
+
+def ranked_bar(name, dataset, label, value, title, filters=None, labels=None, top_n=10, color_scale='Viridis'):
+    """Ranked bar chart of a dataset with its controls; name must be unique on the page
+
+    filters (see data_loader.DATASET_FILTERS) select the rows that are
+    ranked, both here and when the server re-ranks them. title may contain
+    '{n}' for the number of bars shown.
+    """
+    from src.utils.data_loader import filter_dataset, get_dataset
+    from src.utils.visualizations import create_ranked_bar
+
+    filters = filters or {}
+    df = filter_dataset(get_dataset(dataset), dataset, filters)
+    mode = 'client' if len(df) <= CLIENTSIDE_MAX_ROWS else 'server'
+    spec = {'label': label, 'value': value, 'title': title}
+    if mode == 'client':
+        spec['data'] = encode_columns(df[[label, value]])
+    else:
+        spec['dataset'] = dataset
+        spec['filters'] = filters
+
+    figure = create_ranked_bar(df, label, value, top_n, title=title, labels=labels, color_scale=color_scale)
+    options = [{'label': f"Top {n}", 'value': n} for n in TOP_OPTIONS] + [{'label': 'All', 'value': 0}]
+    return html.Div([
+        dcc.Store(id={'type': 'ranked-bar-spec', 'chart': name}, data=spec),
+        dbc.Row([
+            dbc.Col(dcc.Dropdown(id={'type': 'ranked-bar-top', 'chart': name, 'mode': mode},
+                                 options=options, value=top_n, clearable=False), width=3),
+            dbc.Col(dbc.RadioItems(id={'type': 'ranked-bar-order', 'chart': name, 'mode': mode},
+                                   options=ORDER_OPTIONS, value='desc', inline=True), className="pt-2"),
+        ], className="g-2"),
+        dcc.Graph(id={'type': 'ranked-bar', 'chart': name, 'mode': mode}, figure=figure),
+    ])
+
+# Same ranking as visualizations.rank_rows, on the stored columns; only the
+# bar data and the title of the figure already on the page are replaced
+clientside_callback(
+    """
+    function (top, order, spec, figure) {
+        function column(encoded) {
+            if (Array.isArray(encoded)) {
+                return encoded;
+            }
+            return encoded.codes.map(function (code) {
+                return code === null ? null : encoded.values[code];
+            });
+        }
+        var labels = column(spec.data.columns[spec.label]);
+        var values = column(spec.data.columns[spec.value]);
+        var rows = [];
+        for (var i = 0; i < spec.data.length; i++) {
+            if (values[i] !== null) {
+                rows.push([labels[i], values[i], i]);
+            }
+        }
+        // Highest first, ties in data order (a stable sort)
+        rows.sort(function (a, b) { return b[1] - a[1] || a[2] - b[2]; });
+        if (top) {
+            rows = rows.slice(0, top);
+        }
+        if (order === 'asc') {
+            rows.reverse();
+        } else if (order === 'name') {
+            rows.sort(function (a, b) { return a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : a[2] - b[2]; });
+        }
+        var x = rows.map(function (row) { return row[0]; });
+        var y = rows.map(function (row) { return row[1]; });
+        var trace = Object.assign({}, figure.data[0], {
+            x: x,
+            y: y,
+            marker: Object.assign({}, figure.data[0].marker, {color: y})
+        });
+        var title = Object.assign({}, figure.layout.title, {text: spec.title.replace('{n}', rows.length)});
+        return Object.assign({}, figure, {
+            data: [trace].concat(figure.data.slice(1)),
+            layout: Object.assign({}, figure.layout, {title: title})
+        });
+    }
+    """,
+    Output({'type': 'ranked-bar', 'chart': MATCH, 'mode': 'client'}, 'figure'),
+    Input({'type': 'ranked-bar-top', 'chart': MATCH, 'mode': 'client'}, 'value'),
+    Input({'type': 'ranked-bar-order', 'chart': MATCH, 'mode': 'client'}, 'value'),
+    State({'type': 'ranked-bar-spec', 'chart': MATCH}, 'data'),
+    State({'type': 'ranked-bar', 'chart': MATCH, 'mode': 'client'}, 'figure'),
+    prevent_initial_call=True,
+)
+
+# data_loader and plotly are imported inside the callback and the builder
+@callback(
+    Output({'type': 'ranked-bar', 'chart': MATCH, 'mode': 'server'}, 'figure'),
+    Input({'type': 'ranked-bar-top', 'chart': MATCH, 'mode': 'server'}, 'value'),
+    Input({'type': 'ranked-bar-order', 'chart': MATCH, 'mode': 'server'}, 'value'),
+    State({'type': 'ranked-bar-spec', 'chart': MATCH}, 'data'),
+    prevent_initial_call=True,
+)
+def update_ranked_bar(top, order, spec):
+    """Re-rank a chart whose data is too large to send to the browser"""
+    from src.utils.data_loader import filter_dataset, get_dataset
+    from src.utils.visualizations import create_ranked_bar, figure_patch
+
+    df = filter_dataset(get_dataset(spec['dataset']), spec['dataset'], spec['filters'])
+    fig = create_ranked_bar(df, spec['label'], spec['value'], top, order, title=spec['title'])
+    return figure_patch(fig, ['title.text'])
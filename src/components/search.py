@@ -0,0 +1,67 @@
+"""
+Species search box shown under the navigation bar on every page
+"""
+
+from dash import html, dcc, callback
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
+
+SEARCH_RESULT_LIMIT = 10
+
+def species_search():
+    """Autocomplete dropdown plus the panel that shows where a species appears"""
+    return html.Div([
+        dcc.Dropdown(
+            id='species-search',
+            placeholder="Search species across all datasets...",
+            options=[],
+            search_order='original',
+            clearable=True,
+        ),
+        html.Div(id='species-search-result', className="mt-2"),
+    ], style={'padding': '10px 20px 0 20px'})
+
+# The search index needs NumPy and the datasets, so it is imported inside the
+# callbacks rather than when the app boots
+@callback(
+    Output('species-search', 'options'),
+    Input('species-search', 'search_value'),
+    State('species-search', 'value'),
+)
+def update_search_options(search_value, value):
+    """Offer ranked, typo-tolerant matches for the text typed so far"""
+    from src.utils.search import search_species
+
+    if not search_value:
+        raise PreventUpdate
+    options = [
+        # 'search' holds the query itself so the dropdown's own client-side
+        # filtering keeps fuzzy matches that do not contain the typed text
+        {'label': match['name'], 'value': match['name'], 'search': f"{search_value} {match['name']}"}
+        for match in search_species(search_value, limit=SEARCH_RESULT_LIMIT)
+    ]
+    # Keep the current selection available so it is not cleared while typing
+    if value and value not in {option['value'] for option in options}:
+        options.append({'label': value, 'value': value, 'search': value})
+    return options
+
+@callback(
+    Output('species-search-result', 'children'),
+    Input('species-search', 'value'),
+)
+def show_search_result(value):
+    """List the datasets a selected species appears in"""
+    from src.utils.search import search_species
+    from src.utils.taxonomy import resolve_taxon
+
+    if not value:
+        return None
+    matches = search_species(value, limit=1)
+    if not matches:
+        return None
+    labels = list(dict.fromkeys(source['label'] for source in matches[0]['sources']))
+    children = [html.Strong(matches[0]['name']), f" appears in: {', '.join(labels)}"]
+    key = resolve_taxon(matches[0]['name'])
+    if key is not None:
+        children += [" · ", dcc.Link("Species profile", href=f"/species/{key}")]
+    return html.P(children, className="text-muted")
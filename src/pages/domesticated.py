@@ -3,34 +3,34 @@ Domesticated Snakes Page
 Explores snake species commonly kept as pets and their domestication history
 """
 
-from dash import html, dcc, dash_table
+from dash import html, dcc
 import dash_bootstrap_components as dbc
 import plotly.express as px
-import plotly.graph_objects as go
+from src.components.columnar_table import columnar_table
+from src.components.ranked_bar import ranked_bar
 from src.utils.data_loader import load_domesticated_snakes
-import pandas as pd
+from src.utils.figure_store import prebuilt_figure
+from src.utils.visualizations import compact_figure
 
 # Load data
 df = load_domesticated_snakes()
 
 # Create visualizations
-popularity_chart = px.bar(
-    df.sort_values('popularity_score', ascending=False).head(10),
-    x='common_name',
-    y='popularity_score',
-    title="Top 10 Most Popular Pet Snakes",
+popularity_chart = ranked_bar(
+    'popularity',
+    'domesticated_snakes',
+    label='common_name',
+    value='popularity_score',
+    title="Top {n} Most Popular Pet Snakes",
     labels={'common_name': 'Species', 'popularity_score': 'Popularity Score'},
-    color='popularity_score',
-    color_continuous_scale='Viridis'
 )
-popularity_chart.update_layout(height=400, xaxis_tickangle=-45)
 
 # Cost comparison
-cost_comparison = px.scatter(
+cost_comparison = prebuilt_figure('domesticated-cost-vs-popularity', lambda: compact_figure(px.scatter(
     df,
     x='avg_cost_usd',
     y='popularity_score',
-    size='avg_lifespan_years',
+    size='lifespan_mid_years',
     color='care_difficulty',
     hover_data=['common_name'],
     title="Cost vs Popularity (Size = Lifespan)",
@@ -44,33 +44,30 @@ cost_comparison = px.scatter(
         'Intermediate': '#F39C12',
         'Advanced': '#E74C3C'
     }
-)
-cost_comparison.update_layout(height=500)
+)).update_layout(height=500))
 
 # Domestication level pie chart
-domestication_pie = px.pie(
+domestication_pie = prebuilt_figure('domesticated-levels', lambda: compact_figure(px.pie(
     df,
     names='domestication_level',
     title="Domestication Levels",
     color_discrete_sequence=px.colors.qualitative.Set3
-)
-domestication_pie.update_layout(height=400)
+)).update_layout(height=400))
 
 # Care difficulty distribution
-care_diff_bar = px.histogram(
+care_diff_bar = prebuilt_figure('domesticated-care-difficulty', lambda: compact_figure(px.histogram(
     df,
     x='care_difficulty',
     title="Distribution by Care Difficulty",
     labels={'care_difficulty': 'Care Difficulty', 'count': 'Number of Species'},
     color_discrete_sequence=['#3498DB'],
     category_orders={'care_difficulty': ['Beginner', 'Intermediate', 'Advanced']}
-)
-care_diff_bar.update_layout(height=400)
+)).update_layout(height=400))
 
 # Temperament analysis
 temperament_data = df['temperament'].value_counts().reset_index()
 temperament_data.columns = ['temperament', 'count']
-temperament_bar = px.bar(
+temperament_bar = prebuilt_figure('domesticated-temperament', lambda: compact_figure(px.bar(
     temperament_data,
     x='temperament',
     y='count',
@@ -78,13 +75,12 @@ temperament_bar = px.bar(
     labels={'temperament': 'Temperament', 'count': 'Number of Species'},
     color='count',
     color_continuous_scale='Blues'
-)
-temperament_bar.update_layout(height=400, xaxis_tickangle=-45)
+)).update_layout(height=400, xaxis_tickangle=-45))
 
 # Timeline of domestication
 timeline_data = df.groupby('first_domesticated_era').size().reset_index(name='count')
 timeline_data = timeline_data.sort_values('first_domesticated_era')
-timeline_chart = px.bar(
+timeline_chart = prebuilt_figure('domesticated-timeline', lambda: compact_figure(px.bar(
     timeline_data,
     x='first_domesticated_era',
     y='count',
@@ -92,8 +88,7 @@ timeline_chart = px.bar(
     labels={'first_domesticated_era': 'Era', 'count': 'Species Domesticated'},
     color='count',
     color_continuous_scale='Greens'
-)
-timeline_chart.update_layout(height=400)
+)).update_layout(height=400))
 
 # Layout
 layout = dbc.Container([
@@ -142,7 +137,7 @@ layout = dbc.Container([
         dbc.Col([
             dbc.Card([
                 dbc.CardBody([
-                    html.H4(f"{df['avg_lifespan_years'].mean():.0f} yrs", className="card-title text-center"),
+                    html.H4(f"{df['lifespan_mid_years'].mean():.0f} yrs", className="card-title text-center"),
                     html.P("Average Lifespan", className="card-text text-center text-muted")
                 ])
             ], color="info", outline=True)
@@ -154,7 +149,7 @@ layout = dbc.Container([
         dbc.Col([
             dbc.Card([
                 dbc.CardBody([
-                    dcc.Graph(figure=popularity_chart)
+                    popularity_chart
                 ])
             ])
         ], width=12),
@@ -224,9 +219,10 @@ layout = dbc.Container([
         dbc.Col([
             dbc.Card([
                 dbc.CardBody([
-                    dash_table.DataTable(
-                        data=df[['common_name', 'origin', 'care_difficulty', 'avg_cost_usd',
-                                'avg_lifespan_years', 'temperament', 'domestication_level']].to_dict('records'),
+                    columnar_table(
+                        'species-details',
+                        df[['common_name', 'origin', 'care_difficulty', 'avg_cost_usd',
+                            'avg_lifespan_years', 'temperament', 'domestication_level']],
                         columns=[
                             {'name': 'Species', 'id': 'common_name'},
                             {'name': 'Origin', 'id': 'origin'},
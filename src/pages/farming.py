@@ -3,33 +3,37 @@ Snakeskin Farming Ethics Page
 Explores snakeskin farming practices and their ethical implications
 """
 
-from dash import html, dcc, dash_table
+from dash import html, dcc
 import dash_bootstrap_components as dbc
 import plotly.express as px
-import plotly.graph_objects as go
+from src.components.columnar_table import columnar_table
+from src.utils.assets import geo_graph_config
+from src.utils.countries import unresolved_countries
 from src.utils.data_loader import load_farming_data
-import pandas as pd
+from src.utils.figure_store import prebuilt_figure
+from src.utils.visualizations import compact_figure
 
 # Load data
 df = load_farming_data()
+df_with_production = df[df['production_skins'].notna()]
+unresolved = unresolved_countries('farming')
 
 # Create visualizations
 # Production by country
-production_map = px.choropleth(
-    df,
-    locations='country',
-    locationmode='country names',
-    color='annual_production_skins',
+production_map = prebuilt_figure('farming-production-map', lambda: compact_figure(px.choropleth(
+    df[df['country_iso3'].notna()],
+    locations='country_iso3',
+    locationmode='ISO-3',
+    color='production_skins',
     hover_name='country',
     hover_data=['primary_species_farmed', 'farming_method', 'ethical_score'],
     title="Annual Snakeskin Production by Country",
     color_continuous_scale='Reds',
-    labels={'annual_production_skins': 'Annual Production (skins)'}
-)
-production_map.update_layout(height=500)
+    labels={'production_skins': 'Annual Production (skins)'}
+)).update_layout(height=500))
 
 # Ethical scores by country
-ethical_bar = px.bar(
+ethical_bar = prebuilt_figure('farming-ethical-scores', lambda: compact_figure(px.bar(
     df.sort_values('ethical_score', ascending=True),
     y='country',
     x='ethical_score',
@@ -39,25 +43,23 @@ ethical_bar = px.bar(
     color='ethical_score',
     color_continuous_scale='RdYlGn',
     range_color=[0, 10]
-)
-ethical_bar.update_layout(height=600)
+)).update_layout(height=600))
 
 # Farming methods distribution
 method_counts = df['farming_method'].value_counts()
-method_pie = px.pie(
+method_pie = prebuilt_figure('farming-methods', lambda: compact_figure(px.pie(
     values=method_counts.values,
     names=method_counts.index,
     title="Distribution of Farming Methods",
     color_discrete_sequence=px.colors.qualitative.Set3
-)
-method_pie.update_layout(height=400)
+)).update_layout(height=400))
 
 # Animal welfare vs sustainability
-welfare_sustainability = px.scatter(
-    df[df['animal_welfare_rating'] != 'N/A (Wild)'],
+welfare_sustainability = prebuilt_figure('farming-welfare-vs-sustainability', lambda: compact_figure(px.scatter(
+    df_with_production[df_with_production['animal_welfare_rating'] != 'N/A (Wild)'],
     x='animal_welfare_rating',
     y='sustainability_rating',
-    size='annual_production_skins',
+    size='production_skins',
     color='ethical_score',
     hover_data=['country', 'primary_species_farmed'],
     title="Animal Welfare vs Sustainability",
@@ -67,41 +69,38 @@ welfare_sustainability = px.scatter(
         'ethical_score': 'Ethical Score'
     },
     color_continuous_scale='Viridis'
-)
-welfare_sustainability.update_layout(height=500)
+)).update_layout(height=500))
 
 # Regulation levels
 regulation_counts = df['regulation_level'].value_counts()
-regulation_bar = px.bar(
+regulation_bar = prebuilt_figure('farming-regulation', lambda: compact_figure(px.bar(
     x=regulation_counts.index,
     y=regulation_counts.values,
     title="Regulation Levels Across Countries",
     labels={'x': 'Regulation Level', 'y': 'Number of Countries'},
     color=regulation_counts.values,
     color_continuous_scale='Blues'
-)
-regulation_bar.update_layout(height=400)
+)).update_layout(height=400))
 
 # Production vs ethical score
-production_ethics = px.scatter(
-    df,
-    x='annual_production_skins',
+production_ethics = prebuilt_figure('farming-production-vs-ethics', lambda: compact_figure(px.scatter(
+    df_with_production,
+    x='production_skins',
     y='ethical_score',
-    size='annual_production_skins',
+    size='production_skins',
     color='farming_method',
     hover_data=['country', 'primary_species_farmed'],
     title="Production Volume vs Ethical Standards",
     labels={
-        'annual_production_skins': 'Annual Production (skins)',
+        'production_skins': 'Annual Production (skins)',
         'ethical_score': 'Ethical Score',
         'farming_method': 'Farming Method'
     },
     log_x=True
-)
-production_ethics.update_layout(height=500)
+)).update_layout(height=500))
 
 # Calculate aggregate statistics
-total_production = df['annual_production_skins'].sum()
+total_production = int(df['production_skins'].sum())
 avg_ethical_score = df['ethical_score'].mean()
 countries_with_certification = len(df[df['certification_available'] == 'Yes'])
 banned_countries = len(df[df['regulation_level'] == 'Strict Ban'])
@@ -172,7 +171,11 @@ layout = dbc.Container([
                         "Darker colors indicate higher production volumes.",
                         className="card-text text-muted"
                     ),
-                    dcc.Graph(figure=production_map)
+                    dcc.Graph(figure=production_map, config=geo_graph_config()),
+                    html.P(
+                        f"Not shown on the map (country not recognized): {', '.join(unresolved.index)}.",
+                        className="card-text text-muted small"
+                    ) if len(unresolved) else None
                 ])
             ])
         ])
@@ -324,10 +327,11 @@ layout = dbc.Container([
         dbc.Col([
             dbc.Card([
                 dbc.CardBody([
-                    dash_table.DataTable(
-                        data=df[['country', 'primary_species_farmed', 'farming_method',
-                                'annual_production_skins', 'ethical_score', 'animal_welfare_rating',
-                                'sustainability_rating', 'regulation_level', 'conservation_impact']].to_dict('records'),
+                    columnar_table(
+                        'country-data',
+                        df[['country', 'primary_species_farmed', 'farming_method',
+                            'annual_production_skins', 'ethical_score', 'animal_welfare_rating',
+                            'sustainability_rating', 'regulation_level', 'conservation_impact']],
                         columns=[
                             {'name': 'Country', 'id': 'country'},
                             {'name': 'Primary Species', 'id': 'primary_species_farmed'},
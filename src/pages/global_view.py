@@ -6,24 +6,24 @@ Displays snake species data across different continents
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 import plotly.express as px
-import plotly.graph_objects as go
-from src.utils.data_loader import load_global_snakes, get_snakes_by_continent
-from src.utils.visualizations import create_top_species_bar
-import pandas as pd
+from src.utils.assets import geo_graph_config
+from src.utils.countries import country_stats, get_country_bridge, unresolved_countries
+from src.utils.data_loader import grouped_stats, load_global_snakes, get_snakes_by_continent, size_stats_by
+from src.utils.figure_store import prebuilt_figure
+from src.utils.rankings import top_species
+from src.utils.visualizations import compact_figure, create_top_species_bar, create_country_choropleth
 
 # Load data
 df = load_global_snakes()
 
-# Calculate continental statistics
-continent_stats = df.groupby('continent').agg({
-    'species_name': 'count',
-    'lethality_score': 'mean',
-    'avg_length_cm': 'mean'
-}).reset_index()
-continent_stats.columns = ['continent', 'species_count', 'avg_lethality', 'avg_length']
+# Calculate continental statistics (species_name is required, so every row is a species)
+continent_lethality = grouped_stats(df, 'lethality_score', 'continent')
+continent_stats = continent_lethality[['size', 'mean']].set_axis(['species_count', 'avg_lethality'], axis=1)
+continent_stats['avg_length'] = size_stats_by(df, 'continent')['avg_length']
+continent_stats = continent_stats.reset_index()
 
 # Create continental comparison bar chart
-continent_comparison = px.bar(
+continent_comparison = prebuilt_figure('global-continent-species', lambda: compact_figure(px.bar(
     continent_stats,
     x='continent',
     y='species_count',
@@ -32,11 +32,10 @@ continent_comparison = px.bar(
     color='avg_lethality',
     color_continuous_scale='Reds',
     hover_data=['avg_lethality', 'avg_length']
-)
-continent_comparison.update_layout(height=400)
+)).update_layout(height=400))
 
 # Create lethality comparison
-lethality_comparison = px.bar(
+lethality_comparison = prebuilt_figure('global-continent-lethality', lambda: compact_figure(px.bar(
     continent_stats,
     x='continent',
     y='avg_lethality',
@@ -44,28 +43,39 @@ lethality_comparison = px.bar(
     labels={'continent': 'Continent', 'avg_lethality': 'Average Lethality Score'},
     color='avg_lethality',
     color_continuous_scale='YlOrRd'
-)
-lethality_comparison.update_layout(height=400)
+)).update_layout(height=400))
+
+# Per-country statistics from the country bridge table
+country_map = prebuilt_figure('global-country-map', lambda: create_country_choropleth(
+    country_stats(df, get_country_bridge('global_snakes')),
+    "Snake Species by Country"
+))
+unresolved_regions = unresolved_countries('global_snakes')
+
+def continent_leader(continent, metric):
+    """Common name of the continent's top species by a metric"""
+    top = top_species('global_snakes', metric, 1, by='continent', group=continent)
+    return top['common_name'].iloc[0] if len(top) else 'N/A'
 
 # World's most lethal snakes
-top_lethal_global = create_top_species_bar(
+top_lethal_global = prebuilt_figure('global-most-lethal', lambda: create_top_species_bar(
     df[df['venomous'] == 'Yes'],
     'lethality_score',
     n=15,
     title="World's 15 Most Lethal Snakes"
-)
+))
 
 # World's largest snakes
-top_largest = create_top_species_bar(
+top_largest = prebuilt_figure('global-largest', lambda: create_top_species_bar(
     df,
     'max_length_cm',
     n=10,
     title="World's 10 Largest Snakes"
-)
+))
 
 # Conservation concerns by continent
 conservation_by_continent = df.groupby(['continent', 'conservation_status']).size().reset_index(name='count')
-conservation_fig = px.bar(
+conservation_fig = prebuilt_figure('global-conservation-status', lambda: compact_figure(px.bar(
     conservation_by_continent,
     x='continent',
     y='count',
@@ -73,12 +83,11 @@ conservation_fig = px.bar(
     title="Conservation Status by Continent",
     labels={'continent': 'Continent', 'count': 'Number of Species'},
     barmode='stack'
-)
-conservation_fig.update_layout(height=400)
+)).update_layout(height=400))
 
 # Venom types by continent
 venom_by_continent = df[df['venomous'] == 'Yes'].groupby(['continent', 'venom_type']).size().reset_index(name='count')
-venom_fig = px.bar(
+venom_fig = prebuilt_figure('global-venom-types', lambda: compact_figure(px.bar(
     venom_by_continent,
     x='continent',
     y='count',
@@ -87,8 +96,7 @@ venom_fig = px.bar(
     labels={'continent': 'Continent', 'count': 'Number of Species'},
     barmode='group',
     color_discrete_sequence=px.colors.qualitative.Set2
-)
-venom_fig.update_layout(height=400)
+)).update_layout(height=400))
 
 # Layout
 layout = dbc.Container([
@@ -161,6 +169,22 @@ layout = dbc.Container([
         ], width=6),
     ], className="mb-4"),
 
+    # Country choropleth
+    dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardBody([
+                    dcc.Graph(figure=country_map, config=geo_graph_config()),
+                    html.P(
+                        f"Not shown on the map: species listed only by region "
+                        f"({', '.join(unresolved_regions.index)}).",
+                        className="card-text text-muted small"
+                    ) if len(unresolved_regions) else None
+                ])
+            ])
+        ])
+    ], className="mb-4"),
+
     # Most lethal and largest snakes
     dbc.Row([
         dbc.Col([
@@ -205,32 +229,32 @@ layout = dbc.Container([
             dbc.Accordion([
                 dbc.AccordionItem([
                     html.P(f"Species count: {len(get_snakes_by_continent('Africa'))}"),
-                    html.P(f"Most lethal: {get_snakes_by_continent('Africa').nlargest(1, 'lethality_score')['common_name'].values[0] if len(get_snakes_by_continent('Africa')) > 0 else 'N/A'}"),
-                    html.P(f"Largest: {get_snakes_by_continent('Africa').nlargest(1, 'max_length_cm')['common_name'].values[0] if len(get_snakes_by_continent('Africa')) > 0 else 'N/A'}")
+                    html.P(f"Most lethal: {continent_leader('Africa', 'lethality_score')}"),
+                    html.P(f"Largest: {continent_leader('Africa', 'max_length_cm')}")
                 ], title="Africa"),
 
                 dbc.AccordionItem([
                     html.P(f"Species count: {len(get_snakes_by_continent('Asia'))}"),
-                    html.P(f"Most lethal: {get_snakes_by_continent('Asia').nlargest(1, 'lethality_score')['common_name'].values[0] if len(get_snakes_by_continent('Asia')) > 0 else 'N/A'}"),
-                    html.P(f"Largest: {get_snakes_by_continent('Asia').nlargest(1, 'max_length_cm')['common_name'].values[0] if len(get_snakes_by_continent('Asia')) > 0 else 'N/A'}")
+                    html.P(f"Most lethal: {continent_leader('Asia', 'lethality_score')}"),
+                    html.P(f"Largest: {continent_leader('Asia', 'max_length_cm')}")
                 ], title="Asia"),
 
                 dbc.AccordionItem([
                     html.P(f"Species count: {len(get_snakes_by_continent('Australia'))}"),
-                    html.P(f"Most lethal: {get_snakes_by_continent('Australia').nlargest(1, 'lethality_score')['common_name'].values[0] if len(get_snakes_by_continent('Australia')) > 0 else 'N/A'}"),
-                    html.P(f"Largest: {get_snakes_by_continent('Australia').nlargest(1, 'max_length_cm')['common_name'].values[0] if len(get_snakes_by_continent('Australia')) > 0 else 'N/A'}")
+                    html.P(f"Most lethal: {continent_leader('Australia', 'lethality_score')}"),
+                    html.P(f"Largest: {continent_leader('Australia', 'max_length_cm')}")
                 ], title="Australia"),
 
                 dbc.AccordionItem([
                     html.P(f"Species count: {len(get_snakes_by_continent('Europe'))}"),
-                    html.P(f"Most lethal: {get_snakes_by_continent('Europe').nlargest(1, 'lethality_score')['common_name'].values[0] if len(get_snakes_by_continent('Europe')) > 0 else 'N/A'}"),
-                    html.P(f"Largest: {get_snakes_by_continent('Europe').nlargest(1, 'max_length_cm')['common_name'].values[0] if len(get_snakes_by_continent('Europe')) > 0 else 'N/A'}")
+                    html.P(f"Most lethal: {continent_leader('Europe', 'lethality_score')}"),
+                    html.P(f"Largest: {continent_leader('Europe', 'max_length_cm')}")
                 ], title="Europe"),
 
                 dbc.AccordionItem([
                     html.P(f"Species count: {len(get_snakes_by_continent('South America'))}"),
-                    html.P(f"Most lethal: {get_snakes_by_continent('South America').nlargest(1, 'lethality_score')['common_name'].values[0] if len(get_snakes_by_continent('South America')) > 0 else 'N/A'}"),
-                    html.P(f"Largest: {get_snakes_by_continent('South America').nlargest(1, 'max_length_cm')['common_name'].values[0] if len(get_snakes_by_continent('South America')) > 0 else 'N/A'}")
+                    html.P(f"Most lethal: {continent_leader('South America', 'lethality_score')}"),
+                    html.P(f"Largest: {continent_leader('South America', 'max_length_cm')}")
                 ], title="South America"),
             ], start_collapsed=True)
         ])
@@ -3,12 +3,14 @@ Snakes in Media Page
 Explores the representation of snakes in movies, TV, literature, and culture
 """
 
-from dash import html, dcc, dash_table
+from dash import html, dcc
 import dash_bootstrap_components as dbc
 import plotly.express as px
-import plotly.graph_objects as go
+from src.components.columnar_table import columnar_table
 from src.utils.data_loader import load_media_snakes
-import pandas as pd
+from src.utils.derive import IMPACT_LEVELS
+from src.utils.figure_store import prebuilt_figure
+from src.utils.visualizations import compact_figure
 
 # Load data
 df = load_media_snakes()
@@ -19,88 +21,69 @@ df_roles = df[df['protagonist_antagonist'].notna()]
 # Create visualizations
 # Protagonist vs Antagonist distribution
 role_counts = df_roles['protagonist_antagonist'].value_counts()
-role_pie = px.pie(
+role_pie = prebuilt_figure('media-roles', lambda: compact_figure(px.pie(
     values=role_counts.values,
     names=role_counts.index,
     title="Snakes as Protagonists vs Antagonists",
     color_discrete_map={'Antagonist': '#E74C3C', 'Protagonist': '#27AE60', 'Neutral': '#95A5A6'}
-)
-role_pie.update_layout(height=400)
+)).update_layout(height=400))
 
 # Media type distribution
-media_type_bar = px.histogram(
+media_type_bar = prebuilt_figure('media-types', lambda: compact_figure(px.histogram(
     df,
     x='media_type',
     title="Snake Appearances by Media Type",
     labels={'media_type': 'Media Type', 'count': 'Number of Appearances'},
     color_discrete_sequence=['#3498DB']
-)
-media_type_bar.update_layout(height=400)
+)).update_layout(height=400))
 
 # Cultural impact over time
-df['year'] = pd.to_numeric(df['year'], errors='coerce')
-df_with_year = df[df['year'].notna()].copy()
-impact_timeline = px.scatter(
+df_with_year = df[df['release_year'].notna()]
+impact_timeline = prebuilt_figure('media-impact-timeline', lambda: compact_figure(px.scatter(
     df_with_year,
-    x='year',
-    y='cultural_impact',
-    size='cultural_impact',
+    x='release_year',
+    y='impact_category',
+    size='impact_score',
     color='protagonist_antagonist',
-    hover_data=['title', 'snake_character'],
+    hover_data=['title', 'snake_character', 'cultural_impact'],
     title="Cultural Impact of Snake Characters Over Time",
     labels={
-        'year': 'Year',
-        'cultural_impact': 'Cultural Impact',
+        'release_year': 'Year',
+        'impact_category': 'Cultural Impact',
         'protagonist_antagonist': 'Role'
     },
+    category_orders={'impact_category': IMPACT_LEVELS},
     color_discrete_map={
         'Antagonist': '#E74C3C',
         'Protagonist': '#27AE60',
         'Neutral': '#95A5A6',
         'N/A': '#BDC3C7'
     }
-)
-impact_timeline.update_layout(height=500)
+)).update_layout(height=500))
 
 # Accuracy rating analysis
-df_with_accuracy = df[df['accuracy_rating'] != 'N/A'].copy()
-df_with_accuracy['accuracy_rating'] = pd.to_numeric(df_with_accuracy['accuracy_rating'])
-accuracy_hist = px.histogram(
+df_with_accuracy = df[df['accuracy_score'].notna()]
+accuracy_hist = prebuilt_figure('media-accuracy', lambda: compact_figure(px.histogram(
     df_with_accuracy,
-    x='accuracy_rating',
+    x='accuracy_score',
     nbins=10,
     title="Accuracy of Snake Portrayals (0-10 scale)",
-    labels={'accuracy_rating': 'Accuracy Rating', 'count': 'Number of Portrayals'},
+    labels={'accuracy_score': 'Accuracy Rating', 'count': 'Number of Portrayals'},
     color_discrete_sequence=['#9B59B6']
-)
-accuracy_hist.update_layout(height=400)
+)).update_layout(height=400))
 
 # Cultural impact categories
-df['impact_category'] = df['cultural_impact'].apply(
-    lambda x: 'Very High' if 'Very High' in str(x)
-    else 'High' if 'High' in str(x)
-    else 'Medium' if 'Medium' in str(x)
-    else 'Low'
-)
-impact_bar = px.histogram(
+impact_bar = prebuilt_figure('media-impact', lambda: compact_figure(px.histogram(
     df,
     x='impact_category',
     title="Distribution of Cultural Impact",
     labels={'impact_category': 'Impact Level', 'count': 'Number of Appearances'},
     color_discrete_sequence=['#E67E22'],
-    category_orders={'impact_category': ['Very High', 'High', 'Medium', 'Low']}
-)
-impact_bar.update_layout(height=400)
+    category_orders={'impact_category': IMPACT_LEVELS}
+)).update_layout(height=400))
 
 # Top influential snake characters
-df_ranked = df_with_year.copy()
-df_ranked['impact_score'] = df_ranked['cultural_impact'].apply(
-    lambda x: 4 if 'Very High' in str(x)
-    else 3 if 'High' in str(x)
-    else 2 if 'Medium' in str(x)
-    else 1
-)
-top_influential = df_ranked.nlargest(10, 'impact_score')[['title', 'snake_character', 'year', 'protagonist_antagonist']]
+top_influential = df_with_year.nlargest(10, 'impact_score')[['title', 'snake_character', 'year', 'protagonist_antagonist']]
 
 # Layout
 layout = dbc.Container([
@@ -149,7 +132,7 @@ layout = dbc.Container([
         dbc.Col([
             dbc.Card([
                 dbc.CardBody([
-                    html.H4(f"{df_with_accuracy['accuracy_rating'].mean():.1f}/10", className="card-title text-center"),
+                    html.H4(f"{df_with_accuracy['accuracy_score'].mean():.1f}/10", className="card-title text-center"),
                     html.P("Avg Accuracy", className="card-text text-center text-muted")
                 ])
             ], color="warning", outline=True)
@@ -231,7 +214,7 @@ layout = dbc.Container([
                 dbc.CardBody([
                     html.H5("Accuracy Concerns", className="card-title text-warning"),
                     html.P(
-                        f"The average accuracy rating of {df_with_accuracy['accuracy_rating'].mean():.1f}/10 "
+                        f"The average accuracy rating of {df_with_accuracy['accuracy_score'].mean():.1f}/10 "
                         "indicates that most media portrayals take significant creative liberties with snake "
                         "behavior, size, and capabilities, often for dramatic effect."
                     )
@@ -273,9 +256,10 @@ layout = dbc.Container([
         dbc.Col([
             dbc.Card([
                 dbc.CardBody([
-                    dash_table.DataTable(
-                        data=df[['title', 'media_type', 'year', 'snake_character', 'role',
-                                'protagonist_antagonist', 'cultural_impact', 'accuracy_rating']].to_dict('records'),
+                    columnar_table(
+                        'appearances',
+                        df[['title', 'media_type', 'year', 'snake_character', 'role',
+                            'protagonist_antagonist', 'cultural_impact', 'accuracy_rating']],
                         columns=[
                             {'name': 'Title', 'id': 'title'},
                             {'name': 'Type', 'id': 'media_type'},
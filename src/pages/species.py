@@ -0,0 +1,93 @@
+"""
+Species Detail Page
+Gathers everything the datasets know about one species (or genus) at /species/<key>
+"""
+
+from dash import html, dcc
+import dash_bootstrap_components as dbc
+from src.components.columnar_table import columnar_table
+from src.utils.taxonomy import get_taxon_index, get_taxon_rows, genus_of
+
+# Dataset -> (section title, [(column, header)]) shown on the page, in order
+SECTIONS = {
+    'global_snakes': ("Global Distribution & Lethality", [
+        ('common_name', 'Species'), ('continent', 'Continent'), ('venomous', 'Venomous'),
+        ('venom_type', 'Venom Type'), ('lethality_score', 'Lethality'),
+        ('max_length_cm', 'Max Length (cm)'), ('conservation_status', 'Conservation'),
+    ]),
+    'us_snakes': ("In the United States", [
+        ('common_name', 'Species'), ('states', 'States'), ('venomous', 'Venomous'),
+        ('lethality_score', 'Lethality'), ('invasive', 'Invasive'),
+        ('conservation_status', 'Conservation'),
+    ]),
+    'domesticated_snakes': ("As a Pet", [
+        ('common_name', 'Species'), ('care_difficulty', 'Care Level'), ('avg_cost_usd', 'Cost (USD)'),
+        ('avg_lifespan_years', 'Lifespan (years)'), ('temperament', 'Temperament'),
+        ('popularity_score', 'Popularity'),
+    ]),
+    'farming': ("Snakeskin Farming", [
+        ('country', 'Country'), ('primary_species_farmed', 'Species'), ('farming_method', 'Method'),
+        ('annual_production_skins', 'Annual Production'), ('ethical_score', 'Ethical Score'),
+    ]),
+    'media_snakes': ("In Media", [
+        ('title', 'Title'), ('media_type', 'Type'), ('year', 'Year'),
+        ('snake_species_portrayed', 'Portrayed As'), ('protagonist_antagonist', 'Role'),
+    ]),
+}
+
+def section_table(name, df, columns):
+    return columnar_table(
+        name, df[[column for column, _ in columns]],
+        columns=[{'name': header, 'id': column} for column, header in columns],
+        style_cell={
+            'textAlign': 'left',
+            'padding': '10px',
+            'font-family': 'sans-serif'
+        },
+        style_header={
+            'backgroundColor': '#2C3E50',
+            'color': 'white',
+            'fontWeight': 'bold'
+        },
+    )
+
+def species_layout(key):
+    """Layout for one taxon key"""
+    index = get_taxon_index()
+    if key not in index:
+        return dbc.Container([
+            html.H1("Species not found", className="mt-4 mb-4 text-center"),
+            html.P(f"No dataset mentions '{key}'. Use the search box to find a species.",
+                   className="text-center"),
+        ])
+
+    rows = get_taxon_rows(key)
+    is_genus = '-' not in key
+    if is_genus:
+        title = f"Genus {key.capitalize()}"
+        related = []
+        for member in index.species_of_genus(key):
+            related.append(" · " if related else "Species: ")
+            related.append(dcc.Link(index.resolver.display_name(member), href=f"/species/{member}"))
+    else:
+        title = index.resolver.display_name(key)
+        genus = genus_of(key)
+        related = [dcc.Link(f"All {genus.capitalize()} species", href=f"/species/{genus}")]
+
+    sections = []
+    for dataset, (section_title, columns) in SECTIONS.items():
+        if dataset in rows:
+            sections.append(dbc.Row([
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardHeader(html.H4(section_title)),
+                        dbc.CardBody([section_table(dataset, rows[dataset], columns)])
+                    ])
+                ], width=12)
+            ], className="mb-4"))
+
+    return dbc.Container([
+        html.H1(title, className="mt-4 mb-2 text-center"),
+        html.P(related, className="text-center text-muted mb-4"),
+        *sections,
+    ], fluid=True)
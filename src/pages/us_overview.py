@@ -5,7 +5,11 @@ Displays heatmaps and visualizations for snake species across the United States
 
 from dash import html, dcc
 import dash_bootstrap_components as dbc
+from src.components.occurrence_map import occurrence_map
+from src.utils.assets import geo_graph_config
 from src.utils.data_loader import load_us_snakes, get_lethality_stats, get_size_stats
+from src.utils.figure_store import prebuilt_figure
+from src.utils.occurrences import occurrence_files
 from src.utils.visualizations import (
     create_lethality_heatmap,
     create_size_distribution,
@@ -23,17 +27,17 @@ size_stats = get_size_stats(df)
 invasive_info = create_invasive_species_indicator(df)
 
 # Create visualizations
-lethality_map = create_lethality_heatmap(df, "Average Snake Lethality by US State")
-size_dist = create_size_distribution(df, "Distribution of Snake Sizes in the US")
-venom_pie = create_venom_type_pie(df, "Venom Types of US Snakes")
-conservation_bar = create_conservation_status_bar(df, "Conservation Status of US Snakes")
-top_lethal = create_top_species_bar(
+lethality_map = prebuilt_figure('us-lethality-map', lambda: create_lethality_heatmap(df, "Average Snake Lethality by US State"))
+size_dist = prebuilt_figure('us-size-distribution', lambda: create_size_distribution(df, "Distribution of Snake Sizes in the US"))
+venom_pie = prebuilt_figure('us-venom-types', lambda: create_venom_type_pie(df, "Venom Types of US Snakes"))
+conservation_bar = prebuilt_figure('us-conservation-status', lambda: create_conservation_status_bar(df, "Conservation Status of US Snakes"))
+top_lethal = prebuilt_figure('us-most-lethal', lambda: create_top_species_bar(
     df[df['venomous'] == 'Yes'],
     'lethality_score',
     n=10,
     title="Top 10 Most Lethal US Snakes"
-)
-size_vs_lethality = create_scatter_size_vs_lethality(df, "Snake Size vs Lethality in the US")
+))
+size_vs_lethality = prebuilt_figure('us-size-vs-lethality', lambda: create_scatter_size_vs_lethality(df, "Snake Size vs Lethality in the US"))
 
 # Calculate statistics
 total_species = len(df)
@@ -92,12 +96,29 @@ layout = dbc.Container([
                         "Darker red indicates higher average lethality.",
                         className="card-text text-muted"
                     ),
-                    dcc.Graph(figure=lethality_map) if lethality_map else html.P("Map unavailable")
+                    dcc.Graph(figure=lethality_map, config=geo_graph_config()) if lethality_map else html.P("Map unavailable")
                 ])
             ])
         ])
     ], className="mb-4"),
 
+    # Sightings density map, shown when occurrence files are present
+    dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardBody([
+                    html.H5("Sightings Density", className="card-title"),
+                    html.P(
+                        "Individual sighting records aggregated into map cells. Zoom in to see finer cells; "
+                        "only the cells in view are loaded.",
+                        className="card-text text-muted"
+                    ),
+                    occurrence_map()
+                ])
+            ])
+        ])
+    ], className="mb-4") if occurrence_files() else None,
+
     # Two column row for venom types and conservation
     dbc.Row([
         dbc.Col([
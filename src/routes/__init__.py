@@ -0,0 +1 @@
+# HTTP routes served alongside the Dash app
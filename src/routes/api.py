@@ -0,0 +1,253 @@
+"""
+Read-only JSON API for the Snakey datasets
+
+Every endpoint reads from the shared dataset cache in data_loader.py and
+supports:
+- pagination: ?page=2&per_page=25 (per_page is capped at API_MAX_PAGE_SIZE)
+- field projection: ?fields=common_name,lethality_score
+- conditional requests: responses carry an ETag built from the dataset's
+  content hash and the query, and a matching If-None-Match returns 304
+"""
+
+import hashlib
+import math
+from flask import Blueprint, abort, jsonify, make_response, request
+from werkzeug.exceptions import HTTPException
+from config import API_DEFAULT_PAGE_SIZE, API_MAX_PAGE_SIZE, API_CACHE_MAX_AGE
+
+# data_loader (and pandas) are imported inside the views so that registering
+# the blueprint does not add to the app's cold-start time
+api = Blueprint('api', __name__, url_prefix='/api')
+
+@api.errorhandler(HTTPException)
+def handle_http_error(error):
+    """Return API errors as JSON instead of HTML"""
+    return jsonify({'error': error.description, 'status': error.code}), error.code
+
+def int_arg(name, default, maximum=None):
+    """Read a positive integer query parameter"""
+    value = request.args.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        abort(400, description=f"'{name}' must be an integer")
+    if value < 1:
+        abort(400, description=f"'{name}' must be at least 1")
+    return min(value, maximum) if maximum else value
+
+def project_fields(df):
+    """Apply the ?fields= projection, rejecting unknown columns"""
+    fields = request.args.get('fields')
+    if not fields:
+        return df
+    columns = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [column for column in columns if column not in df.columns]
+    if unknown:
+        abort(400, description=f"Unknown field(s): {', '.join(unknown)}")
+    return df[columns]
+
+def to_records(df):
+    """Convert a frame to JSON-safe records (missing values become null)"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+def request_etag(*datasets):
+    """ETag for the current request: dataset content hashes plus the query"""
+    from src.utils.data_loader import get_dataset_version
+
+    key = '|'.join([get_dataset_version(name) for name in datasets] + [request.full_path])
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def cacheable(response, etag):
+    """Attach validators and caching headers to a response"""
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = API_CACHE_MAX_AGE
+    return response
+
+def json_page(df, *datasets):
+    """Paginated, projected, ETag-validated JSON response for a frame"""
+    # The query is validated first, so an invalid URL never gets a 304
+    df = project_fields(df)
+    page = int_arg('page', 1)
+    per_page = int_arg('per_page', API_DEFAULT_PAGE_SIZE, maximum=API_MAX_PAGE_SIZE)
+    etag = request_etag(*datasets)
+    if etag in request.if_none_match:
+        return cacheable(make_response('', 304), etag)
+
+    total = len(df)
+    window = df.iloc[(page - 1) * per_page:page * per_page]
+
+    response = jsonify({
+        'data': to_records(window),
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': math.ceil(total / per_page),
+    })
+    return cacheable(response, etag)
+
+@api.route('/')
+def index():
+    """List the available endpoints"""
+    return jsonify({
+        'endpoints': [
+            '/api/us/states/<state>/species',
+            '/api/global/continents/<continent>/species',
+            '/api/species/most-lethal?scope=global|us',
+            '/api/top/<dataset>/<metric>?n=10&by=<filter>&<filter>=<value>',
+            '/api/farming/countries',
+            '/api/farming/countries/<country>',
+            '/api/media/roles/<role>',
+            '/api/search?q=<name>&limit=10',
+            '/api/taxa/<key>',
+            '/api/occurrences/density?zoom=4&bounds=south,west,north,east',
+        ],
+        'parameters': ['page', 'per_page', 'fields'],
+    })
+
+@api.route('/us/states/<state>/species')
+def species_by_state(state):
+    """US species found in one state (two-letter abbreviation)"""
+    from src.utils.data_loader import get_us_snake_by_state
+
+    if len(state) != 2 or not state.isalpha():
+        abort(400, description="State must be a two-letter abbreviation such as 'FL'")
+    return json_page(get_us_snake_by_state(state), 'us_snakes')
+
+@api.route('/global/continents/<continent>/species')
+def species_by_continent(continent):
+    """Global species found on one continent"""
+    from src.utils.data_loader import load_global_snakes
+
+    df = load_global_snakes()
+    match = df['continent'].str.lower() == continent.strip().lower()
+    if not match.any():
+        abort(404, description=f"Unknown continent: {continent}")
+    return json_page(df[match], 'global_snakes')
+
+@api.route('/species/most-lethal')
+def most_lethal_species():
+    """Venomous species ordered by lethality score, most lethal first"""
+    from src.utils.data_loader import load_us_snakes, load_global_snakes, get_venomous_snakes
+
+    scope = request.args.get('scope', 'global')
+    loaders = {'global': ('global_snakes', load_global_snakes), 'us': ('us_snakes', load_us_snakes)}
+    if scope not in loaders:
+        abort(400, description="'scope' must be 'global' or 'us'")
+    dataset, loader = loaders[scope]
+    venomous = get_venomous_snakes(loader())
+    return json_page(venomous.sort_values('lethality_score', ascending=False, kind='stable'), dataset)
+
+@api.route('/top/<dataset>/<metric>')
+def top_species(dataset, metric):
+    """Top n rows of a dataset by a metric, overall or within every group of ?by="""
+    from src.utils.rankings import RANKED_METRICS, top_species as overall, top_species_by
+
+    if dataset not in RANKED_METRICS:
+        abort(404, description=f"Unknown dataset: {dataset}. Available: {', '.join(RANKED_METRICS)}")
+    args = request.args.to_dict()
+    for name in ('page', 'per_page', 'fields', 'n'):
+        args.pop(name, None)
+    by = args.pop('by', None)
+    n = int_arg('n', 10, maximum=API_MAX_PAGE_SIZE)
+    try:
+        if by is None:
+            top = overall(dataset, metric, n, filters=args)
+        else:
+            top = top_species_by(dataset, metric, by, n, filters=args)
+    except ValueError as e:
+        abort(400, description=str(e))
+    return json_page(top, dataset)
+
+@api.route('/farming/countries')
+def farming_countries():
+    """Snakeskin farming data for every country"""
+    from src.utils.data_loader import load_farming_data
+
+    return json_page(load_farming_data(), 'farming')
+
+@api.route('/farming/countries/<country>')
+def farming_country(country):
+    """Snakeskin farming data for one country"""
+    from src.utils.data_loader import load_farming_data
+
+    df = load_farming_data()
+    match = df['country'].str.lower() == country.strip().lower()
+    if not match.any():
+        abort(404, description=f"No farming data for: {country}")
+    return json_page(df[match], 'farming')
+
+@api.route('/media/roles/<role>')
+def media_by_role(role):
+    """Media appearances where the snake is a protagonist, antagonist or neutral"""
+    from src.utils.data_loader import load_media_snakes
+
+    df = load_media_snakes()
+    match = df['protagonist_antagonist'].str.lower() == role.strip().lower()
+    if not match.any():
+        roles = ', '.join(sorted(df['protagonist_antagonist'].dropna().unique()))
+        abort(404, description=f"Unknown role: {role}. Available roles: {roles}")
+    return json_page(df[match], 'media_snakes')
+
+@api.route('/search')
+def search():
+    """Fuzzy species name search across every dataset"""
+    from src.utils.search import search_species
+
+    query = request.args.get('q', '').strip()
+    if not query:
+        abort(400, description="'q' is required")
+    limit = int_arg('limit', 10, maximum=API_MAX_PAGE_SIZE)
+    return jsonify({'query': query, 'data': search_species(query, limit=limit)})
+
+@api.route('/taxa/<key>')
+def taxon(key):
+    """Every dataset's rows for a taxon key (species or genus)"""
+    from src.utils.taxonomy import TAXON_FIELDS, get_taxon_index, get_taxon_rows
+
+    key = key.strip().lower()
+    index = get_taxon_index()
+    if key not in index:
+        abort(404, description=f"Unknown taxon: {key}")
+    etag = request_etag(*sorted(TAXON_FIELDS))
+    if etag in request.if_none_match:
+        return cacheable(make_response('', 304), etag)
+    response = jsonify({
+        'key': key,
+        'name': index.resolver.display_name(key),
+        'datasets': {name: to_records(df) for name, df in get_taxon_rows(key).items()},
+    })
+    return cacheable(response, etag)
+
+@api.route('/occurrences/density')
+def occurrence_density():
+    """Sighting counts per map cell for a zoom level and visible area"""
+    from src.utils.occurrences import get_density_pyramid
+
+    pyramid = get_density_pyramid()
+    if pyramid is None:
+        abort(404, description="No occurrence data is loaded")
+    try:
+        zoom = float(request.args.get('zoom', 0))
+    except ValueError:
+        zoom = math.nan
+    if not math.isfinite(zoom):
+        abort(400, description="'zoom' must be a number")
+    bounds = None
+    if request.args.get('bounds'):
+        try:
+            bounds = [float(value) for value in request.args['bounds'].split(',')]
+        except ValueError:
+            bounds = []
+        if len(bounds) != 4 or not all(math.isfinite(value) for value in bounds):
+            abort(400, description="'bounds' must be south,west,north,east")
+    level, lat, lon, counts = pyramid.query(math.floor(zoom), bounds)
+    return jsonify({
+        'zoom': level,
+        'total': pyramid.total,
+        'cells': {
+            'lat': lat.round(5).tolist(),
+            'lon': lon.round(5).tolist(),
+            'count': counts.tolist(),
+        },
+    })
@@ -0,0 +1,145 @@
+"""
+Single-chart embeds under /embed/
+
+/embed/<chart_id> is a minimal HTML page that draws one dashboard figure
+with plotly.js and nothing else: no navbar, Bootstrap or Dash renderer. It
+is meant for an <iframe> on another site and fills the frame:
+
+    <iframe src="https://.../embed/us-lethality-map" width="100%" height="450"></iframe>
+
+/embed/<chart_id>.png and .svg are static images of the same figure,
+pre-rendered with `python -m src.utils.embed --images` or rendered on first
+request when kaleido is installed. The page shows the PNG to visitors
+without JavaScript if one is available. Responses carry an ETag built from
+the figure and can be cached for EMBED_CACHE_MAX_AGE; /embed/ lists the
+chart ids.
+"""
+
+import hashlib
+import html
+import json
+import os
+import threading
+from flask import Blueprint, abort, jsonify, make_response, request, send_file, url_for
+from config import EMBED_CACHE_MAX_AGE, VENDOR_CACHE_MAX_AGE
+from src.utils.embed import EMBED_CHARTS, cached_image, chart_json, chart_title, render_image
+
+embed = Blueprint('embed', __name__, url_prefix='/embed')
+
+EMBED_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<style>html, body, #chart {{ width: 100%; height: 100%; margin: 0; }}</style>
+</head>
+<body>
+<div id="chart">{fallback}</div>
+<script type="application/json" id="figure">{figure}</script>
+<script type="application/json" id="config">{config}</script>
+<script src="{plotly}"></script>
+<script>
+var figure = JSON.parse(document.getElementById('figure').textContent);
+var config = JSON.parse(document.getElementById('config').textContent);
+// Fill the frame rather than keep the height the dashboard gives the chart
+delete figure.layout.height;
+figure.layout.autosize = true;
+Plotly.newPlot('chart', figure.data, figure.layout, config);
+</script>
+</body>
+</html>
+"""
+
+# Chart id -> (page HTML, ETag), built once per process
+_pages = {}
+_pages_lock = threading.Lock()
+
+def plotly_url():
+    """The vendored plotly.js bundle, else the one shipped with the plotly package"""
+    from plotly.offline import get_plotlyjs_version
+    from src.utils.assets import vendor_url
+
+    return vendor_url('plotly.js') or url_for('embed.plotly_js', version=get_plotlyjs_version())
+
+def chart_or_404(chart_id):
+    if chart_id not in EMBED_CHARTS:
+        abort(404, description=f"Unknown chart: {chart_id}. See /embed/ for the available charts")
+
+def cached(response, etag):
+    """Attach the ETag and caching headers; answers a matching If-None-Match with 304"""
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = EMBED_CACHE_MAX_AGE
+    return response
+
+def embed_page(chart_id):
+    """(HTML, ETag) of a chart's embed page"""
+    cached = _pages.get(chart_id)
+    if cached is not None:
+        return cached
+    from src.utils.assets import geo_graph_config
+
+    figure, _ = chart_json(chart_id)
+    with _pages_lock:
+        cached = _pages.get(chart_id)
+        if cached is not None:
+            return cached
+        config = {'responsive': True, 'displaylogo': False, **geo_graph_config()}
+        image = cached_image(chart_id, 'png')
+        fallback = ''
+        if image:
+            fallback = (f'<noscript><img src="{url_for("embed.chart_image", chart_id=chart_id, fmt="png")}" '
+                        f'alt="{html.escape(chart_title(chart_id))}" style="width: 100%"></noscript>')
+        page = EMBED_TEMPLATE.format(
+            title=html.escape(chart_title(chart_id)),
+            fallback=fallback,
+            figure=figure.replace('</', '<\\/'),
+            config=json.dumps(config),
+            plotly=html.escape(plotly_url()),
+        )
+        cached = (page, hashlib.sha1(page.encode()).hexdigest()[:16])
+        _pages[chart_id] = cached
+    return cached
+
+@embed.route('/')
+def index():
+    """List the embeddable charts"""
+    return jsonify({'charts': {chart_id: url_for('embed.chart', chart_id=chart_id) for chart_id in EMBED_CHARTS}})
+
+@embed.route('/<chart_id>')
+def chart(chart_id):
+    """Minimal HTML page drawing one chart"""
+    chart_or_404(chart_id)
+    page, etag = embed_page(chart_id)
+    return cached(make_response(page), etag)
+
+@embed.route('/<chart_id>.<any(png, svg):fmt>')
+def chart_image(chart_id, fmt):
+    """Static image of one chart"""
+    chart_or_404(chart_id)
+    path = cached_image(chart_id, fmt)
+    if path is None:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            abort(501, description=("No pre-rendered image; run `python -m src.utils.embed --images` "
+                                    "or install kaleido (pip install kaleido)"))
+        path = render_image(chart_id, fmt)
+    return cached(send_file(path, conditional=False), chart_json(chart_id)[1])
+
+@embed.route('/plotly-<version>.min.js')
+def plotly_js(version):
+    """plotly.js from the plotly package, under a versioned name so it can be cached for good"""
+    import plotly
+    from plotly.offline import get_plotlyjs_version
+
+    if version != get_plotlyjs_version():
+        abort(404)
+    path = os.path.join(os.path.dirname(plotly.__file__), 'package_data', 'plotly.min.js')
+    response = send_file(path, max_age=VENDOR_CACHE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
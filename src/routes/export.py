@@ -0,0 +1,153 @@
+"""
+Streaming bulk export of the Snakey datasets
+
+    /export/<dataset>.<csv|jsonl|parquet>?<filter>=<value>&fields=a,b
+
+Datasets are read from disk EXPORT_CHUNK_ROWS rows at a time, filtered with
+the same filters as the dashboard and API (data_loader.DATASET_FILTERS) and
+sent to the client chunk by chunk, so memory use stays flat however large
+the file is. Parquet export needs the optional pyarrow package.
+"""
+
+from flask import Blueprint, Response, abort, jsonify, request
+from werkzeug.exceptions import HTTPException
+from config import EXPORT_CHUNK_ROWS
+
+export = Blueprint('export', __name__, url_prefix='/export')
+
+MIMETYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+@export.errorhandler(HTTPException)
+def handle_http_error(error):
+    """Return export errors as JSON instead of HTML"""
+    return jsonify({'error': error.description, 'status': error.code}), error.code
+
+class ChunkSink:
+    """Write-only file object that hands written bytes out as they arrive
+
+    tell() keeps counting across take() calls, so writers that record file
+    offsets (the Parquet footer does) still see the true stream position.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.buffer += data
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+def filtered_chunks(name, filters, fields):
+    """Yield filtered (and projected) chunks of a dataset"""
+    from src.utils.data_loader import DATASET_FILTERS, filter_dataset, iter_dataset_chunks
+
+    usecols = None
+    if fields:
+        filter_columns = [DATASET_FILTERS[name][key] for key in filters]
+        usecols = list(dict.fromkeys(fields + filter_columns))
+    for chunk in iter_dataset_chunks(name, EXPORT_CHUNK_ROWS, usecols=usecols):
+        chunk = filter_dataset(chunk, name, filters)
+        yield chunk[fields] if fields else chunk
+
+def stream_csv(chunks):
+    """CSV with a single header row"""
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header)
+        header = False
+
+def stream_jsonl(chunks):
+    """One JSON object per line"""
+    for chunk in chunks:
+        if len(chunk):
+            text = chunk.to_json(orient='records', lines=True, force_ascii=False)
+            yield text if text.endswith('\n') else text + '\n'
+
+def parquet_schema(dtypes):
+    """Arrow schema of an export from the declared dtypes (data_loader.dataset_dtypes)"""
+    import pyarrow as pa
+
+    return pa.schema([
+        (column, pa.float64() if dtype == 'float64' else pa.string())
+        for column, dtype in dtypes.items()
+    ])
+
+def stream_parquet(chunks, dtypes):
+    """Parquet file with one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = ChunkSink()
+    schema = parquet_schema(dtypes)
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema)
+    for chunk in chunks:
+        if len(chunk):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        data = sink.take()
+        if data:
+            yield data
+    writer.close()
+    yield sink.take()
+
+WRITERS = {
+    'csv': stream_csv,
+    'jsonl': stream_jsonl,
+}
+
+@export.route('/<dataset>.<any(csv, jsonl, parquet):fmt>')
+def export_dataset(dataset, fmt):
+    """Stream a filtered dataset as CSV, JSON Lines or Parquet"""
+    from src.utils.data_loader import DATASET_FILES, DATASET_FILTERS, dataset_dtypes, read_dataset_columns
+
+    if dataset not in DATASET_FILES:
+        abort(404, description=f"Unknown dataset: {dataset}. Available: {', '.join(DATASET_FILES)}")
+
+    # Validate everything up front: once streaming starts the status is sent
+    args = request.args.to_dict()
+    fields = [field.strip() for field in args.pop('fields', '').split(',') if field.strip()]
+    unknown_filters = [key for key in args if key not in DATASET_FILTERS[dataset]]
+    if unknown_filters:
+        abort(400, description=(
+            f"Unknown filter(s): {', '.join(unknown_filters)}. "
+            f"Available: {', '.join(DATASET_FILTERS[dataset])}"
+        ))
+    unknown_fields = [field for field in fields if field not in read_dataset_columns(dataset)]
+    if unknown_fields:
+        abort(400, description=f"Unknown field(s): {', '.join(unknown_fields)}")
+    if fmt == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            abort(501, description="Parquet export requires pyarrow (pip install pyarrow)")
+
+    chunks = filtered_chunks(dataset, args, fields)
+    if fmt == 'parquet':
+        dtypes = dataset_dtypes(dataset)
+        body = stream_parquet(chunks, {column: dtypes[column] for column in fields or dtypes})
+    else:
+        body = WRITERS[fmt](chunks)
+    return Response(
+        body,
+        mimetype=MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{dataset}.{fmt}"'},
+    )
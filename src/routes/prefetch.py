@@ -0,0 +1,25 @@
+"""
+Page prefetching under /prefetch/
+
+assets/prefetch.js requests /prefetch/<page path> when a navigation link is
+hovered. Building the page here means the click that follows finds its
+layout ready, and the response lists the assets only that page needs (its
+'assets' in dash.page_registry) for the browser to prefetch.
+"""
+
+import dash
+from flask import Blueprint, abort, jsonify
+
+prefetch = Blueprint('prefetch', __name__, url_prefix='/prefetch')
+
+@prefetch.route('/', defaults={'path': ''})
+@prefetch.route('/<path:path>')
+def prefetch_page(path):
+    for page in dash.page_registry.values():
+        if page['path_template'] is None and page['path'].strip('/') == path.strip('/'):
+            break
+    else:
+        abort(404)
+    if callable(page['layout']):
+        page['layout']()
+    return jsonify({'path': page['path'], 'assets': page.get('assets', [])})
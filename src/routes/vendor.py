@@ -0,0 +1,24 @@
+"""
+Vendored third-party assets under /vendor/
+
+Assets in VENDOR_DIR have content-hashed names (see src/utils/assets.py), so
+such a name never changes content and responses can be cached for good.
+Only those names are served: manifest.json and anything else without a
+hash changes in place, so it is not public.
+"""
+
+from flask import Blueprint, abort, send_from_directory
+from config import VENDOR_DIR, VENDOR_CACHE_MAX_AGE
+from src.utils.assets import VENDORED_NAME
+
+vendor = Blueprint('vendor', __name__, url_prefix='/vendor')
+
+@vendor.route('/<path:filename>')
+def vendored_file(filename):
+    # A hashed directory (topojson.<hash>/) covers the files inside it
+    if not VENDORED_NAME.match(filename.split('/', 1)[0]):
+        abort(404)
+    response = send_from_directory(VENDOR_DIR, filename, max_age=VENDOR_CACHE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
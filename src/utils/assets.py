@@ -0,0 +1,214 @@
+"""
+Vendored third-party assets
+
+Usage:
+    python -m src.utils.assets [--source DIR]
+
+By default the page stylesheet (Bootstrap) comes from a CDN, and plotly.js
+downloads the topojson outlines of geo maps from cdn.plot.ly the first time
+a map is drawn. This command stores local copies in VENDOR_DIR under
+content-hashed names (bootstrap.<hash>.min.css, topojson.<hash>/world_110m.json)
+and records them in VENDOR_DIR/manifest.json. The app serves them from
+/vendor/ with a one-year immutable Cache-Control, so maps and styles load
+from the app itself and keep working without network access.
+
+Without --source the files are downloaded from their upstream URLs. On
+air-gapped hosts, --source DIR copies them from a directory holding files
+of the same names (bootstrap.min.css, world_110m.json, ...) instead. Assets
+that are not vendored keep loading from their CDN.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from config import VENDOR_DIR
+
+# The vendored copy must be this version too, or the CDN fallback and a
+# re-vendor would silently change the styles
+BOOTSTRAP_VERSION = '5.3.8'
+BOOTSTRAP_CDN = f'https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist/css/bootstrap.min.css'
+TOPOJSON_CDN = 'https://cdn.plot.ly/un/'
+
+# Logical name -> upstream URL of a single file
+FILE_ASSETS = {
+    'bootstrap.css': BOOTSTRAP_CDN,
+}
+
+# Topojson files used by the geo maps (plotly names them <scope>_<resolution>m)
+TOPOJSON_FILES = ['world_110m.json', 'usa_110m.json']
+
+MANIFEST_NAME = 'manifest.json'
+
+# Vendored copies are named <stem>.<content hash>[.<extension>]
+VENDORED_NAME = re.compile(r'^(?P<stem>[^.]+)\.[0-9a-f]{12}(\..+)?$')
+
+URL_PREFIX = '/vendor/'
+
+_manifest = None
+
+def read_manifest(output_dir=VENDOR_DIR):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def load_manifest():
+    """Logical name -> vendored path relative to VENDOR_DIR ({} if nothing is vendored)"""
+    global _manifest
+    if _manifest is None:
+        _manifest = read_manifest()
+    return _manifest
+
+def vendor_path(name):
+    """Local file (or directory) of a vendored asset, or None"""
+    relative = load_manifest().get(name)
+    return os.path.join(VENDOR_DIR, relative) if relative else None
+
+def vendor_url(name):
+    """App URL of a vendored asset, or None"""
+    relative = load_manifest().get(name)
+    return URL_PREFIX + relative if relative else None
+
+def stylesheet_url():
+    """The Bootstrap stylesheet, vendored if available"""
+    return vendor_url('bootstrap.css') or BOOTSTRAP_CDN
+
+def geo_graph_config():
+    """dcc.Graph config for geo maps: load topojson from the app if vendored"""
+    url = vendor_url('topojson')
+    return {'topojsonURL': url} if url else {}
+
+def topojson_url(filename):
+    """URL plotly.js loads a topojson file from when drawing a geo map"""
+    return (vendor_url('topojson') or TOPOJSON_CDN) + filename
+
+def plotly_scripts():
+    """Scripts loading the partial plotly.js bundle, if one is vendored
+
+    dcc.Graph only downloads Dash's full plotly.js when window.Plotly is not
+    defined yet, so loading the partial bundle first replaces it.
+    """
+    url = vendor_url('plotly.js')
+    return [url] if url else []
+
+def content_hash(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+def fetch(url, target, source=None):
+    """Download url (or copy its file name from source) to target"""
+    if source is not None:
+        shutil.copyfile(os.path.join(source, url.rsplit('/', 1)[1]), target)
+        return
+    from urllib.request import urlopen
+
+    with urlopen(url, timeout=30) as response, open(target, 'wb') as f:
+        shutil.copyfileobj(response, f)
+
+def vendor(source=None, output_dir=VENDOR_DIR):
+    """Fetch every asset into output_dir; returns (manifest, failed asset names)"""
+    staging = os.path.join(output_dir, '.staging')
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    previous = read_manifest(output_dir)
+    # Entries added by other tools (e.g. the plotly.js bundle) are kept
+    managed = set(FILE_ASSETS) | {'topojson'}
+    manifest = {name: relative for name, relative in previous.items() if name not in managed}
+    failed = []
+    for name, url in FILE_ASSETS.items():
+        staged = os.path.join(staging, os.path.basename(url))
+        try:
+            fetch(url, staged, source)
+        except OSError as e:
+            print(f"[FAIL] {name}: {e}")
+            failed.append(name)
+            continue
+        stem, extension = os.path.basename(url).split('.', 1)
+        manifest[name] = f"{stem}.{content_hash([staged])}.{extension}"
+        print(f"[OK] {name} -> {manifest[name]}")
+
+    topojson_dir = os.path.join(staging, 'topojson')
+    os.makedirs(topojson_dir)
+    staged = [os.path.join(topojson_dir, filename) for filename in TOPOJSON_FILES]
+    try:
+        for filename, path in zip(TOPOJSON_FILES, staged):
+            fetch(TOPOJSON_CDN + filename, path, source)
+    except OSError as e:
+        print(f"[FAIL] topojson: {e}")
+        failed.append('topojson')
+    else:
+        # plotly.js appends '<name>.json' to topojsonURL, so the whole
+        # directory carries the hash rather than each file
+        manifest['topojson'] = f"topojson.{content_hash(staged)}/"
+        print(f"[OK] topojson -> {manifest['topojson']}")
+
+    # Replace the previous copies; assets that failed to fetch keep theirs
+    for name in failed:
+        if name in previous:
+            manifest[name] = previous[name]
+    for name, relative in manifest.items():
+        target = os.path.join(output_dir, relative.rstrip('/'))
+        if os.path.exists(target) or name not in managed:
+            continue
+        if name == 'topojson':
+            shutil.move(topojson_dir, target)
+        else:
+            shutil.move(os.path.join(staging, os.path.basename(FILE_ASSETS[name])), target)
+    shutil.rmtree(staging, ignore_errors=True)
+    write_manifest(manifest, output_dir)
+    return manifest, failed
+
+def write_manifest(manifest, output_dir=VENDOR_DIR):
+    """Save the manifest and delete earlier copies of the assets it lists
+
+    Only entries named like a vendored copy of an asset in the old or new
+    manifest are deleted, so nothing else in output_dir is touched.
+    """
+    listed = [relative.rstrip('/') for relative in list(read_manifest(output_dir).values()) + list(manifest.values())]
+    stems = {match.group('stem') for match in map(VENDORED_NAME.match, listed) if match}
+    kept = {relative.rstrip('/') for relative in manifest.values()}
+    for entry in os.listdir(output_dir):
+        path = os.path.join(output_dir, entry)
+        match = VENDORED_NAME.match(entry)
+        if entry in kept or match is None or match.group('stem') not in stems:
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def vendor_file(name, path, output_dir=VENDOR_DIR):
+    """Add (or replace) one file in the vendored assets; returns its vendored name"""
+    stem, extension = os.path.basename(path).split('.', 1)
+    relative = f"{stem}.{content_hash([path])}.{extension}"
+    os.makedirs(output_dir, exist_ok=True)
+    shutil.copyfile(path, os.path.join(output_dir, relative))
+    manifest = read_manifest(output_dir)
+    manifest[name] = relative
+    write_manifest(manifest, output_dir)
+    return relative
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Store local copies of the CDN assets the dashboard uses')
+    parser.add_argument('--source', help='Copy the files from this directory instead of downloading them')
+    parser.add_argument('--output', default=VENDOR_DIR, help='Where to store them')
+    args = parser.parse_args(argv)
+    os.makedirs(args.output, exist_ok=True)
+    _, failed = vendor(args.source, args.output)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""
+Incremental build of derived data artifacts
+
+Usage:
+    python -m src.utils.build_graph [--jobs N] [--force] [--dry-run] [NODE ...]
+
+Artifacts (typed frames, indexes, page figures, ...) are nodes of a small DAG.
+Each node declares the raw datasets, other data files, the code files and the
+other nodes it is built from; its key is a hash of their content plus the source of its build
+function. A node is rebuilt only when its key differs from the one recorded
+in the build manifest, so editing one CSV rebuilds just the artifacts
+downstream of it. Nodes whose dependencies are done run in parallel in a
+process pool.
+
+Outputs are written to ARTIFACTS_DIR and the manifest to BUILD_MANIFEST;
+fresh_artifact() tells the app whether an output is current.
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from config import ARTIFACTS_DIR, BASE_DIR, BUILD_MANIFEST, RAW_DATA_DIR
+
+class Node:
+    """One artifact: how to build it and what it is built from
+
+    build is called as build(output_path, inputs, **params), where inputs maps
+    each dependency's name to its output path. It must be a module-level
+    function so it can run in a worker process.
+    """
+
+    def __init__(self, name, build, output, datasets=(), deps=(), code=(), files=(), params=None):
+        self.name = name
+        self.build = build
+        self.output = output
+        self.datasets = list(datasets)
+        self.deps = list(deps)
+        self.code = list(code)
+        self.files = list(files)
+        self.params = params or {}
+
+    @property
+    def output_path(self):
+        return os.path.join(ARTIFACTS_DIR, self.output)
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def topological_order(nodes):
+    """Nodes ordered so every node comes after its dependencies"""
+    order, state = [], {}
+
+    def visit(name, path):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        if name not in nodes:
+            raise ValueError(f"Unknown node: {name} (needed by {path[-1] if path else 'command line'})")
+        state[name] = 'visiting'
+        for dep in nodes[name].deps:
+            visit(dep, path + [name])
+        state[name] = 'done'
+        order.append(name)
+
+    for name in nodes:
+        visit(name, [])
+    return order
+
+def compute_keys(nodes, order):
+    """Content key of every node, from its inputs and its upstream keys"""
+    file_hashes = {}
+
+    def cached_hash(path):
+        if path not in file_hashes:
+            file_hashes[path] = file_hash(path)
+        return file_hashes[path]
+
+    from src.utils.data_loader import DATASET_FILES
+
+    keys = {}
+    for name in order:
+        node = nodes[name]
+        digest = hashlib.sha256(name.encode())
+        digest.update(inspect.getsource(node.build).encode())
+        digest.update(json.dumps(node.params, sort_keys=True).encode())
+        for dataset in node.datasets:
+            digest.update(cached_hash(os.path.join(RAW_DATA_DIR, DATASET_FILES[dataset])).encode())
+        for path in node.code:
+            digest.update(cached_hash(os.path.join(BASE_DIR, path)).encode())
+        for path in node.files:
+            digest.update(os.path.relpath(path, BASE_DIR).encode())
+            digest.update(cached_hash(path).encode())
+        for dep in node.deps:
+            digest.update(keys[dep].encode())
+        keys[name] = digest.hexdigest()
+    return keys
+
+def load_manifest(path=BUILD_MANIFEST):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_manifest(manifest, path=BUILD_MANIFEST):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+def run_node(build, output_path, inputs, params):
+    """Build one node into a temporary file, then move it into place"""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    temp_path = f"{output_path}.tmp{os.getpid()}"
+    start = time.perf_counter()
+    build(temp_path, inputs, **params)
+    os.replace(temp_path, output_path)
+    return time.perf_counter() - start
+
+def select(nodes, targets):
+    """The targets plus everything they depend on"""
+    if not targets:
+        return dict(nodes)
+    selected = {}
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in nodes:
+            raise ValueError(f"Unknown node: {name}")
+        if name not in selected:
+            selected[name] = nodes[name]
+            pending.extend(nodes[name].deps)
+    return selected
+
+def build(nodes=None, targets=(), jobs=None, force=False, dry_run=False):
+    """Rebuild stale nodes; returns (built, failed) lists of node names"""
+    nodes = select(nodes or default_nodes(), targets)
+    order = topological_order(nodes)
+    keys = compute_keys(nodes, order)
+    manifest = load_manifest()
+
+    stale = set()
+    for name in order:
+        node = nodes[name]
+        recorded = manifest.get(name, {}).get('key')
+        if force or recorded != keys[name] or not os.path.exists(node.output_path) \
+                or any(dep in stale for dep in node.deps):
+            stale.add(name)
+    for name in order:
+        print(f"[{'BUILD' if name in stale else 'OK'}] {name}")
+    if dry_run or not stale:
+        return [], []
+
+    built, failed = [], []
+    waiting = {name: {dep for dep in nodes[name].deps if dep in stale} for name in order if name in stale}
+
+    def submit(executor, name):
+        node = nodes[name]
+        inputs = {dep: nodes[dep].output_path for dep in node.deps}
+        if executor is None:
+            return run_node(node.build, node.output_path, inputs, node.params)
+        return executor.submit(run_node, node.build, node.output_path, inputs, node.params)
+
+    def finish(name, seconds=None, error=None):
+        waiting.pop(name, None)
+        if error is not None:
+            print(f"[FAIL] {name}: {type(error).__name__}: {error}")
+            failed.append(name)
+            # Everything downstream of a failed node is skipped
+            for other, deps in list(waiting.items()):
+                if name in deps:
+                    finish(other, error=RuntimeError(f"dependency {name} failed"))
+            return
+        print(f"[DONE] {name} ({seconds:.2f}s)")
+        built.append(name)
+        manifest[name] = {'key': keys[name], 'output': nodes[name].output}
+        save_manifest(manifest)
+        for deps in waiting.values():
+            deps.discard(name)
+
+    if jobs == 1:
+        while waiting:
+            name = next(name for name, deps in waiting.items() if not deps)
+            try:
+                finish(name, submit(None, name))
+            except Exception as e:
+                finish(name, error=e)
+        return built, failed
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        running = {}
+        while waiting or running:
+            for name in [name for name, deps in waiting.items() if not deps and name not in running.values()]:
+                running[submit(executor, name)] = name
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    finish(name, future.result())
+                except Exception as e:
+                    finish(name, error=e)
+    return built, failed
+
+def fresh_artifact(name, nodes=None):
+    """Output path of a node if it is built and current, else None"""
+    nodes = nodes or default_nodes()
+    if name not in nodes:
+        return None
+    nodes = select(nodes, [name])
+    keys = compute_keys(nodes, topological_order(nodes))
+    entry = load_manifest().get(name)
+    path = nodes[name].output_path
+    if entry is None or entry.get('key') != keys[name] or not os.path.exists(path):
+        return None
+    return path
+
+# Build functions
+
+def build_frame(output_path, inputs, dataset, pandas_version, numpy_version):
+    """Validated dataset with its derived columns plus its validation report, pickled
+
+    The library versions are only part of the key: pickles written by one
+    pandas or NumPy version may not load in another.
+    """
+    import pickle
+    from src.utils.data_loader import read_raw_dataset
+    from src.utils.derive import derive
+    from src.utils.validation import validate
+
+    valid, _, report = validate(dataset, read_raw_dataset(dataset))
+    with open(output_path, 'wb') as f:
+        pickle.dump({'df': derive(dataset, valid), 'report': report}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def build_taxon_index(output_path, inputs):
+    """Taxon key of every row, the join index and the name resolver, as JSON (see taxonomy.py)"""
+    import pandas as pd
+    from src.utils.taxonomy import TaxonIndex
+
+    frames = {name.split('/', 1)[1]: pd.read_pickle(path)['df'] for name, path in inputs.items()}
+    with open(output_path, 'w') as f:
+        json.dump(TaxonIndex(frames).to_json(), f)
+
+def build_occurrence_pyramid(output_path, inputs, paths):
+    """Density tile pyramid of the point occurrence files, as .npz"""
+    from src.utils.occurrences import build_pyramid, iter_points, save_pyramid
+
+    save_pyramid(build_pyramid(iter_points(paths)), output_path)
+
+def build_figures(output_path, inputs, page, plotly_version):
+    """Figures of a page's charts by chart id, as plotly JSON
+
+    plotly_version is only part of the key: the JSON depends on it.
+    """
+    from plotly.io.json import to_json_plotly
+    from src.utils.figure_store import build_page_figures
+
+    with open(output_path, 'w') as f:
+        f.write(to_json_plotly(build_page_figures(page)))
+
+FRAME_CODE = [
+    'src/utils/validation.py', 'src/utils/derive.py', 'src/utils/countries.py', 'src/utils/search.py',
+]
+
+# Datasets each page builds its figures from
+PAGE_DATASETS = {
+    'us_overview': ['us_snakes'],
+    'global_view': ['global_snakes'],
+    'domesticated': ['domesticated_snakes'],
+    'media': ['media_snakes'],
+    'farming': ['farming'],
+}
+
+def default_nodes():
+    """The artifacts of the dashboard, by name"""
+    import numpy
+    import pandas
+    from src.utils.countries import COUNTRY_TABLE
+    from src.utils.data_loader import DATASET_FILES
+
+    nodes = [
+        Node(f'frames/{dataset}', build_frame, f'frames/{dataset}.pkl',
+             datasets=[dataset], code=FRAME_CODE, files=[COUNTRY_TABLE],
+             params={'dataset': dataset, 'pandas_version': pandas.__version__, 'numpy_version': numpy.__version__})
+        for dataset in DATASET_FILES
+    ]
+    nodes.append(Node('taxa', build_taxon_index, 'taxa.json',
+                      deps=[f'frames/{dataset}' for dataset in DATASET_FILES],
+                      code=['src/utils/taxonomy.py', 'src/utils/search.py']))
+
+    import plotly
+
+    nodes += [
+        Node(f'figures/{page}', build_figures, f'figures/{page}.json',
+             deps=[f'frames/{dataset}' for dataset in datasets],
+             code=[f'src/pages/{page}.py', 'src/utils/visualizations.py', 'src/utils/rankings.py',
+                   'src/utils/figure_store.py', 'src/utils/data_loader.py', 'src/utils/embed.py', 'config.py'],
+             params={'page': page, 'plotly_version': plotly.__version__})
+        for page, datasets in PAGE_DATASETS.items()
+    ]
+
+    from src.utils.occurrences import occurrence_files
+
+    paths = occurrence_files()
+    if paths:
+        nodes.append(Node('occurrences/pyramid', build_occurrence_pyramid, 'occurrences/pyramid.npz',
+                          files=paths, code=['src/utils/occurrences.py', 'config.py'],
+                          params={'paths': paths}))
+    return {node.name: node for node in nodes}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rebuild stale derived data artifacts')
+    parser.add_argument('nodes', nargs='*', help='Build only these nodes (and what they depend on)')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if nothing changed')
+    parser.add_argument('--dry-run', action='store_true', help='Only list what would be rebuilt')
+    args = parser.parse_args(argv)
+    try:
+        built, failed = build(targets=args.nodes, jobs=args.jobs, force=args.force, dry_run=args.dry_run)
+    except ValueError as e:
+        print(f"[FAIL] {e}")
+        return 1
+    print(f"{len(built)} built, {len(failed)} failed")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
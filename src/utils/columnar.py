@@ -0,0 +1,51 @@
+"""
+Compact columnar encoding of data frames for the browser
+
+df.to_dict('records') repeats every column name in every row. The columnar
+form sends each column once as an array instead; text columns that repeat
+values (a handful of categories over many rows) are dictionary-encoded as
+the distinct values plus one integer code per row:
+
+    {'length': 3, 'columns': {
+        'country': ['China', 'Vietnam', 'Thailand'],
+        'farming_method': {'values': ['Intensive', 'Wild'], 'codes': [0, 0, 1]},
+    }}
+
+Missing values are null (null codes in dictionary columns). The browser
+rebuilds the records in a clientside callback (src/components/columnar_table.py).
+"""
+
+import math
+
+def _plain(value):
+    """JSON-ready scalar: NaN -> None, whole floats -> int, numpy -> Python"""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if value.is_integer():
+            return int(value)
+    return value
+
+def encode_columns(df):
+    """Columnar payload of a frame (see module docstring)"""
+    columns = {}
+    for name in df.columns:
+        values = [_plain(value) for value in df[name].astype(object).where(df[name].notna(), None)]
+        distinct = list(dict.fromkeys(value for value in values if value is not None))
+        if distinct and all(isinstance(value, str) for value in distinct) and 2 * len(distinct) <= len(values):
+            codes = {value: code for code, value in enumerate(distinct)}
+            columns[name] = {'values': distinct, 'codes': [None if value is None else codes[value] for value in values]}
+        else:
+            columns[name] = values
+    return {'length': len(df), 'columns': columns}
+
+def decode_columns(payload):
+    """Records (list of dicts) of a columnar payload"""
+    columns = {}
+    for name, column in payload['columns'].items():
+        if isinstance(column, dict):
+            column = [None if code is None else column['values'][code] for code in column['codes']]
+        columns[name] = column
+    return [{name: column[i] for name, column in columns.items()} for i in range(payload['length'])]
@@ -0,0 +1,143 @@
+"""
+Country name resolution to ISO-3 codes
+
+Usage:
+    python -m src.utils.countries     # report names that do not resolve
+
+Country names are resolved against the bundled ISO 3166 table in
+data/reference/countries.csv (official names, common names and aliases such
+as "UK" or "Laos"), so maps can use locationmode='ISO-3' instead of having
+plotly match names in the browser. Each distinct name is resolved once.
+Single-valued country columns get a derived `country_iso3` column at ingest
+(see derive.py); the multi-valued `countries` column is exploded into a
+bridge table of (row, country, iso3), cached per dataset version, which
+country aggregates are computed from with a single groupby.
+"""
+
+import csv
+import os
+import sys
+import threading
+from config import REFERENCE_DATA_DIR
+from src.utils.search import normalize_name
+
+COUNTRY_TABLE = os.path.join(REFERENCE_DATA_DIR, 'countries.csv')
+
+# Dataset -> column holding country names
+COUNTRY_COLUMNS = {
+    'global_snakes': 'countries',
+    'farming': 'country',
+}
+
+_table = None
+_table_lock = threading.Lock()
+
+def load_country_table():
+    """Return (normalized name -> ISO-3, ISO-3 -> display name) from the bundled table"""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                lookup, names = {}, {}
+                with open(COUNTRY_TABLE, newline='', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        names[row['iso3']] = row['name']
+                        for alias in [row['name'], row['iso3'], row['iso2']] + row['aliases'].split(';'):
+                            if alias:
+                                lookup.setdefault(normalize_name(alias), row['iso3'])
+                _table = (lookup, names)
+    return _table
+
+def resolve_country(name):
+    """ISO-3 code for a country name or code, or None
+
+    Qualifiers in parentheses are ignored, so "India (widespread)" resolves.
+    """
+    if not isinstance(name, str):
+        return None
+    lookup, _ = load_country_table()
+    normalized = normalize_name(name.split('(', 1)[0])
+    return lookup.get(normalized)
+
+def resolve_countries(series):
+    """ISO-3 codes for a column of country names (None where unresolved)"""
+    mapping = {name: resolve_country(name) for name in series.dropna().unique()}
+    return series.map(mapping)
+
+def country_name(iso3):
+    """Display name of an ISO-3 code"""
+    return load_country_table()[1].get(iso3, iso3)
+
+def build_country_bridge(df, column='countries'):
+    """One row per (dataset row, listed country) with the country's ISO-3 code
+
+    'row' is the index label of the dataset row, so the bridge joins back to
+    the frame it was built from.
+    """
+    import pandas as pd
+
+    countries = df[column].str.split(',').explode().str.strip()
+    countries = countries[countries.notna() & (countries != '')]
+    bridge = pd.DataFrame({'row': countries.index, 'country': countries.to_numpy()})
+    bridge['iso3'] = resolve_countries(bridge['country'])
+    return bridge
+
+# Dataset name -> (dataset version, bridge)
+_bridges = {}
+_bridges_lock = threading.Lock()
+
+def get_country_bridge(name):
+    """Cached country bridge table of a dataset (see COUNTRY_COLUMNS)"""
+    from src.utils.data_loader import get_dataset, get_dataset_version
+
+    version = get_dataset_version(name)
+    cached = _bridges.get(name)
+    if cached is None or cached[0] != version:
+        with _bridges_lock:
+            cached = _bridges.get(name)
+            if cached is None or cached[0] != version:
+                cached = (version, build_country_bridge(get_dataset(name), COUNTRY_COLUMNS[name]))
+                _bridges[name] = cached
+    return cached[1]
+
+def country_stats(df, bridge):
+    """Species count, venomous count and mean lethality per ISO-3 country
+
+    A species listed for several countries counts once in each of them.
+    """
+    # Aliases of one country on the same row ('UK, United Kingdom') resolve
+    # to the same code; keep one so every aggregate counts the species once
+    rows = bridge[bridge['iso3'].notna()].drop_duplicates(['row', 'iso3'])
+    species = df.loc[rows['row'], ['venomous', 'lethality_score']]
+    joined = rows.assign(
+        venomous=(species['venomous'] == 'Yes').to_numpy(),
+        lethality_score=species['lethality_score'].to_numpy(),
+    )
+    stats = joined.groupby('iso3').agg(
+        species_count=('row', 'nunique'),
+        venomous_count=('venomous', 'sum'),
+        avg_lethality=('lethality_score', 'mean'),
+    ).reset_index()
+    stats['country'] = stats['iso3'].map(country_name)
+    return stats
+
+def unresolved_countries(name):
+    """Country names of a dataset without an ISO-3 code, with how often they occur"""
+    bridge = get_country_bridge(name)
+    return bridge.loc[bridge['iso3'].isna(), 'country'].value_counts()
+
+def main():
+    failed = False
+    for name in COUNTRY_COLUMNS:
+        unresolved = unresolved_countries(name)
+        bridge = get_country_bridge(name)
+        status = 'OK' if unresolved.empty else 'WARN'
+        print(f"[{status}] {name}.{COUNTRY_COLUMNS[name]}: {len(bridge) - unresolved.sum():,} of "
+              f"{len(bridge):,} entries resolved to ISO-3")
+        for country, count in unresolved.items():
+            print(f"    unresolved: {country} ({count})")
+        failed |= not unresolved.empty
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
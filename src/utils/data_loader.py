@@ -2,45 +2,237 @@
 Data loading utilities for the Snakey dashboard
 """
 
-import pandas as pd
+import hashlib
+import logging
 import os
+import re
+import threading
+import numpy as np
+import pandas as pd
 from config import RAW_DATA_DIR
+from src.utils.derive import DERIVED_TEXT_COLUMNS, derive, derived_columns, source_columns
+from src.utils.validation import SCHEMAS, format_report, validate
+
+# Frames handed out by get_dataset share memory with the cached one and
+# copy a column only when it is written to. Always on from pandas 3.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+logger = logging.getLogger(__name__)
+
+# Dataset name -> CSV file in RAW_DATA_DIR
+DATASET_FILES = {
+    'us_snakes': 'us_snake_species.csv',
+    'global_snakes': 'global_snake_species.csv',
+    'domesticated_snakes': 'domesticated_snakes.csv',
+    'media_snakes': 'snakes_in_media.csv',
+    'farming': 'snakeskin_farming.csv',
+}
+
+# Query filters accepted per dataset: filter name -> column. Filters compare
+# case-insensitively; multi-valued columns match any one of their entries.
+DATASET_FILTERS = {
+    'us_snakes': {
+        'state': 'states',
+        'venomous': 'venomous',
+        'venom_type': 'venom_type',
+        'conservation_status': 'conservation_status',
+        'invasive': 'invasive',
+    },
+    'global_snakes': {
+        'continent': 'continent',
+        'country': 'countries',
+        'venomous': 'venomous',
+        'venom_type': 'venom_type',
+        'conservation_status': 'conservation_status',
+        'invasive': 'invasive',
+    },
+    'domesticated_snakes': {
+        'care_difficulty': 'care_difficulty',
+        'domestication_level': 'domestication_level',
+        'temperament': 'temperament',
+    },
+    'media_snakes': {
+        'media_type': 'media_type',
+        'role': 'protagonist_antagonist',
+    },
+    'farming': {
+        'country': 'country',
+        'farming_method': 'farming_method',
+        'regulation_level': 'regulation_level',
+        'certification': 'certification_available',
+    },
+}
+
+# Lethality score from which a species counts as highly lethal
+HIGH_LETHALITY = 7
+
+# Columns holding comma-separated lists of values
+MULTI_VALUE_COLUMNS = {'states', 'countries'}
+
+# Validated frames (with their derived columns), validation reports and
+# content hashes, keyed by dataset name. Entries are reloaded when the file's
+# size or modification time changes.
+_cache = {}
+_cache_lock = threading.Lock()
+
+def _file_signature(file_path):
+    """Cheap change detector for a data file"""
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _load_frame_artifact(name):
+    """The prebuilt typed frame of a dataset, if `build_graph` has a current one that loads"""
+    from src.utils.build_graph import fresh_artifact
+
+    path = fresh_artifact(f'frames/{name}')
+    if not path:
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable artifact {path} ({type(e).__name__}: {e}); reading the CSV")
+        return None
+
+def _cached_entry(name):
+    """Return the cache entry for a dataset, reading the CSV if it changed"""
+    file_path = os.path.join(RAW_DATA_DIR, DATASET_FILES[name])
+    signature = _file_signature(file_path)
+    entry = _cache.get(name)
+    if entry is not None and entry['signature'] == signature:
+        return entry
+
+    with _cache_lock:
+        entry = _cache.get(name)
+        if entry is None or entry['signature'] != signature:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            frame = _load_frame_artifact(name)
+            if frame is None:
+                df, _, report = validate(name, pd.read_csv(file_path))
+                frame = {'df': derive(name, df), 'report': report}
+            if frame['report']['quarantined']:
+                logger.warning('\n'.join(format_report(frame['report'])))
+            entry = {
+                'signature': signature,
+                'version': hashlib.sha1(content).hexdigest(),
+                'df': frame['df'],
+                'report': frame['report'],
+            }
+            _cache[name] = entry
+    return entry
+
+def get_dataset(name):
+    """Get a dataset by name from the shared cache
+
+    Returns a copy-on-write view: callers may modify it freely (columns are
+    copied when first written), and the shared frame is never touched, so
+    concurrent requests cannot see each other's changes.
+    """
+    return _cached_entry(name)['df'].copy(deep=False)
+
+def get_validation_report(name):
+    """Schema validation report of a dataset (see src/utils/validation.py)"""
+    return _cached_entry(name)['report']
+
+def read_raw_dataset(name):
+    """Read a dataset's CSV as is, without validation or derived columns"""
+    return pd.read_csv(os.path.join(RAW_DATA_DIR, DATASET_FILES[name]))
+
+def get_dataset_version(name):
+    """Content hash of a dataset's source file, usable as a cache key or ETag"""
+    return _cached_entry(name)['version']
+
+def dataset_dtypes(name):
+    """Declared dtype of every column of a dataset, in column order
+
+    Columns the schema declares numeric and numeric derived columns are
+    float64 (any of them may be missing in some rows); everything else is
+    string. Chunks are cast to these, so every chunk of a dataset has the
+    same dtypes whatever values it happens to hold.
+    """
+    schema = SCHEMAS.get(name, {})
+    numeric = {column for column, rules in schema.items() if rules.get('type') == 'number'}
+    numeric.update(column for column in derived_columns(name) if column not in DERIVED_TEXT_COLUMNS)
+    return {column: 'float64' if column in numeric else 'string' for column in read_dataset_columns(name)}
+
+def iter_dataset_chunks(name, chunksize, usecols=None):
+    """Read a dataset's CSV in chunks, bypassing the cache (constant memory)
+
+    Chunks are validated like cached datasets (invalid rows are dropped) and
+    cast to dataset_dtypes. usecols may name derived columns; their source
+    columns are read instead and the derived columns added to every chunk.
+    """
+    file_path = os.path.join(RAW_DATA_DIR, DATASET_FILES[name])
+    dtypes = dataset_dtypes(name)
+    if usecols is not None:
+        usecols = source_columns(name, usecols)
+    # Everything is read as text: numeric columns are converted by validate
+    # once the rows that do not hold numbers are quarantined
+    for chunk in pd.read_csv(file_path, chunksize=chunksize, usecols=usecols, dtype='string'):
+        valid, _, _ = validate(name, chunk)
+        chunk = derive(name, valid)
+        yield chunk.astype({column: dtypes[column] for column in chunk.columns})
+
+def read_dataset_columns(name):
+    """Column names of a dataset: the CSV header plus the derived columns"""
+    file_path = os.path.join(RAW_DATA_DIR, DATASET_FILES[name])
+    return list(pd.read_csv(file_path, nrows=0).columns) + derived_columns(name)
+
+def contains_entry(series, value):
+    """Mask rows whose comma-separated list contains value as a whole entry"""
+    pattern = rf"(?:^|,)\s*{re.escape(value.strip())}\s*(?:,|$)"
+    return series.astype('string').str.contains(pattern, case=False, na=False, regex=True).fillna(False)
+
+def filter_mask(df, name, filters):
+    """Boolean mask of the rows of a dataset frame matching query filters (see DATASET_FILTERS)"""
+    allowed = DATASET_FILTERS[name]
+    unknown = [key for key in filters if key not in allowed]
+    if unknown:
+        raise ValueError(
+            f"Unknown filter(s) for {name}: {', '.join(unknown)}. "
+            f"Available: {', '.join(allowed)}"
+        )
+
+    mask = pd.Series(True, index=df.index)
+    for key, value in filters.items():
+        column = allowed[key]
+        if column in MULTI_VALUE_COLUMNS:
+            mask &= contains_entry(df[column], value)
+        else:
+            mask &= (df[column].astype('string').str.lower() == value.strip().lower()).fillna(False)
+    return mask
+
+def filter_dataset(df, name, filters):
+    """Apply query filters (see DATASET_FILTERS) to a dataset frame"""
+    return df[filter_mask(df, name, filters)]
 
 def load_us_snakes():
     """Load US snake species data"""
-    file_path = os.path.join(RAW_DATA_DIR, 'us_snake_species.csv')
-    df = pd.read_csv(file_path)
-    return df
+    return get_dataset('us_snakes')
 
 def load_global_snakes():
     """Load global snake species data"""
-    file_path = os.path.join(RAW_DATA_DIR, 'global_snake_species.csv')
-    df = pd.read_csv(file_path)
-    return df
+    return get_dataset('global_snakes')
 
 def load_domesticated_snakes():
     """Load domesticated snake data"""
-    file_path = os.path.join(RAW_DATA_DIR, 'domesticated_snakes.csv')
-    df = pd.read_csv(file_path)
-    return df
+    return get_dataset('domesticated_snakes')
 
 def load_media_snakes():
     """Load snakes in media data"""
-    file_path = os.path.join(RAW_DATA_DIR, 'snakes_in_media.csv')
-    df = pd.read_csv(file_path)
-    return df
+    return get_dataset('media_snakes')
 
 def load_farming_data():
     """Load snakeskin farming data"""
-    file_path = os.path.join(RAW_DATA_DIR, 'snakeskin_farming.csv')
-    df = pd.read_csv(file_path)
-    return df
+    return get_dataset('farming')
 
 def get_us_snake_by_state(state_abbrev):
     """Get all snakes found in a specific US state"""
     df = load_us_snakes()
-    # Filter snakes that have the state in their 'states' column
-    return df[df['states'].str.contains(state_abbrev, na=False)]
+    # Match whole entries of the comma-separated 'states' column, so 'AL'
+    # does not also match rows listing only other states
+    return df[contains_entry(df['states'], state_abbrev)]
 
 def get_snakes_by_continent(continent):
     """Get all snakes from a specific continent"""
@@ -51,26 +243,143 @@ def get_venomous_snakes(df):
     """Filter for venomous snakes only"""
     return df[df['venomous'] == 'Yes']
 
+def split_entries(series):
+    """(row positions, entries) of a comma-separated list column, one pair per listed entry"""
+    entries = pd.Series(series.to_numpy(), index=np.arange(len(series)))
+    entries = entries.astype('string').str.split(',').explode().str.strip()
+    entries = entries[entries.notna() & (entries != '')]
+    return entries.index.to_numpy(), entries
+
+def grouped_stats(df, value, by=None, label='common_name', threshold=None, where=None):
+    """Statistics of a column for every group of df[by], in one vectorized pass
+
+    Returns a frame with one row per group (a single row when by is None)
+    and the columns:
+        size    rows selected by where (all rows if where is None)
+        count   selected rows with a value
+        mean    mean of the values (NaN for a group without any)
+        max     largest value, in the column's dtype where possible
+        above   values >= threshold (0 if threshold is None)
+        argmax  label of the first row holding the largest value
+
+    Groups are the distinct values of df[by] in sorted order, including
+    those with no selected rows; rows with a missing group are ignored. A
+    comma-separated list column (MULTI_VALUE_COLUMNS) is grouped by its
+    entries, so a row listing several states counts in each of them.
+    """
+    if by is None:
+        rows = np.arange(len(df))
+        codes = np.zeros(len(df), dtype=np.intp)
+        groups = pd.RangeIndex(1)
+    else:
+        if by in MULTI_VALUE_COLUMNS:
+            rows, entries = split_entries(df[by])
+        else:
+            rows, entries = np.arange(len(df)), df[by]
+        codes, groups = pd.factorize(entries, sort=True)
+        groups = pd.Index(groups, name=by)
+    n = len(groups)
+    selected = codes >= 0
+    if where is not None:
+        selected &= np.asarray(where, dtype=bool)[rows]
+    size = np.bincount(codes[selected], minlength=n)
+
+    source = df[value].to_numpy()
+    values = df[value].to_numpy(dtype=float, na_value=np.nan)[rows]
+    valued = np.flatnonzero(selected & ~np.isnan(values))
+    count = np.bincount(codes[valued], minlength=n)
+    found = count > 0
+
+    mean = np.full(n, np.nan)
+    if n == 1:
+        # One group is summed exactly as pandas' mean() sums it: all selected
+        # values in one pairwise sum, missing ones as 0, integers as float64
+        picked = source[rows[selected]]
+        if picked.dtype.kind in 'iub':
+            total = picked.sum(dtype=np.float64)
+        else:
+            picked = values[selected]
+            total = np.where(np.isnan(picked), 0.0, picked).sum()
+        mean[found] = total / count[found]
+    codes, values, rows = codes[valued], values[valued], rows[valued]
+    if n > 1:
+        # pandas' grouped mean (compensated sums in row order) over the
+        # group codes, so breakdowns match DataFrame.groupby().mean()
+        group_means = pd.Series(values).groupby(codes).mean()
+        mean[group_means.index.to_numpy()] = group_means.to_numpy()
+
+    group_max = np.full(n, -np.inf)
+    np.maximum.at(group_max, codes, values)
+    # The first row of each group holding its maximum (like idxmax); rows
+    # are in order, so np.unique's first index per group is that row
+    hits = np.flatnonzero(values == group_max[codes])
+    _, first_hit = np.unique(codes[hits], return_index=True)
+    first = rows[hits[first_hit]]
+    if found.all():
+        maximum = source[first]
+    else:
+        maximum = np.full(n, np.nan)
+        maximum[found] = group_max[found]
+    argmax = np.full(n, None, dtype=object)
+    argmax[found] = df[label].to_numpy()[first]
+
+    above = np.zeros(n, dtype=np.int64)
+    if threshold is not None:
+        above = np.bincount(codes[values >= threshold], minlength=n)
+    return pd.DataFrame(
+        {'size': size, 'count': count, 'mean': mean, 'max': maximum, 'above': above, 'argmax': argmax},
+        index=groups,
+    )
+
+def lethality_stats_by(df, by=None):
+    """Lethality statistics of the venomous species of every group of df[by]
+
+    Columns avg_lethality, max_lethality and high_lethality_count; groups
+    without venomous species get zeros.
+    """
+    stats = grouped_stats(df, 'lethality_score', by, threshold=HIGH_LETHALITY, where=df['venomous'] == 'Yes')
+    result = pd.DataFrame({
+        'avg_lethality': stats['mean'],
+        'max_lethality': stats['max'],
+        'high_lethality_count': stats['above'],
+    })
+    result.loc[stats['size'] == 0] = 0
+    return result
+
+def size_stats_by(df, by=None):
+    """Size statistics of every group of df[by]
+
+    Columns avg_length (mean of avg_length_cm), max_length and
+    largest_species (the first species with that max_length_cm).
+    """
+    lengths = grouped_stats(df, 'max_length_cm', by)
+    return pd.DataFrame({
+        'avg_length': grouped_stats(df, 'avg_length_cm', by)['mean'],
+        'max_length': lengths['max'],
+        'largest_species': lengths['argmax'],
+    })
+
 def get_lethality_stats(df):
     """Calculate lethality statistics"""
-    venomous = get_venomous_snakes(df)
-    if len(venomous) == 0:
+    if not (df['venomous'] == 'Yes').any():
         return {
             'avg_lethality': 0,
             'max_lethality': 0,
             'high_lethality_count': 0
         }
 
+    stats = lethality_stats_by(df)
     return {
-        'avg_lethality': venomous['lethality_score'].mean(),
-        'max_lethality': venomous['lethality_score'].max(),
-        'high_lethality_count': len(venomous[venomous['lethality_score'] >= 7])
+        'avg_lethality': stats['avg_lethality'].iloc[0],
+        'max_lethality': stats['max_lethality'].iloc[0],
+        'high_lethality_count': int(stats['high_lethality_count'].iloc[0])
     }
 
 def get_size_stats(df):
     """Calculate size statistics"""
+    stats = size_stats_by(df)
     return {
-        'avg_length': df['avg_length_cm'].mean(),
-        'max_length': df['max_length_cm'].max(),
-        'largest_species': df.loc[df['max_length_cm'].idxmax(), 'common_name']
+        'avg_length': stats['avg_length'].iloc[0],
+        'max_length': stats['max_length'].iloc[0],
+        'largest_species': stats['largest_species'].iloc[0]
     }
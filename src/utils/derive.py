@@ -0,0 +1,93 @@
+"""
+Derived columns computed once when a dataset is loaded
+
+Several CSV columns hold text that the pages need as numbers or categories:
+lifespan ranges like "20-30", years like "1997-2011" or "Ancient Greece",
+production counts like "<1000" and free-text cultural impact such as
+"Very High - Cultural icon", or country names that maps need as ISO-3
+codes. DERIVED_COLUMNS declares, per dataset, which
+columns are derived from which source column; derive() applies them with
+vectorized string operations and data_loader caches the enriched frame, so
+pages never parse text row by row.
+"""
+
+import numpy as np
+import pandas as pd
+
+_NUMBER = r'(\d+(?:\.\d+)?)'
+
+# Ordinal levels of the cultural_impact text, highest first
+IMPACT_LEVELS = ['Very High', 'High', 'Medium', 'Low']
+IMPACT_SCORES = {'Very High': 4, 'High': 3, 'Medium': 2, 'Low': 1}
+
+def parse_range(series):
+    """'20-30' -> (20, 30, 25); a single number is its own min, max and mid"""
+    bounds = series.astype('string').str.extract(rf'^\s*{_NUMBER}\s*(?:-\s*{_NUMBER})?').astype(float)
+    low = bounds[0]
+    high = bounds[1].fillna(low)
+    return [low, high, (low + high) / 2]
+
+def parse_year(series):
+    """First four-digit year in the text ('1997-2011' -> 1997, 'Ancient' -> NaN)"""
+    return [series.astype('string').str.extract(r'(\d{4})')[0].astype(float)]
+
+def parse_count(series):
+    """Counts with thousands separators or an upper bound ('<1000' -> 1000)"""
+    text = series.astype('string').str.replace(r'[<>,~\s]', '', regex=True)
+    return [pd.to_numeric(text, errors='coerce').astype(float)]
+
+def to_number(series):
+    """Numeric values, with anything unparseable (such as 'N/A') as NaN"""
+    return [pd.to_numeric(series, errors='coerce').astype(float)]
+
+def impact_level(series):
+    """Impact category from the free text (anything unrated counts as 'Low') and its ordinal score"""
+    text = series.astype('string').fillna('')
+    category = pd.Series(
+        np.select([text.str.contains(level, regex=False) for level in IMPACT_LEVELS[:-1]],
+                  IMPACT_LEVELS[:-1], default='Low'),
+        index=series.index,
+    )
+    return [category, category.map(IMPACT_SCORES).astype(int)]
+
+def country_code(series):
+    """ISO-3 code of each country name (NaN where unresolved, see src/utils/countries.py)"""
+    from src.utils.countries import resolve_countries
+
+    return [resolve_countries(series)]
+
+# Dataset -> [(source column, function, derived columns)]
+DERIVED_COLUMNS = {
+    'domesticated_snakes': [
+        ('avg_lifespan_years', parse_range, ['lifespan_min_years', 'lifespan_max_years', 'lifespan_mid_years']),
+    ],
+    'media_snakes': [
+        ('year', parse_year, ['release_year']),
+        ('accuracy_rating', to_number, ['accuracy_score']),
+        ('cultural_impact', impact_level, ['impact_category', 'impact_score']),
+    ],
+    'farming': [
+        ('annual_production_skins', parse_count, ['production_skins']),
+        ('country', country_code, ['country_iso3']),
+    ],
+}
+
+# Derived columns holding text; all other derived columns are numbers
+DERIVED_TEXT_COLUMNS = {'impact_category', 'country_iso3'}
+
+def derive(name, df):
+    """Add the derived columns of a dataset whose source columns are present"""
+    for source, function, columns in DERIVED_COLUMNS.get(name, []):
+        if source in df.columns:
+            for column, values in zip(columns, function(df[source])):
+                df[column] = values
+    return df
+
+def derived_columns(name):
+    """Names of all derived columns of a dataset"""
+    return [column for _, _, columns in DERIVED_COLUMNS.get(name, []) for column in columns]
+
+def source_columns(name, columns):
+    """Replace derived columns by the source columns they are computed from"""
+    sources = {column: source for source, _, derived in DERIVED_COLUMNS.get(name, []) for column in derived}
+    return list(dict.fromkeys(sources.get(column, column) for column in columns))
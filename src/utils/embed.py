@@ -0,0 +1,154 @@
+"""
+Single dashboard charts for embedding in other sites
+
+Usage:
+    python -m src.utils.embed                      # list the embeddable charts
+    python -m src.utils.embed --images [CHART ...] # pre-render PNG and SVG fallbacks
+
+Each chart in EMBED_CHARTS is a figure a page module builds on import (or
+reads from its prebuilt artifact, see figure_store.py), so
+/embed/<chart_id> (src/routes/embed.py) serves the same figure the page
+shows, serialized once per process. Images need the optional kaleido
+package; they are written to EMBED_IMAGE_DIR under names carrying the
+figure's hash, so a changed figure never serves a stale image.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from config import EMBED_IMAGE_DIR, EMBED_IMAGE_SIZE
+
+# Chart id -> (page module in src/pages, figure attribute)
+EMBED_CHARTS = {
+    'us-lethality-map': ('us_overview', 'lethality_map'),
+    'us-size-distribution': ('us_overview', 'size_dist'),
+    'us-venom-types': ('us_overview', 'venom_pie'),
+    'us-conservation-status': ('us_overview', 'conservation_bar'),
+    'us-most-lethal': ('us_overview', 'top_lethal'),
+    'us-size-vs-lethality': ('us_overview', 'size_vs_lethality'),
+    'global-continent-species': ('global_view', 'continent_comparison'),
+    'global-continent-lethality': ('global_view', 'lethality_comparison'),
+    'global-country-map': ('global_view', 'country_map'),
+    'global-most-lethal': ('global_view', 'top_lethal_global'),
+    'global-largest': ('global_view', 'top_largest'),
+    'global-conservation-status': ('global_view', 'conservation_fig'),
+    'global-venom-types': ('global_view', 'venom_fig'),
+    'domesticated-cost-vs-popularity': ('domesticated', 'cost_comparison'),
+    'domesticated-levels': ('domesticated', 'domestication_pie'),
+    'domesticated-care-difficulty': ('domesticated', 'care_diff_bar'),
+    'domesticated-temperament': ('domesticated', 'temperament_bar'),
+    'domesticated-timeline': ('domesticated', 'timeline_chart'),
+    'media-roles': ('media', 'role_pie'),
+    'media-types': ('media', 'media_type_bar'),
+    'media-impact-timeline': ('media', 'impact_timeline'),
+    'media-accuracy': ('media', 'accuracy_hist'),
+    'media-impact': ('media', 'impact_bar'),
+    'farming-production-map': ('farming', 'production_map'),
+    'farming-ethical-scores': ('farming', 'ethical_bar'),
+    'farming-methods': ('farming', 'method_pie'),
+    'farming-welfare-vs-sustainability': ('farming', 'welfare_sustainability'),
+    'farming-regulation': ('farming', 'regulation_bar'),
+    'farming-production-vs-ethics': ('farming', 'production_ethics'),
+}
+
+IMAGE_FORMATS = ['png', 'svg']
+
+# Chart id -> (figure JSON, hash of it)
+_serialized = {}
+_serialized_lock = threading.Lock()
+
+def chart_figure(chart_id):
+    """The page's figure for a chart id (builds the page on first use)"""
+    from src.utils.page_loader import load_page
+
+    module_name, attribute = EMBED_CHARTS[chart_id]
+    return getattr(load_page(module_name), attribute)
+
+def chart_json(chart_id):
+    """(figure JSON, content hash) of a chart, serialized once per process"""
+    cached = _serialized.get(chart_id)
+    if cached is None:
+        from plotly.io.json import to_json_plotly
+
+        # Built outside the lock: load_page already builds each page once
+        figure = chart_figure(chart_id)
+        with _serialized_lock:
+            cached = _serialized.get(chart_id)
+            if cached is None:
+                text = to_json_plotly(figure)
+                cached = (text, hashlib.sha1(text.encode()).hexdigest()[:16])
+                _serialized[chart_id] = cached
+    return cached
+
+def chart_title(chart_id):
+    title = json.loads(chart_json(chart_id)[0])['layout'].get('title', {})
+    return title.get('text') or chart_id
+
+def image_path(chart_id, fmt, output_dir=EMBED_IMAGE_DIR):
+    """Where the pre-rendered image of the chart's current figure goes"""
+    return os.path.join(output_dir, f"{chart_id}.{chart_json(chart_id)[1]}.{fmt}")
+
+def cached_image(chart_id, fmt):
+    """Path of an already rendered image of the chart, or None"""
+    path = image_path(chart_id, fmt)
+    return path if os.path.exists(path) else None
+
+def render_image(chart_id, fmt, output_dir=EMBED_IMAGE_DIR):
+    """Render the chart to output_dir with kaleido; returns the image path"""
+    path = image_path(chart_id, fmt, output_dir)
+    if os.path.exists(path):
+        return path
+    import plotly.io as pio
+
+    width, height = EMBED_IMAGE_SIZE
+    # Prebuilt figures are plain dicts (see figure_store.py)
+    image = pio.to_image(chart_figure(chart_id), format=fmt, width=width, height=height)
+    os.makedirs(output_dir, exist_ok=True)
+    # Renders of earlier versions of the figure are never served again
+    for filename in os.listdir(output_dir):
+        if filename.startswith(f"{chart_id}.") and filename.endswith(f".{fmt}"):
+            os.remove(os.path.join(output_dir, filename))
+    with open(path + '.tmp', 'wb') as f:
+        f.write(image)
+    os.replace(path + '.tmp', path)
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='List the embeddable charts or pre-render their images')
+    parser.add_argument('charts', nargs='*', help='Chart ids (default: all)')
+    parser.add_argument('--images', action='store_true', help='Pre-render PNG and SVG fallbacks (needs kaleido)')
+    parser.add_argument('--output', default=EMBED_IMAGE_DIR, help='Where to write the images')
+    args = parser.parse_args(argv)
+
+    unknown = [chart_id for chart_id in args.charts if chart_id not in EMBED_CHARTS]
+    if unknown:
+        print(f"[FAIL] Unknown chart(s): {', '.join(unknown)}")
+        return 1
+    charts = args.charts or list(EMBED_CHARTS)
+    if not args.images:
+        for chart_id in charts:
+            print(f"/embed/{chart_id}  ({EMBED_CHARTS[chart_id][0]})")
+        return 0
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        print("[FAIL] Rendering images requires kaleido (pip install kaleido)")
+        return 1
+
+    failed = 0
+    for chart_id in charts:
+        for fmt in IMAGE_FORMATS:
+            try:
+                path = render_image(chart_id, fmt, args.output)
+            except Exception as e:
+                print(f"[FAIL] {chart_id}.{fmt}: {type(e).__name__}: {e}")
+                failed += 1
+                continue
+            print(f"[OK] {chart_id}.{fmt} -> {os.path.relpath(path)}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Page figures built ahead of time
+
+`python -m src.utils.build_graph` builds the figures of every chart in
+EMBED_CHARTS (src/utils/embed.py) in its process pool and writes them as
+one artifact per page, figures/<page>.json, keyed like every other node by
+the page's datasets and code. Page modules wrap each figure in
+prebuilt_figure(chart_id, build): when the page's artifact is current the
+figure is read from it, as the plain dict dcc.Graph accepts, and build()
+is only called when the artifact is missing or stale (or lacks the chart).
+"""
+
+import importlib
+import json
+import threading
+from src.utils.embed import EMBED_CHARTS
+
+# Page module -> {chart id: figure dict} of its current artifact ({} if none)
+_artifacts = {}
+_artifacts_lock = threading.Lock()
+
+def page_figures(page):
+    """Figures of a page's current artifact, loaded once per process"""
+    figures = _artifacts.get(page)
+    if figures is None:
+        from src.utils.build_graph import fresh_artifact
+
+        with _artifacts_lock:
+            figures = _artifacts.get(page)
+            if figures is None:
+                path = fresh_artifact(f'figures/{page}')
+                figures = {}
+                if path:
+                    with open(path) as f:
+                        figures = json.load(f)
+                _artifacts[page] = figures
+    return figures
+
+def prebuilt_figure(chart_id, build):
+    """The chart's figure from its page's artifact, else build()"""
+    figure = page_figures(EMBED_CHARTS[chart_id][0]).get(chart_id)
+    return figure if figure is not None else build()
+
+def build_page_figures(page):
+    """Build every chart figure of a page, ignoring any artifact; {chart id: figure}"""
+    _artifacts[page] = {}
+    module = importlib.import_module(f'src.pages.{page}')
+    return {chart_id: getattr(module, attribute)
+            for chart_id, (module_name, attribute) in EMBED_CHARTS.items() if module_name == page}
@@ -0,0 +1,136 @@
+"""
+Cold-start import report for app.py
+
+Usage:
+    python -m src.utils.import_budget [--budget MS] [--runs N] [--top N] [--pages]
+
+Imports app.py in fresh interpreters with -X importtime, prints the slowest
+modules and packages, and exits non-zero when the import takes longer than
+IMPORT_BUDGET_MS or loads any module listed in LAZY_MODULES.
+"""
+
+import argparse
+import json
+import os
+import pkgutil
+import subprocess
+import sys
+from collections import defaultdict
+
+from config import BASE_DIR, IMPORT_BUDGET_MS, LAZY_MODULES
+
+# Runs in the child interpreter; stdout carries the result, stderr the importtime log
+PROBE = """
+import json, sys, time
+{setup}
+start = time.perf_counter()
+import {target}
+wall_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{'wall_ms': wall_ms, 'modules': sorted(sys.modules)}}))
+"""
+
+def parse_importtime(stderr):
+    """Parse '-X importtime' output into (self_us, cumulative_us, depth, module) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(parts[0]), int(parts[1]), depth, name.strip()))
+    return rows
+
+def measure_import(target='app', setup=''):
+    """Import a module in a fresh interpreter and return timings and loaded modules"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE.format(target=target, setup=setup)],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr[-2000:]}")
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    probe['rows'] = parse_importtime(result.stderr)
+    return probe
+
+def best_of(runs, target='app', setup=''):
+    """Repeat a measurement and keep the fastest run to reduce noise"""
+    results = [measure_import(target, setup) for _ in range(max(runs, 1))]
+    return min(results, key=lambda r: r['wall_ms'])
+
+def package_breakdown(rows):
+    """Sum self time per top-level package"""
+    totals = defaultdict(int)
+    for self_us, _, _, name in rows:
+        totals[name.split('.')[0]] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+def eager_lazy_modules(modules, lazy=LAZY_MODULES):
+    """Return the modules that should load lazily but were imported at boot"""
+    loaded = set(modules)
+    return sorted(
+        name for name in loaded
+        if any(name == lazy_name or name.startswith(lazy_name + '.') for lazy_name in lazy)
+    )
+
+def page_modules():
+    """List the dashboard page modules"""
+    pages_dir = os.path.join(BASE_DIR, 'src', 'pages')
+    return [info.name for info in pkgutil.iter_modules([pages_dir]) if not info.ispkg]
+
+def print_report(result, top):
+    """Print the slowest modules and packages for one measurement"""
+    rows = result['rows']
+    print(f"Cold import of app.py: {result['wall_ms']:.0f} ms ({len(rows)} modules imported)")
+
+    print("\nSlowest modules (cumulative):")
+    for self_us, cumulative_us, _, name in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+    print("\nSlowest packages (self time):")
+    for package, self_us in package_breakdown(rows)[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+def main(argv=None):
+    """Run the report and enforce the cold-start budget"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET_MS,
+                        help='Maximum cold import time of app.py in milliseconds')
+    parser.add_argument('--runs', type=int, default=3, help='Measurements to take (fastest wins)')
+    parser.add_argument('--top', type=int, default=15, help='Rows to show per table')
+    parser.add_argument('--pages', action='store_true',
+                        help='Also report the first-request cost of each page module')
+    args = parser.parse_args(argv)
+
+    result = best_of(args.runs)
+    print_report(result, args.top)
+
+    if args.pages:
+        print("\nFirst import of each page (after app.py):")
+        for page in page_modules():
+            try:
+                page_result = best_of(args.runs, target=f'src.pages.{page}', setup='import app')
+            except RuntimeError as e:
+                print(f"  {'error':>8}     src.pages.{page} ({str(e).strip().splitlines()[-1]})")
+                continue
+            print(f"  {page_result['wall_ms']:8.1f} ms  src.pages.{page}")
+
+    failures = []
+    if result['wall_ms'] > args.budget:
+        failures.append(f"cold import took {result['wall_ms']:.0f} ms, budget is {args.budget:.0f} ms")
+    eager = eager_lazy_modules(result['modules'])
+    if eager:
+        failures.append("modules that must load lazily were imported at boot: " + ', '.join(eager))
+
+    if failures:
+        print("\n[FAIL] " + "\n[FAIL] ".join(failures))
+        return 1
+    print(f"\n[OK] Within the {args.budget:.0f} ms cold-start budget")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+Point occurrence records and their precomputed density tile pyramid
+
+Occurrence files (one sighting per row with a latitude and longitude, e.g. a
+GBIF or iNaturalist export) are read from OCCURRENCE_DATA_DIR in chunks. Each
+point is assigned to a square cell of the Web Mercator grid used by map
+tiles: at zoom z the world is 2**(z + CELL_BITS) cells wide, i.e. every
+256 px map tile holds 2**CELL_BITS x 2**CELL_BITS cells.
+
+Cells are identified by their Morton (Z-order) code, so the parent of a cell
+one zoom level up is simply code >> 2. The pyramid sorts the codes at
+OCCURRENCE_MAX_ZOOM once and derives every coarser level by shifting and
+merging runs, then stores per-level (codes, counts) arrays. A density query
+for a map view only reads the cells of one level inside the view and never
+touches the points.
+"""
+
+import glob
+import os
+import threading
+import numpy as np
+import pandas as pd
+from config import (
+    OCCURRENCE_DATA_DIR, OCCURRENCE_MAX_ZOOM, OCCURRENCE_CELL_BITS,
+    OCCURRENCE_MAX_CELLS, EXPORT_CHUNK_ROWS,
+)
+
+# Recognized (latitude, longitude) column pairs, first match wins
+COORDINATE_COLUMNS = [
+    ('latitude', 'longitude'),
+    ('decimalLatitude', 'decimalLongitude'),
+    ('lat', 'lon'),
+    ('lat', 'lng'),
+]
+
+# Web Mercator is undefined at the poles
+MAX_LATITUDE = 85.05112878
+
+# Unmerged cells collected before partial results are merged
+COMPACT_CELLS = 5_000_000
+
+def occurrence_files(directory=OCCURRENCE_DATA_DIR):
+    """Occurrence files: .csv (comma separated) and .tsv/.txt (tab separated), optionally gzipped"""
+    patterns = ['*.csv', '*.tsv', '*.txt', '*.csv.gz', '*.tsv.gz', '*.txt.gz']
+    return sorted(path for pattern in patterns for path in glob.glob(os.path.join(directory, pattern)))
+
+def _separator(path):
+    return ',' if path.replace('.gz', '').endswith('.csv') else '\t'
+
+def _coordinate_columns(path):
+    header = pd.read_csv(path, sep=_separator(path), nrows=0).columns
+    for latitude, longitude in COORDINATE_COLUMNS:
+        if latitude in header and longitude in header:
+            return latitude, longitude
+    raise ValueError(f"{os.path.basename(path)}: no latitude/longitude columns "
+                     f"(expected one of {', '.join('/'.join(pair) for pair in COORDINATE_COLUMNS)})")
+
+def iter_points(paths, chunksize=EXPORT_CHUNK_ROWS):
+    """Yield (latitude, longitude) float64 arrays per chunk, skipping invalid coordinates"""
+    for path in paths:
+        latitude, longitude = _coordinate_columns(path)
+        chunks = pd.read_csv(path, sep=_separator(path), usecols=[latitude, longitude],
+                             chunksize=chunksize, low_memory=False)
+        for chunk in chunks:
+            lat = pd.to_numeric(chunk[latitude], errors='coerce').to_numpy(dtype=float)
+            lon = pd.to_numeric(chunk[longitude], errors='coerce').to_numpy(dtype=float)
+            valid = (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+            yield lat[valid], lon[valid]
+
+def _spread_bits(v):
+    """Interleave zeros between the low 32 bits of v (uint64)"""
+    v = v & np.uint64(0xFFFFFFFF)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+def _compact_bits(v):
+    """Inverse of _spread_bits"""
+    v = v & np.uint64(0x5555555555555555)
+    v = (v | (v >> np.uint64(1))) & np.uint64(0x3333333333333333)
+    v = (v | (v >> np.uint64(2))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v >> np.uint64(4))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v >> np.uint64(8))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v >> np.uint64(16))) & np.uint64(0x00000000FFFFFFFF)
+    return v
+
+def morton_encode(x, y):
+    return _spread_bits(x.astype(np.uint64)) | (_spread_bits(y.astype(np.uint64)) << np.uint64(1))
+
+def morton_decode(codes):
+    return _compact_bits(codes), _compact_bits(codes >> np.uint64(1))
+
+def grid_size(zoom):
+    """Cells per axis at a zoom level"""
+    return 1 << (zoom + OCCURRENCE_CELL_BITS)
+
+def to_cells(lat, lon, zoom):
+    """Web Mercator cell coordinates of points at a zoom level"""
+    n = grid_size(zoom)
+    lat = np.radians(np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE))
+    x = (lon + 180.0) / 360.0
+    y = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / np.pi) / 2.0
+    return (np.clip(x * n, 0, n - 1).astype(np.uint64),
+            np.clip(y * n, 0, n - 1).astype(np.uint64))
+
+def cell_centers(x, y, zoom):
+    """Latitude and longitude of cell centers"""
+    n = grid_size(zoom)
+    lon = (x.astype(float) + 0.5) / n * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * (y.astype(float) + 0.5) / n))))
+    return lat, lon
+
+def _merge_runs(codes, counts):
+    """Sum the counts of equal adjacent codes (codes must be sorted)"""
+    if not len(codes):
+        return codes, counts
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    return codes[starts], np.add.reduceat(counts, starts)
+
+def _compact(codes, counts):
+    """Sort and merge (codes, counts) pairs from several chunks"""
+    order = np.argsort(codes, kind='stable')
+    return _merge_runs(codes[order], counts[order])
+
+def build_pyramid(chunks, max_zoom=OCCURRENCE_MAX_ZOOM):
+    """Per-zoom (codes, counts) arrays from (lat, lon) chunks
+
+    Each chunk is reduced to counted cells as it arrives and the partial
+    results are merged whenever they outgrow COMPACT_CELLS, so memory follows
+    the number of occupied cells rather than the number of points.
+    """
+    codes = [np.empty(0, dtype=np.uint64)]
+    counts = [np.empty(0, dtype=np.int64)]
+    pending = 0
+    for lat, lon in chunks:
+        chunk_codes = np.sort(morton_encode(*to_cells(lat, lon, max_zoom)))
+        chunk_codes, chunk_counts = _merge_runs(chunk_codes, np.ones(len(chunk_codes), dtype=np.int64))
+        codes.append(chunk_codes)
+        counts.append(chunk_counts)
+        pending += len(chunk_codes)
+        if pending > COMPACT_CELLS:
+            merged_codes, merged_counts = _compact(np.concatenate(codes), np.concatenate(counts))
+            codes, counts = [merged_codes], [merged_counts]
+            pending = 0
+    codes, counts = _compact(np.concatenate(codes), np.concatenate(counts))
+
+    levels = {max_zoom: (codes, counts)}
+    for zoom in range(max_zoom - 1, -1, -1):
+        # Parents of a sorted Morton sequence stay sorted
+        codes, counts = _merge_runs(codes >> np.uint64(2), counts)
+        levels[zoom] = (codes, counts)
+    return levels
+
+def _narrow(values):
+    """Store non-negative integers in 32 bits when they fit"""
+    return values.astype(np.uint32) if not len(values) or values.max() < 2 ** 32 else values
+
+def save_pyramid(levels, path):
+    arrays = {}
+    for zoom, (codes, counts) in levels.items():
+        arrays[f'codes_{zoom}'] = _narrow(codes)
+        arrays[f'counts_{zoom}'] = _narrow(counts)
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+def load_pyramid(path):
+    with np.load(path) as data:
+        zooms = sorted(int(name.split('_')[1]) for name in data.files if name.startswith('codes_'))
+        return {
+            zoom: (data[f'codes_{zoom}'].astype(np.uint64), data[f'counts_{zoom}'].astype(np.int64))
+            for zoom in zooms
+        }
+
+class DensityPyramid:
+    """Query interface over a loaded pyramid"""
+
+    def __init__(self, levels):
+        self.levels = {}
+        for zoom, (codes, counts) in levels.items():
+            x, y = morton_decode(codes)
+            self.levels[zoom] = (x.astype(np.uint32), y.astype(np.uint32), counts)
+        self.max_zoom = max(self.levels) if self.levels else 0
+        self.total = int(levels[0][1].sum()) if 0 in levels else 0
+
+    def query(self, zoom, bounds=None, max_cells=OCCURRENCE_MAX_CELLS):
+        """Cells visible in bounds (south, west, north, east) at zoom
+
+        Falls back to coarser levels until at most max_cells cells remain.
+        Returns (zoom used, latitudes, longitudes, counts).
+        """
+        zoom = int(min(max(zoom, 0), self.max_zoom))
+        while True:
+            x, y, counts = self.levels[zoom]
+            if bounds is not None:
+                south, west, north, east = bounds
+                x0, y0 = to_cells(np.array([north]), np.array([west]), zoom)
+                x1, y1 = to_cells(np.array([south]), np.array([east]), zoom)
+                if west <= east:
+                    in_x = (x >= x0[0]) & (x <= x1[0])
+                else:
+                    # View crosses the antimeridian
+                    in_x = (x >= x0[0]) | (x <= x1[0])
+                mask = in_x & (y >= y0[0]) & (y <= y1[0])
+                x, y, counts = x[mask], y[mask], counts[mask]
+            if len(counts) <= max_cells or zoom == 0:
+                break
+            zoom -= 1
+        lat, lon = cell_centers(x, y, zoom)
+        return zoom, lat, lon, counts
+
+# (files signature, DensityPyramid), swapped as one tuple
+_pyramid_state = None
+_pyramid_lock = threading.Lock()
+
+def _files_signature(paths):
+    return tuple((path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in paths)
+
+def get_density_pyramid():
+    """DensityPyramid of the occurrence files, or None if there are none
+
+    Uses the prebuilt artifact from build_graph when it is current and builds
+    the pyramid in memory otherwise.
+    """
+    global _pyramid_state
+    from src.utils.build_graph import fresh_artifact
+
+    paths = occurrence_files()
+    if not paths:
+        return None
+    signature = _files_signature(paths)
+    state = _pyramid_state
+    if state is None or state[0] != signature:
+        with _pyramid_lock:
+            state = _pyramid_state
+            if state is None or state[0] != signature:
+                artifact = fresh_artifact('occurrences/pyramid')
+                levels = load_pyramid(artifact) if artifact else build_pyramid(iter_points(paths))
+                state = (signature, DensityPyramid(levels))
+                _pyramid_state = state
+    return state[1]
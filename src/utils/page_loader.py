@@ -0,0 +1,32 @@
+"""
+Building page modules once per process
+
+Page modules in src/pages load their data and build their figures when
+first imported. load_page builds each page exactly once: the first request
+for a page builds it, and concurrent requests for the same page wait for
+that build instead of starting their own or seeing a half-initialized
+module. Different pages build in parallel. A build that raises is not
+recorded, so the next request tries again.
+"""
+
+import importlib
+import threading
+
+# Page module name -> built module
+_pages = {}
+# Page module name -> lock held while it is built
+_page_locks = {}
+_page_locks_lock = threading.Lock()
+
+def load_page(module_name):
+    """Import (and on first use, build) a page module"""
+    page = _pages.get(module_name)
+    if page is None:
+        with _page_locks_lock:
+            lock = _page_locks.setdefault(module_name, threading.Lock())
+        with lock:
+            page = _pages.get(module_name)
+            if page is None:
+                page = importlib.import_module(f'src.pages.{module_name}')
+                _pages[module_name] = page
+    return page
@@ -0,0 +1,202 @@
+"""
+Partial plotly.js bundle with only the trace types the dashboard draws
+
+Usage:
+    python -m src.utils.plotly_bundle                    # check the trace types in use
+    python -m src.utils.plotly_bundle --plotly-src DIR   # check, then build and vendor the bundle
+    python -m src.utils.plotly_bundle --bundle FILE      # check, then vendor a bundle built elsewhere
+
+Dash serves the full plotly.js (several MB) to every visitor. The app only
+draws the trace types in PLOTLY_BUNDLE_TRACES, so a partial bundle built
+with plotly.js's own `npm run partial-bundle` script from a plotly.js
+checkout (needs node) is a fraction of the size. It is vendored like the
+other static assets (see assets.py) and loaded in place of the full bundle.
+
+The check fails when the code uses a trace type that is not in
+PLOTLY_BUNDLE_TRACES, or not in the vendored bundle, so a page cannot
+introduce a chart that would silently not render. Trace types are collected
+from the plotly.express and graph_objects calls in the source (which covers
+figures built in callbacks) and from the figures of the rendered pages
+(which covers types chosen at run time, such as px.scatter switching to
+scattergl for large data).
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from config import BASE_DIR, PLOTLY_BUNDLE_TRACES
+
+BUNDLE_NAME = 'snakey'
+
+# plotly.express functions whose trace type is not their own name
+PX_TRACE_TYPES = {
+    'area': ['scatter'], 'line': ['scatter'], 'ecdf': ['scatter'], 'strip': ['box'], 'timeline': ['bar'],
+    'imshow': ['heatmap', 'image'], 'bar_polar': ['barpolar'], 'choropleth_map': ['choroplethmap'],
+    'density_contour': ['histogram2dcontour'], 'density_heatmap': ['histogram2d'],
+    'density_map': ['densitymap'], 'funnel_area': ['funnelarea'],
+    'line_3d': ['scatter3d'], 'scatter_3d': ['scatter3d'], 'line_geo': ['scattergeo'],
+    'scatter_geo': ['scattergeo'], 'line_map': ['scattermap'], 'scatter_map': ['scattermap'],
+    'line_polar': ['scatterpolar'], 'scatter_polar': ['scatterpolar'],
+    'line_ternary': ['scatterternary'], 'scatter_ternary': ['scatterternary'],
+    'scatter_matrix': ['splom'], 'parallel_categories': ['parcats'], 'parallel_coordinates': ['parcoords'],
+}
+
+# First line of a vendored bundle, recording what it contains
+BANNER = '/* Snakey partial plotly.js {version}: traces={traces} */\n'
+BANNER_PATTERN = re.compile(r'/\* Snakey partial plotly\.js (\S+): traces=([\w,]*) \*/')
+
+def source_files():
+    yield os.path.join(BASE_DIR, 'app.py')
+    for dirpath, dirnames, filenames in os.walk(os.path.join(BASE_DIR, 'src')):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith('.py'):
+                yield os.path.join(dirpath, filename)
+
+def _trace_types_of_call(module, function):
+    import plotly.graph_objects as go
+    from plotly.basedatatypes import BaseTraceType
+
+    if module == 'plotly.express':
+        return PX_TRACE_TYPES.get(function, [function])
+    trace_class = getattr(go, function, None)
+    if isinstance(trace_class, type) and issubclass(trace_class, BaseTraceType):
+        return [trace_class().type]
+    return []
+
+def source_trace_types():
+    """Trace type -> files whose plotly calls create it"""
+    found = {}
+    for path in source_files():
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        # Local alias -> plotly module, e.g. px -> plotly.express
+        aliases = {}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    aliases[alias.asname or alias.name] = alias.name
+            elif isinstance(node, ast.ImportFrom) and node.module == 'plotly':
+                for alias in node.names:
+                    aliases[alias.asname or alias.name] = f'plotly.{alias.name}'
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and isinstance(node.func.value, ast.Name)):
+                continue
+            module = aliases.get(node.func.value.id)
+            if module in ('plotly.express', 'plotly.graph_objects'):
+                for trace_type in _trace_types_of_call(module, node.func.attr):
+                    found.setdefault(trace_type, set()).add(os.path.relpath(path, BASE_DIR))
+    return found
+
+def _figures(node):
+    """Figures of the dcc.Graph components in a layout"""
+    if isinstance(node, (list, tuple)):
+        for child in node:
+            yield from _figures(child)
+        return
+    if getattr(node, '_type', None) == 'Graph' and getattr(node, 'figure', None) is not None:
+        yield node.figure
+    children = getattr(node, 'children', None)
+    if children is not None and not isinstance(children, (str, int, float)):
+        yield from _figures(children)
+
+def page_trace_types():
+    """Trace type -> app paths whose rendered figures contain it"""
+    import app
+
+    found = {}
+    for path, module_name in app.PAGES.items():
+        for figure in _figures(app.load_page(module_name).layout):
+            data = figure.get('data', []) if isinstance(figure, dict) else figure.data
+            for trace in data:
+                trace_type = (trace.get('type') if isinstance(trace, dict) else trace.type) or 'scatter'
+                found.setdefault(trace_type, set()).add(path)
+    return found
+
+def bundle_traces(path):
+    """(plotly.js version, trace types) recorded in a vendored bundle, or None"""
+    with open(path, encoding='utf-8') as f:
+        match = BANNER_PATTERN.match(f.readline())
+    return (match.group(1), match.group(2).split(',')) if match else None
+
+def check(traces=PLOTLY_BUNDLE_TRACES, bundle=None):
+    """Print where each trace type is used; returns False if one is not bundled"""
+    used = source_trace_types()
+    for trace_type, paths in page_trace_types().items():
+        used.setdefault(trace_type, set()).update(paths)
+
+    ok = True
+    for trace_type in sorted(used):
+        where = ', '.join(sorted(used[trace_type]))
+        if trace_type in traces:
+            print(f"[OK] {trace_type}: {where}")
+        else:
+            print(f"[FAIL] {trace_type} is not in PLOTLY_BUNDLE_TRACES (used in {where})")
+            ok = False
+    if bundle is not None:
+        recorded = bundle_traces(bundle)
+        missing = sorted(set(used) - set(recorded[1] if recorded else []))
+        if missing:
+            print(f"[FAIL] The vendored bundle lacks {', '.join(missing)}; rebuild it")
+            ok = False
+    return ok
+
+def build_bundle(plotly_src, traces=PLOTLY_BUNDLE_TRACES):
+    """Run plotly.js's partial-bundle script in a plotly.js checkout; returns the bundle path"""
+    from plotly.offline import get_plotlyjs_version
+
+    with open(os.path.join(plotly_src, 'package.json')) as f:
+        version = json.load(f)['version']
+    if version != get_plotlyjs_version():
+        raise ValueError(f"{plotly_src} is plotly.js {version}, but the plotly package "
+                         f"targets {get_plotlyjs_version()}")
+    subprocess.run(['npm', 'run', 'partial-bundle', '--', '--name', BUNDLE_NAME, '--traces', ','.join(traces)],
+                   cwd=plotly_src, check=True)
+    for filename in (f'plotly-{BUNDLE_NAME}.min.js', f'plotly-{BUNDLE_NAME}.js'):
+        path = os.path.join(plotly_src, 'dist', filename)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"partial-bundle did not write dist/plotly-{BUNDLE_NAME}.min.js")
+
+def vendor_bundle(path, traces=PLOTLY_BUNDLE_TRACES):
+    """Vendor a bundle, prefixed with the banner recording its trace types"""
+    from plotly.offline import get_plotlyjs_version
+    from src.utils.assets import vendor_file
+
+    with tempfile.TemporaryDirectory() as directory:
+        banner_path = os.path.join(directory, f'plotly-{BUNDLE_NAME}.min.js')
+        with open(path, encoding='utf-8') as source, open(banner_path, 'w', encoding='utf-8') as target:
+            target.write(BANNER.format(version=get_plotlyjs_version(), traces=','.join(sorted(traces))))
+            target.write(source.read())
+        return vendor_file('plotly.js', banner_path)
+
+def main(argv=None):
+    from src.utils.assets import vendor_path
+
+    parser = argparse.ArgumentParser(description='Check the plotly.js trace types in use and build a partial bundle')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--plotly-src', help='plotly.js checkout to build the bundle in (needs node and npm)')
+    source.add_argument('--bundle', help='Vendor this already built partial bundle')
+    args = parser.parse_args(argv)
+
+    building = args.plotly_src or args.bundle
+    if not check(bundle=None if building else vendor_path('plotly.js')):
+        return 1
+    if not building:
+        return 0
+    try:
+        path = args.bundle or build_bundle(args.plotly_src)
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"[FAIL] {e}")
+        return 1
+    print(f"[OK] Vendored {vendor_bundle(path)} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Opt-in profiling for the routing callback and page builds
+
+Profiling is off unless SNAKEY_PROFILE is set, or a request carries the
+X-Snakey-Profile header with the value of SNAKEY_PROFILE_TOKEN. Each profiled
+call writes one file to PROFILE_DIR:
+
+- 'sample' mode writes collapsed stacks (*.folded), the input format of
+  flamegraph.pl, inferno and speedscope
+- 'cprofile' mode writes a pstats dump (*.prof) for snakeviz or pstats
+
+Only the newest PROFILE_RETENTION files are kept.
+"""
+
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from config import (
+    PROFILE_ENABLED,
+    PROFILE_TOKEN,
+    PROFILE_HEADER,
+    PROFILE_MODE,
+    PROFILE_DIR,
+    PROFILE_RETENTION,
+    PROFILE_SAMPLE_INTERVAL,
+)
+
+PROFILE_EXTENSIONS = ('.folded', '.prof')
+
+# Tracks whether the current thread is already being profiled, so nested
+# sections (a page build inside the routing callback) land in one profile
+_active = threading.local()
+
+class SamplingProfiler:
+    """Sample the stack of one thread at a fixed interval"""
+
+    def __init__(self, thread_id, interval=PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='snakey-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+def _collapse(frame):
+    """Render a frame chain root-first as 'file:function;file:function'"""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(parts))
+
+def _header_requested():
+    """Check the request header against the configured token"""
+    if not PROFILE_TOKEN:
+        return False
+    try:
+        from flask import has_request_context, request
+    except ImportError:
+        return False
+    if not has_request_context():
+        return False
+    value = request.headers.get(PROFILE_HEADER, '')
+    return hmac.compare_digest(value.encode(), PROFILE_TOKEN.encode())
+
+def should_profile():
+    """Decide whether the current call should be profiled"""
+    return PROFILE_ENABLED or _header_requested()
+
+def _output_path(name, extension):
+    """Build a unique, filesystem-safe file name for one profile"""
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') or 'profile'
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    millis = int(time.time() * 1000) % 1000
+    return os.path.join(
+        PROFILE_DIR,
+        f"{stamp}.{millis:03d}-{os.getpid()}-{threading.get_ident()}-{safe_name}{extension}"
+    )
+
+def prune_profiles(directory=PROFILE_DIR, keep=PROFILE_RETENTION):
+    """Delete the oldest profile files beyond the retention cap"""
+    try:
+        entries = [
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.endswith(PROFILE_EXTENSIONS)
+        ]
+    except FileNotFoundError:
+        return
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+@contextmanager
+def profile_section(name):
+    """Profile the enclosed block if profiling is requested for this call"""
+    if getattr(_active, 'running', False) or not should_profile():
+        yield None
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    _active.running = True
+    try:
+        if PROFILE_MODE == 'cprofile':
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield profiler
+            finally:
+                profiler.disable()
+                path = _output_path(name, '.prof')
+                profiler.dump_stats(path)
+        else:
+            profiler = SamplingProfiler(threading.get_ident())
+            profiler.start()
+            try:
+                yield profiler
+            finally:
+                profiler.stop()
+                path = _output_path(name, '.folded')
+                profiler.write(path)
+    finally:
+        _active.running = False
+        prune_profiles()
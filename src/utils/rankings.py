@@ -0,0 +1,148 @@
+"""
+Top-N species per group from precomputed orderings
+
+A RankIndex sorts a dataset's rows once: grouped by a column, and by
+descending metric within each group, recording where each group starts in
+the ordering. The top n rows of a group are then a slice of it, so a query
+costs O(n) with no sort or selection. Groups are the values of one of the
+dataset's filter keys (DATASET_FILTERS in data_loader.py); a species listed
+for several states or countries is ranked in each of them. Ties keep
+dataset order, as DataFrame.nlargest does, and rows without a value are
+left out.
+
+Indexes are built on first use and cached per dataset version, metric and
+grouping. Filters (venomous=Yes, ...) are not part of the cache key, so
+arbitrary query values cannot grow it: they become a row mask, and a
+filtered query keeps the rows of the cached ordering that pass it. top_rows
+ranks frames that are not a whole dataset (such as a page's filtered
+subset) with a single partial selection.
+"""
+
+import threading
+import numpy as np
+
+# Dataset -> {metric that can be ranked: numeric column it is ranked by}.
+# Metrics named after a text column (annual_production_skins holds '<1000',
+# cultural_impact 'High - ...') are ranked by the number derive.py parses.
+RANKED_METRICS = {
+    'us_snakes': {'lethality_score': 'lethality_score', 'max_length_cm': 'max_length_cm'},
+    'global_snakes': {'lethality_score': 'lethality_score', 'max_length_cm': 'max_length_cm'},
+    'domesticated_snakes': {'popularity_score': 'popularity_score'},
+    'media_snakes': {'accuracy_rating': 'accuracy_score', 'cultural_impact': 'impact_score', 'year': 'release_year'},
+    'farming': {'annual_production_skins': 'production_skins'},
+}
+
+def top_rows(df, metric, n):
+    """The n rows of df with the largest metric, largest first (like df.nlargest(n, metric))"""
+    values = df[metric].to_numpy(dtype=float, na_value=np.nan)
+    rows = np.flatnonzero(~np.isnan(values))
+    if 0 < n < len(rows):
+        # Keep every row tied with the n-th largest value, so the stable
+        # ordering below picks the earliest of them
+        kth = np.partition(values[rows], len(rows) - n)[len(rows) - n]
+        rows = rows[values[rows] >= kth]
+    order = np.lexsort((rows, -values[rows]))[:max(n, 0)]
+    return df.iloc[rows[order]]
+
+class RankIndex:
+    """Rows of a frame ordered by group, then by descending metric"""
+
+    def __init__(self, df, metric, column=None, multi_value=False):
+        import pandas as pd
+        from src.utils.data_loader import split_entries
+
+        if column is None:
+            rows = np.arange(len(df))
+            codes = np.zeros(len(df), dtype=np.intp)
+            groups = pd.Index([None])
+        else:
+            if multi_value:
+                rows, entries = split_entries(df[column])
+            else:
+                rows, entries = np.arange(len(df)), df[column]
+            codes, groups = pd.factorize(entries, sort=True)
+
+        values = df[metric].to_numpy(dtype=float, na_value=np.nan)[rows]
+        keep = (codes >= 0) & ~np.isnan(values)
+        rows, codes, values = rows[keep], codes[keep], values[keep]
+        order = np.lexsort((rows, -values, codes))
+        self.rows = rows[order]
+        self.codes = codes[order]
+        self.groups = list(groups)
+        self.offsets = np.searchsorted(self.codes, np.arange(len(self.groups) + 1))
+        self.lookup = {str(group).strip().lower(): code for code, group in enumerate(self.groups)}
+
+    def top(self, n, group=None, mask=None):
+        """Row positions of the top n rows of a group (the whole frame if not grouped)
+
+        mask (a boolean array over the frame's rows) skips the rows it is
+        False for.
+        """
+        code = 0 if group is None else self.lookup.get(str(group).strip().lower())
+        if code is None:
+            return self.rows[:0]
+        start, end = self.offsets[code], self.offsets[code + 1]
+        if mask is None:
+            return self.rows[start:min(start + max(n, 0), end)]
+        ordered = self.rows[start:end]
+        return ordered[mask[ordered]][:max(n, 0)]
+
+    def top_per_group(self, n, mask=None):
+        """(row positions, group labels, ranks from 1) of the top n rows of every group"""
+        rows, codes, offsets = self.rows, self.codes, self.offsets
+        if mask is not None:
+            keep = mask[rows]
+            rows, codes = rows[keep], codes[keep]
+            offsets = np.searchsorted(codes, np.arange(len(self.groups) + 1))
+        ranks = np.arange(len(rows)) - offsets[codes]
+        keep = ranks < n
+        groups = np.asarray(self.groups, dtype=object)[codes[keep]]
+        return rows[keep], groups, ranks[keep] + 1
+
+# (dataset, metric, filter key) -> (dataset version, frame, index)
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_rank_index(name, metric, by=None):
+    """Cached (frame, RankIndex) of a whole dataset"""
+    from src.utils.data_loader import DATASET_FILTERS, MULTI_VALUE_COLUMNS, get_dataset, get_dataset_version
+
+    if name not in RANKED_METRICS:
+        raise ValueError(f"Unknown dataset: {name}. Available: {', '.join(RANKED_METRICS)}")
+    if metric not in RANKED_METRICS[name]:
+        raise ValueError(f"Cannot rank {name} by {metric}. Available: {', '.join(RANKED_METRICS[name])}")
+    if by is not None and by not in DATASET_FILTERS[name]:
+        raise ValueError(f"Cannot group {name} by {by}. Available: {', '.join(DATASET_FILTERS[name])}")
+
+    key = (name, metric, by)
+    version = get_dataset_version(name)
+    cached = _indexes.get(key)
+    if cached is None or cached[0] != version:
+        with _indexes_lock:
+            cached = _indexes.get(key)
+            if cached is None or cached[0] != version:
+                df = get_dataset(name)
+                column = DATASET_FILTERS[name][by] if by is not None else None
+                index = RankIndex(df, RANKED_METRICS[name][metric], column, column in MULTI_VALUE_COLUMNS)
+                cached = (version, df, index)
+                _indexes[key] = cached
+    return cached[1], cached[2]
+
+def _row_mask(df, name, filters):
+    """Mask of the rows matching filters, or None without filters"""
+    from src.utils.data_loader import filter_mask
+
+    return filter_mask(df, name, filters).to_numpy(dtype=bool) if filters else None
+
+def top_species(name, metric, n=10, by=None, group=None, filters=None):
+    """The n rows of a dataset with the largest metric, within one group of `by` if given"""
+    df, index = get_rank_index(name, metric, by)
+    mask = _row_mask(df, name, filters)
+    return df.iloc[index.top(n, group if by is not None else None, mask)]
+
+def top_species_by(name, metric, by, n=10, filters=None):
+    """The top n rows of every group of `by`, with the group and rank as the first columns"""
+    df, index = get_rank_index(name, metric, by)
+    rows, groups, ranks = index.top_per_group(n, _row_mask(df, name, filters))
+    top = df.iloc[rows].assign(**{by: groups, 'rank': ranks})
+    return top[[by, 'rank'] + [column for column in top.columns if column not in (by, 'rank')]]
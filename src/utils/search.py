@@ -0,0 +1,182 @@
+"""
+Fuzzy species name search backed by a trigram index
+
+Every name field across the datasets (species_name/common_name in the US,
+global and domesticated data, primary_species_farmed in the farming data and
+snake_species_portrayed in the media data) goes into one TrigramIndex. The
+index is built once, vectorized with NumPy, and stores its postings in CSR
+form, so a query only touches the posting lists of its own trigrams and never
+scans the DataFrames. Matches are ranked by trigram (Dice) similarity, which
+tolerates typos, with a bonus for prefix and substring matches so the top
+results behave like autocomplete.
+"""
+
+import re
+import threading
+import unicodedata
+import numpy as np
+
+# Name fields indexed per dataset, as (dataset, column, label) tuples
+SEARCH_FIELDS = [
+    ('us_snakes', 'common_name', 'US species'),
+    ('us_snakes', 'species_name', 'US species'),
+    ('global_snakes', 'common_name', 'Global species'),
+    ('global_snakes', 'species_name', 'Global species'),
+    ('domesticated_snakes', 'common_name', 'Domesticated snakes'),
+    ('domesticated_snakes', 'species_name', 'Domesticated snakes'),
+    ('farming', 'primary_species_farmed', 'Snakeskin farming'),
+    ('media_snakes', 'snake_species_portrayed', 'Snakes in media'),
+]
+
+# Normalized names only contain ' ', a-z and 0-9
+ALPHABET_SIZE = 37
+TRIGRAM_SPACE = ALPHABET_SIZE ** 3
+_SYMBOLS = np.zeros(256, dtype=np.int32)
+_SYMBOLS[ord('a'):ord('z') + 1] = np.arange(1, 27)
+_SYMBOLS[ord('0'):ord('9') + 1] = np.arange(27, 37)
+
+_NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+
+MIN_SCORE = 0.2
+# Candidates must share this fraction of the query's trigrams; one typo
+# breaks at most three trigrams, so this keeps typo'd matches while
+# skipping names that only share a common word ending
+MIN_SHARED_FRACTION = 1 / 3
+PREFIX_BONUS = 0.5
+SUBSTRING_BONUS = 0.25
+
+def normalize_name(name):
+    """Lowercase, strip accents and reduce a name to letters, digits and single spaces"""
+    text = str(name)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(_NON_ALPHANUMERIC.sub(' ', text.lower()).split())
+
+def _pad(normalized):
+    """Pad a normalized name so prefixes and word ends produce trigrams"""
+    return f"  {normalized} "
+
+def _trigram_codes(padded):
+    """Trigram codes of every position of an ASCII string"""
+    symbols = _SYMBOLS[np.frombuffer(padded.encode('ascii'), dtype=np.uint8)]
+    return (symbols[:-2] * ALPHABET_SIZE + symbols[1:-1]) * ALPHABET_SIZE + symbols[2:]
+
+class TrigramIndex:
+    """Inverted trigram index over a list of names"""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.normalized = [normalize_name(name) for name in self.names]
+        count = len(self.names)
+
+        padded = [_pad(name) for name in self.normalized]
+        lengths = np.fromiter((len(p) for p in padded), dtype=np.int64, count=count)
+        codes = _trigram_codes(''.join(padded) + '  ')
+
+        # A position starts a trigram of its own name if at least two more
+        # characters of that name follow it
+        starts = np.cumsum(lengths) - lengths
+        name_of_position = np.repeat(np.arange(count, dtype=np.int64), lengths)
+        offset_in_name = np.arange(len(name_of_position)) - np.repeat(starts, lengths)
+        valid = offset_in_name <= np.repeat(lengths, lengths) - 3
+
+        # Postings sorted by trigram: a stable sort of the small integer
+        # codes keeps names ascending within each trigram, so repeated
+        # trigrams of one name end up adjacent and can be dropped
+        codes = codes[valid]
+        name_ids = name_of_position[valid]
+        order = np.argsort(codes, kind='stable')
+        codes, name_ids = codes[order], name_ids[order]
+        first = np.ones(len(codes), dtype=bool)
+        first[1:] = (codes[1:] != codes[:-1]) | (name_ids[1:] != name_ids[:-1])
+        self.postings = name_ids[first].astype(np.int32)
+        self.offsets = np.searchsorted(codes[first], np.arange(TRIGRAM_SPACE + 1))
+        self.trigram_counts = np.bincount(self.postings, minlength=count)
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, query, limit=10, min_score=MIN_SCORE):
+        """Return (name_id, score) pairs for the best matches, best first"""
+        normalized = normalize_name(query)
+        if not normalized or not len(self.names):
+            return []
+
+        query_trigrams = np.unique(_trigram_codes(_pad(normalized)))
+
+        # Count shared trigrams per name. Each posting list holds a name at
+        # most once, so a fancy-indexed increment per trigram is exact. The
+        # counter is int32 since a long query can have over 255 trigrams.
+        shared = np.zeros(len(self.names), dtype=np.int32)
+        for trigram in query_trigrams:
+            shared[self.postings[self.offsets[trigram]:self.offsets[trigram + 1]]] += 1
+        min_shared = max(1, int(np.ceil(len(query_trigrams) * MIN_SHARED_FRACTION)))
+        candidates = np.flatnonzero(shared >= min_shared)
+        if not len(candidates):
+            return []
+        shared = shared[candidates]
+
+        scores = 2.0 * shared / (len(query_trigrams) + self.trigram_counts[candidates])
+        shortlist_size = min(len(candidates), max(limit * 5, 50))
+        shortlist = np.argpartition(-scores, shortlist_size - 1)[:shortlist_size]
+
+        results = []
+        for position in shortlist:
+            name_id = int(candidates[position])
+            score = float(scores[position])
+            name = self.normalized[name_id]
+            if name.startswith(normalized):
+                score += PREFIX_BONUS
+            elif normalized in name:
+                score += SUBSTRING_BONUS
+            if score >= min_score:
+                results.append((name_id, score))
+        results.sort(key=lambda item: (-item[1], len(self.normalized[item[0]])))
+        return results[:limit]
+
+def collect_species_names():
+    """Gather unique names across all datasets with the places they appear"""
+    from src.utils.data_loader import get_dataset
+
+    entries = {}
+    for dataset, column, label in SEARCH_FIELDS:
+        for value in get_dataset(dataset)[column].dropna().unique():
+            key = normalize_name(value)
+            if not key:
+                continue
+            entry = entries.setdefault(key, {'name': str(value), 'sources': []})
+            source = {'dataset': dataset, 'column': column, 'label': label}
+            if source not in entry['sources']:
+                entry['sources'].append(source)
+    return list(entries.values())
+
+# (dataset versions, entries, index), swapped as one tuple so readers never
+# see entries and an index from different builds
+_index_state = None
+_index_lock = threading.Lock()
+
+def get_species_index():
+    """Return (entries, TrigramIndex) for the current datasets"""
+    global _index_state
+    from src.utils.data_loader import get_dataset_version
+
+    datasets = sorted({dataset for dataset, _, _ in SEARCH_FIELDS})
+    versions = tuple(get_dataset_version(name) for name in datasets)
+    state = _index_state
+    if state is None or state[0] != versions:
+        with _index_lock:
+            state = _index_state
+            if state is None or state[0] != versions:
+                entries = collect_species_names()
+                state = (versions, entries, TrigramIndex(entry['name'] for entry in entries))
+                _index_state = state
+    return state[1], state[2]
+
+def search_species(query, limit=10):
+    """Ranked, typo-tolerant species name matches for a query"""
+    entries, index = get_species_index()
+    return [
+        {**entries[name_id], 'score': round(score, 3)}
+        for name_id, score in index.search(query, limit=limit)
+    ]
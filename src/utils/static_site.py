@@ -0,0 +1,353 @@
+"""
+Static pre-rendered export of the dashboard
+
+Usage:
+    python -m src.utils.static_site [--output DIR] [--force]
+
+Builds every page in app.PAGES once and writes a self-contained bundle that
+any static file host (GitHub Pages, S3, Netlify, nginx) can serve:
+
+    index.html, global/index.html, ...   pre-rendered pages
+    layout.json, global/layout.json, ... the Dash layout of each page
+    assets/plotly.min.js                 plotly.js, shipped with the plotly package (or vendored)
+    assets/bootstrap.*.css, topojson/    vendored copies, if any (src/utils/assets.py)
+
+Pages are rendered to plain Bootstrap HTML and figures are drawn by plotly.js
+from inline JSON, so viewing a page needs no Python at all. The build is
+skipped when neither the data nor the page code changed since the last one.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import shutil
+import sys
+
+import plotly
+from plotly.io.json import to_json_plotly
+
+from config import BASE_DIR, STATIC_BUILD_DIR
+from src.components.columnar_table import STORE_TYPE, TABLE_TYPE
+from src.utils.assets import URL_PREFIX, load_manifest, vendor_path
+from src.utils.columnar import decode_columns
+from src.utils.profiling import profile_section
+
+MANIFEST_NAME = 'manifest.json'
+
+# Tags that never have children
+VOID_TAGS = {'br', 'hr', 'img', 'input', 'link', 'meta'}
+
+# Dash prop -> HTML attribute
+ATTRIBUTE_NAMES = {'className': 'class', 'id': 'id', 'href': 'href', 'title': 'title', 'src': 'src'}
+
+class StaticRenderer:
+    """Render a Dash component tree to HTML for one page of the bundle"""
+
+    def __init__(self, root_prefix):
+        # Relative path from the page being rendered back to the bundle root
+        self.root_prefix = root_prefix
+        self.figures = []
+        # Columnar table payloads by table name (src/components/columnar_table.py)
+        self.columnar = {}
+
+    def link(self, href):
+        """Rewrite an app path such as '/global' to a relative bundle link"""
+        if not href or not href.startswith('/') or href.startswith('//'):
+            return href
+        path = href.strip('/')
+        return f"{self.root_prefix}{path + '/' if path else ''}index.html"
+
+    def render(self, node):
+        if node is None or node is False:
+            return ''
+        if isinstance(node, (list, tuple)):
+            return ''.join(self.render(child) for child in node)
+        if isinstance(node, (str, int, float)):
+            return html.escape(str(node))
+        if hasattr(node, 'to_plotly_json'):
+            node = node.to_plotly_json()
+        if isinstance(node, dict) and 'namespace' in node:
+            handler = getattr(self, f"render_{node['type']}", None)
+            props = node.get('props', {})
+            if handler is not None:
+                return handler(props)
+            if node['namespace'] == 'dash_html_components':
+                return self.element(node['type'].lower(), props)
+            # Unknown component: keep its content
+            return self.element('div', props)
+        return html.escape(str(node))
+
+    def element(self, tag, props, classes=(), children=None, **attributes):
+        """Render one HTML element from Dash props plus extra classes/attributes"""
+        class_names = [c for c in classes if c] + ([props['className']] if props.get('className') else [])
+        attrs = {}
+        if class_names:
+            attrs['class'] = ' '.join(class_names)
+        for prop, name in ATTRIBUTE_NAMES.items():
+            if prop != 'className' and isinstance(props.get(prop), str):
+                attrs[name] = props[prop]
+        if isinstance(props.get('style'), dict):
+            attrs['style'] = css(props['style'])
+        attrs.update({k.replace('_', '-'): v for k, v in attributes.items() if v is not None})
+        if 'href' in attrs:
+            attrs['href'] = self.link(attrs['href'])
+
+        rendered_attrs = ''.join(f' {name}="{html.escape(str(value))}"' for name, value in attrs.items())
+        if tag in VOID_TAGS:
+            return f"<{tag}{rendered_attrs}>"
+        content = self.render(props.get('children') if children is None else children)
+        return f"<{tag}{rendered_attrs}>{content}</{tag}>"
+
+    # Dash core components
+
+    def render_Graph(self, props):
+        figure = props.get('figure')
+        if figure is None:
+            return ''
+        index = len(self.figures)
+        config = dict(props.get('config') or {})
+        if config.get('topojsonURL', '').startswith(URL_PREFIX):
+            # Vendored topojson is copied into the bundle
+            config['topojsonURL'] = f"{self.root_prefix}assets/topojson/"
+        self.figures.append({'figure': figure, 'config': config})
+        return self.element('div', props, classes=['snakey-graph'], children='',
+                            data_figure=f"figure-{index}")
+
+    def render_Location(self, props):
+        return ''
+
+    def render_Store(self, props):
+        # Columnar table data is decoded when its table is rendered
+        store_id = props.get('id')
+        if isinstance(store_id, dict) and store_id.get('type') == STORE_TYPE:
+            self.columnar[store_id['table']] = props.get('data')
+        return ''
+
+    # Dash DataTable
+
+    def render_DataTable(self, props):
+        table_id = props.get('id')
+        if isinstance(table_id, dict) and table_id.get('type') == TABLE_TYPE:
+            props = dict(props, data=decode_columns(self.columnar[table_id['table']]))
+        columns = props.get('columns') or [{'name': key, 'id': key} for key in (props.get('data') or [{}])[0]]
+        header = ''.join(f"<th>{html.escape(str(c['name']))}</th>" for c in columns)
+        rows = ''.join(
+            '<tr>' + ''.join(
+                f"<td>{'' if row.get(c['id']) is None else html.escape(str(row.get(c['id'])))}</td>"
+                for c in columns
+            ) + '</tr>'
+            for row in props.get('data') or []
+        )
+        return (
+            '<div class="table-responsive"><table class="table table-striped table-sm">'
+            f'<thead class="table-dark"><tr>{header}</tr></thead><tbody>{rows}</tbody></table></div>'
+        )
+
+    # Dash Bootstrap Components
+
+    def render_Container(self, props):
+        return self.element('div', props, classes=['container-fluid' if props.get('fluid') else 'container'])
+
+    def render_Row(self, props):
+        return self.element('div', props, classes=['row'])
+
+    def render_Col(self, props):
+        width = props.get('width')
+        return self.element('div', props, classes=[f'col-{width}' if isinstance(width, int) else 'col'])
+
+    def render_Card(self, props):
+        border = f"border-{props['color']}" if props.get('outline') and props.get('color') else ''
+        return self.element('div', props, classes=['card', border])
+
+    def render_CardBody(self, props):
+        return self.element('div', props, classes=['card-body'])
+
+    def render_CardHeader(self, props):
+        return self.element('div', props, classes=['card-header'])
+
+    def render_Alert(self, props):
+        return self.element('div', props, classes=['alert', f"alert-{props.get('color', 'primary')}"],
+                            role='alert')
+
+    def render_Accordion(self, props):
+        return self.element('div', props, classes=['accordion'])
+
+    def render_AccordionItem(self, props):
+        title = html.escape(str(props.get('title', '')))
+        body = self.render(props.get('children'))
+        return (
+            f'<details class="accordion-item"><summary class="accordion-header accordion-button">{title}</summary>'
+            f'<div class="accordion-body">{body}</div></details>'
+        )
+
+    def render_NavbarSimple(self, props):
+        theme = 'navbar-dark' if props.get('dark') else 'navbar-light'
+        brand = html.escape(str(props.get('brand', '')))
+        brand_href = html.escape(self.link(props.get('brand_href', '/')))
+        items = self.render(props.get('children'))
+        container = 'container-fluid' if props.get('fluid') else 'container'
+        return (
+            f'<nav class="navbar navbar-expand-md {theme} bg-{props.get("color", "light")}">'
+            f'<div class="{container}"><a class="navbar-brand" href="{brand_href}">{brand}</a>'
+            f'<ul class="navbar-nav ms-auto">{items}</ul></div></nav>'
+        )
+
+    def render_NavItem(self, props):
+        return self.element('li', props, classes=['nav-item'])
+
+    def render_NavLink(self, props):
+        return self.element('a', props, classes=['nav-link'])
+
+def css(style):
+    """Convert a Dash style dict to an inline CSS string"""
+    def kebab(name):
+        return ''.join(f'-{c.lower()}' if c.isupper() else c for c in name)
+    return '; '.join(f"{kebab(key)}: {value}" for key, value in style.items())
+
+def script_json(value):
+    """Serialize a value for embedding in a <script> element"""
+    return to_json_plotly(value).replace('</', '<\\/')
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="stylesheet" href="{stylesheet}">
+</head>
+<body>
+{navbar}
+<div style="padding: 20px">{content}</div>
+{figure_data}
+<script src="{root}assets/plotly.min.js"></script>
+<script>
+document.querySelectorAll('.snakey-graph').forEach(function (el) {{
+  var spec = JSON.parse(document.getElementById(el.dataset.figure).textContent);
+  var figure = spec.figure;
+  Plotly.newPlot(el, figure.data, figure.layout, Object.assign({{responsive: true}}, spec.config));
+}});
+</script>
+</body>
+</html>
+"""
+
+def page_directory(path):
+    """Bundle-relative directory for an app path ('' for the home page)"""
+    return path.strip('/')
+
+def render_page_html(path, layout, navbar, title, stylesheet):
+    """Render one page of the bundle to a complete HTML document"""
+    directory = page_directory(path)
+    root = '../' * len([part for part in directory.split('/') if part])
+    renderer = StaticRenderer(root)
+    navbar_html = renderer.render(navbar)
+    content = renderer.render(layout)
+    figure_data = '\n'.join(
+        f'<script type="application/json" id="figure-{index}">{script_json(spec)}</script>'
+        for index, spec in enumerate(renderer.figures)
+    )
+    return PAGE_TEMPLATE.format(
+        title=html.escape(title),
+        stylesheet=html.escape(stylesheet if '://' in stylesheet else root + stylesheet),
+        navbar=navbar_html,
+        content=content,
+        figure_data=figure_data,
+        root=root,
+    )
+
+def source_fingerprint():
+    """Hash of the data files and page code the bundle is built from"""
+    from src.utils.data_loader import DATASET_FILES, get_dataset_version
+
+    digest = hashlib.sha256()
+    for name in sorted(DATASET_FILES):
+        digest.update(get_dataset_version(name).encode())
+    for dirpath, dirnames, filenames in os.walk(os.path.join(BASE_DIR, 'src')):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith('.py'):
+                with open(os.path.join(dirpath, filename), 'rb') as f:
+                    digest.update(f.read())
+    for filename in ('app.py', 'config.py'):
+        with open(os.path.join(BASE_DIR, filename), 'rb') as f:
+            digest.update(f.read())
+    digest.update(plotly.__version__.encode())
+    digest.update(json.dumps(load_manifest(), sort_keys=True).encode())
+    return digest.hexdigest()
+
+def page_titles(navbar):
+    """Map app paths to their navigation labels"""
+    titles = {}
+    for item in navbar.children:
+        link = item.children
+        titles[link.href] = link.children
+    return titles
+
+def build(output_dir=STATIC_BUILD_DIR, force=False):
+    """Pre-render every page into output_dir; returns the list of failed pages"""
+    import app
+
+    fingerprint = source_fingerprint()
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if json.load(f).get('fingerprint') == fingerprint:
+                print(f"[OK] Static bundle in {output_dir} is up to date")
+                return []
+
+    stylesheet = app.app.config.external_stylesheets[0]
+    os.makedirs(os.path.join(output_dir, 'assets'), exist_ok=True)
+    # The partial bundle if one is vendored (src/utils/plotly_bundle.py)
+    shutil.copyfile(
+        vendor_path('plotly.js') or os.path.join(os.path.dirname(plotly.__file__), 'package_data', 'plotly.min.js'),
+        os.path.join(output_dir, 'assets', 'plotly.min.js'),
+    )
+    if stylesheet.startswith(URL_PREFIX):
+        # Bundle-relative; each page prefixes its path back to the root
+        path = vendor_path('bootstrap.css')
+        stylesheet = f"assets/{os.path.basename(path)}"
+        shutil.copyfile(path, os.path.join(output_dir, stylesheet))
+    if vendor_path('topojson'):
+        shutil.copytree(vendor_path('topojson'), os.path.join(output_dir, 'assets', 'topojson'),
+                        dirs_exist_ok=True)
+
+    titles = page_titles(app.navbar)
+    failed = []
+    pages = {}
+    for path, module_name in app.PAGES.items():
+        try:
+            with profile_section(f'static-{module_name}'):
+                layout = app.load_page(module_name).layout
+        except Exception as e:
+            print(f"[FAIL] {path} ({module_name}): {type(e).__name__}: {e}")
+            failed.append(path)
+            continue
+
+        page_dir = os.path.join(output_dir, page_directory(path))
+        os.makedirs(page_dir, exist_ok=True)
+        page_html = render_page_html(path, layout, app.navbar, f"Snakey Dashboard - {titles.get(path, module_name)}", stylesheet)
+        with open(os.path.join(page_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(page_html)
+        with open(os.path.join(page_dir, 'layout.json'), 'w', encoding='utf-8') as f:
+            f.write(to_json_plotly(layout))
+        pages[path] = os.path.relpath(os.path.join(page_dir, 'index.html'), output_dir)
+        print(f"[OK] {path} -> {pages[path]} ({len(page_html):,} bytes)")
+
+    if not failed:
+        with open(manifest_path, 'w') as f:
+            json.dump({'fingerprint': fingerprint, 'pages': pages}, f, indent=2)
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pre-render the dashboard into a static bundle')
+    parser.add_argument('--output', default=STATIC_BUILD_DIR, help='Output directory')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if nothing changed')
+    args = parser.parse_args(argv)
+    failed = build(args.output, force=args.force)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Canonical taxon keys and the cross-dataset join index
+
+The datasets name the same animals in different ways: the species tables have
+separate species_name/common_name columns, farming writes
+"Python reticulatus (Reticulated Python)" and media uses loose names such as
+"Python" or "Indian Cobras". Every row is resolved once to a canonical key:
+
+    python-reticulatus   species (lowercase binomial)
+    python               genus, for rows that only name the genus
+
+and the rows of all five datasets are grouped by key into a join index, so a
+species view gathers its data with dictionary lookups instead of string
+matching. Keys are URL-safe and used in /species/<key>. `build_graph` saves
+the index as the `taxa` artifact, which is loaded instead of resolving every
+name again when it is current.
+"""
+
+import json
+import re
+import threading
+from src.utils.search import normalize_name
+
+# Name columns per dataset, most specific first
+TAXON_FIELDS = {
+    'us_snakes': ['species_name', 'common_name'],
+    'global_snakes': ['species_name', 'common_name'],
+    'domesticated_snakes': ['species_name', 'common_name'],
+    'farming': ['primary_species_farmed'],
+    'media_snakes': ['snake_species_portrayed'],
+}
+
+# Datasets with separate scientific and common name columns
+REFERENCE_DATASETS = ['global_snakes', 'us_snakes', 'domesticated_snakes']
+
+# "Genus species" with an optional "(Common Name)" after it
+_BINOMIAL = re.compile(r'^([A-Z][a-z]+) ([a-z]+)(?:\s*\((.+)\))?$')
+_PARENTHETICAL = re.compile(r'\s*\(.*?\)')
+
+def parse_binomial(name):
+    """Return (genus, epithet, common name or None) for a scientific name, else None"""
+    match = _BINOMIAL.match(str(name).strip())
+    return match.groups() if match else None
+
+def species_key(genus, epithet):
+    return f"{genus.lower()}-{epithet.lower()}"
+
+def genus_of(key):
+    """Genus part of a taxon key"""
+    return key.split('-', 1)[0]
+
+class TaxonResolver:
+    """Resolve free-form snake names to taxon keys
+
+    Scientific names resolve directly when their genus is known, so phrases
+    like "Desert snake" are not mistaken for binomials. Other names are looked
+    up among the registered common names (singular or plural) and finally
+    among known genera.
+    """
+
+    def __init__(self):
+        self.common_names = {}
+        self.genera = set()
+        self.names = {}
+
+    def add_species(self, scientific, common=None):
+        """Register a scientific name and its common name"""
+        parsed = parse_binomial(scientific)
+        if parsed is None:
+            return None
+        genus, epithet, inline_common = parsed
+        key = species_key(genus, epithet)
+        self.genera.add(genus.lower())
+        common = common if isinstance(common, str) and common.strip() else inline_common
+        names = self.names.setdefault(key, {'scientific': f"{genus} {epithet}", 'common': None})
+        if common:
+            self.common_names.setdefault(normalize_name(common), key)
+            names['common'] = names['common'] or common.strip()
+        return key
+
+    def resolve(self, name):
+        """Taxon key for a name, or None if it names no known species or genus"""
+        if not isinstance(name, str) or not name.strip():
+            return None
+        parsed = parse_binomial(name)
+        if parsed is not None and parsed[0].lower() in self.genera:
+            return species_key(parsed[0], parsed[1])
+
+        normalized = normalize_name(_PARENTHETICAL.sub('', name))
+        candidates = [normalized]
+        if normalized.endswith('s'):
+            candidates.append(normalized[:-1])
+        for candidate in candidates:
+            if candidate in self.common_names:
+                return self.common_names[candidate]
+        for candidate in candidates:
+            if candidate in self.genera:
+                return candidate
+        return None
+
+    def display_name(self, key):
+        """Human readable name for a taxon key"""
+        names = self.names.get(key)
+        if names is None:
+            return key.capitalize()
+        if names['common']:
+            return f"{names['common']} ({names['scientific']})"
+        return names['scientific']
+
+class TaxonIndex:
+    """Taxon key of every row plus the rows of each key, per dataset"""
+
+    def __init__(self, datasets):
+        self.resolver = TaxonResolver()
+        for name in REFERENCE_DATASETS:
+            df = datasets[name]
+            for scientific, common in zip(df['species_name'], df['common_name']):
+                self.resolver.add_species(scientific, common)
+        # Farming names carry their common name: "Python regius (Ball Python)"
+        for value in datasets['farming']['primary_species_farmed'].dropna().unique():
+            parsed = parse_binomial(value)
+            if parsed is not None and parsed[2]:
+                self.resolver.add_species(value)
+
+        # Resolve each distinct name once, then map the whole column
+        self.keys = {}
+        self.rows = {}
+        for name, columns in TAXON_FIELDS.items():
+            df = datasets[name]
+            keys = None
+            for column in columns:
+                values = df[column]
+                resolved = values.map({value: self.resolver.resolve(value) for value in values.dropna().unique()})
+                keys = resolved if keys is None else keys.fillna(resolved)
+            self.keys[name] = keys
+            for key, positions in keys.groupby(keys.to_numpy(), dropna=True).indices.items():
+                self.rows.setdefault(key, {})[name] = positions
+
+        self._index_genera()
+
+    def _index_genera(self):
+        self.genus_members = {}
+        for key in self.rows:
+            self.genus_members.setdefault(genus_of(key), []).append(key)
+
+    def to_json(self):
+        """The index as plain JSON data (the `taxa` artifact of build_graph)"""
+        return {
+            'resolver': {
+                'common_names': self.resolver.common_names,
+                'genera': sorted(self.resolver.genera),
+                'names': self.resolver.names,
+            },
+            'keys': {name: [key if isinstance(key, str) else None for key in keys] for name, keys in self.keys.items()},
+            'rows': {key: {name: positions.tolist() for name, positions in datasets.items()}
+                     for key, datasets in self.rows.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        """Rebuild an index saved with to_json without resolving any names"""
+        import numpy as np
+        import pandas as pd
+
+        index = cls.__new__(cls)
+        index.resolver = TaxonResolver()
+        index.resolver.common_names = data['resolver']['common_names']
+        index.resolver.genera = set(data['resolver']['genera'])
+        index.resolver.names = data['resolver']['names']
+        index.keys = {name: pd.Series(keys) for name, keys in data['keys'].items()}
+        index.rows = {key: {name: np.asarray(positions, dtype=np.int64) for name, positions in datasets.items()}
+                      for key, datasets in data['rows'].items()}
+        index._index_genera()
+        return index
+
+    def __contains__(self, key):
+        return key in self.rows or key in self.genus_members
+
+    def taxa(self):
+        """All keys that occur in at least one dataset"""
+        return sorted(self.rows)
+
+    def species_of_genus(self, genus):
+        """Species keys of a genus that occur in the datasets"""
+        return sorted(key for key in self.genus_members.get(genus, []) if '-' in key)
+
+    def lookup(self, key):
+        """Row positions per dataset for a key
+
+        A genus key also collects the rows of every species in the genus.
+        """
+        if '-' in key:
+            return self.rows.get(key, {})
+        merged = {}
+        for member in self.genus_members.get(key, []):
+            for name, positions in self.rows[member].items():
+                merged.setdefault(name, []).extend(positions)
+        return {name: sorted(positions) for name, positions in merged.items()}
+
+# (dataset versions, TaxonIndex), swapped as one tuple
+_index_state = None
+_index_lock = threading.Lock()
+
+def load_taxon_index():
+    """TaxonIndex from the prebuilt `taxa` artifact if it is current, else built from the datasets"""
+    from src.utils.build_graph import fresh_artifact
+    from src.utils.data_loader import get_dataset
+
+    path = fresh_artifact('taxa')
+    if path:
+        with open(path) as f:
+            return TaxonIndex.from_json(json.load(f))
+    return TaxonIndex({name: get_dataset(name) for name in TAXON_FIELDS})
+
+def get_taxon_index():
+    """Return the TaxonIndex for the current datasets, rebuilding it if they changed"""
+    global _index_state
+    from src.utils.data_loader import get_dataset_version
+
+    names = sorted(TAXON_FIELDS)
+    versions = tuple(get_dataset_version(name) for name in names)
+    state = _index_state
+    if state is None or state[0] != versions:
+        with _index_lock:
+            state = _index_state
+            if state is None or state[0] != versions:
+                state = (versions, load_taxon_index())
+                _index_state = state
+    return state[1]
+
+def resolve_taxon(name):
+    """Taxon key for a free-form name that occurs in the datasets, or None"""
+    index = get_taxon_index()
+    key = index.resolver.resolve(name)
+    return key if key is not None and key in index else None
+
+def get_taxon_rows(key):
+    """Rows of every dataset that refer to a taxon, as {dataset: DataFrame}"""
+    from src.utils.data_loader import get_dataset
+
+    return {
+        name: get_dataset(name).iloc[positions]
+        for name, positions in get_taxon_index().lookup(key).items()
+    }
@@ -0,0 +1,183 @@
+"""
+Schema validation of the raw datasets
+
+Usage:
+    python -m src.utils.validation [--write] [--output DIR]
+
+SCHEMAS declares, per dataset, what each column must hold: a type, a numeric
+range, a set of allowed values, a pattern, or simply a value at all. Every
+check is one vectorized operation over the whole column, so validation costs
+a handful of passes over the data however many rows there are.
+
+data_loader validates each dataset as it is read: rows that fail a check are
+quarantined (dropped from the frame the dashboard sees) and the report is
+kept with the cached frame and logged. Numeric columns are converted after the
+bad rows are gone, so one stray "unknown" no longer turns a whole score column
+into strings. The command line prints the reports and, with --write, saves the
+quarantined rows and a JSON report to QUARANTINE_DIR.
+"""
+
+import argparse
+import json
+import os
+import sys
+import pandas as pd
+from config import QUARANTINE_DIR
+
+# Row numbers listed per failed check in a report
+SAMPLE_ROWS = 10
+
+CONSERVATION_STATUSES = [
+    'Least Concern', 'Near Threatened', 'Vulnerable', 'Endangered',
+    'Critically Endangered', 'Extinct in the Wild', 'Extinct', 'Data Deficient',
+]
+YES_NO = ['Yes', 'No']
+SCORE = {'type': 'number', 'min': 0, 'max': 10}
+LENGTH = {'type': 'number', 'min': 0, 'required': True}
+
+# Comma-separated two-letter state codes ("FL,GA,SC") or a description of a
+# wider range ("All lower 48 states")
+STATE_LIST = r'[A-Z]{2}(\s*,\s*[A-Z]{2})*|All .+'
+
+SNAKE_SPECIES_SCHEMA = {
+    'species_name': {'required': True},
+    'common_name': {'required': True},
+    'avg_length_cm': LENGTH,
+    'max_length_cm': LENGTH,
+    'venomous': {'required': True, 'allowed': YES_NO},
+    'venom_type': {'allowed': ['Hemotoxic', 'Neurotoxic', 'Cytotoxic', 'Mild']},
+    'lethality_score': {**SCORE, 'required': True},
+    'conservation_status': {'allowed': CONSERVATION_STATUSES},
+    'invasive': {'allowed': YES_NO},
+}
+
+# Dataset -> column -> checks. Columns without checks are not validated.
+SCHEMAS = {
+    'us_snakes': {
+        **SNAKE_SPECIES_SCHEMA,
+        'states': {'required': True, 'pattern': STATE_LIST},
+    },
+    'global_snakes': {
+        **SNAKE_SPECIES_SCHEMA,
+        'continent': {'required': True},
+        'countries': {'required': True},
+    },
+    'domesticated_snakes': {
+        'species_name': {'required': True},
+        'common_name': {'required': True},
+        'popularity_score': {**SCORE, 'required': True},
+        'avg_cost_usd': {'type': 'number', 'min': 0},
+        'care_difficulty': {'required': True, 'allowed': ['Beginner', 'Intermediate', 'Advanced']},
+        'avg_lifespan_years': {'pattern': r'\d+(\.\d+)?(\s*-\s*\d+(\.\d+)?)?'},
+    },
+    'media_snakes': {
+        'title': {'required': True},
+        'media_type': {'required': True},
+        'accuracy_rating': SCORE,
+    },
+    'farming': {
+        'country': {'required': True},
+        'ethical_score': SCORE,
+        'annual_production_skins': {'pattern': r'[<>~]?\s*\d[\d,]*'},
+        'certification_available': {'allowed': ['Yes', 'No', 'Limited']},
+    },
+}
+
+def _check_column(series, rules):
+    """Yield (check name, mask of failing rows) for one column"""
+    present = series.notna()
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        present &= series.astype('string').str.strip() != ''
+
+    if rules.get('required'):
+        yield 'required', ~present
+
+    values = series
+    if rules.get('type') == 'number':
+        values = pd.to_numeric(series, errors='coerce')
+        yield 'number', present & values.isna()
+    if 'min' in rules:
+        yield f"min {rules['min']}", values < rules['min']
+    if 'max' in rules:
+        yield f"max {rules['max']}", values > rules['max']
+    if 'allowed' in rules:
+        yield 'allowed values', present & ~series.isin(rules['allowed'])
+    if 'pattern' in rules:
+        matches = series.astype('string').str.fullmatch(rules['pattern']).fillna(False).astype(bool)
+        yield 'pattern', present & ~matches
+
+def validate(name, df):
+    """Split a dataset into (valid rows, quarantined rows, report)
+
+    Only the schema columns present in df are checked, so chunks read with
+    usecols are validated too. Numeric columns of the valid rows are
+    converted to numbers.
+    """
+    schema = SCHEMAS.get(name, {})
+    bad = pd.Series(False, index=df.index)
+    issues = []
+    for column, rules in schema.items():
+        if column not in df.columns:
+            continue
+        for check, mask in _check_column(df[column], rules):
+            count = int(mask.sum())
+            if count:
+                bad |= mask
+                issues.append({
+                    'column': column,
+                    'check': check,
+                    'count': count,
+                    # Line numbers in the CSV file (header is line 1)
+                    'lines': [int(i) + 2 for i in df.index[mask.to_numpy()][:SAMPLE_ROWS]],
+                })
+
+    valid = df[~bad]
+    quarantined = df[bad]
+    for column, rules in schema.items():
+        if rules.get('type') == 'number' and column in valid.columns and valid[column].dtype.kind not in 'biuf':
+            valid = valid.assign(**{column: pd.to_numeric(valid[column], errors='coerce')})
+
+    report = {
+        'dataset': name,
+        'rows': len(df),
+        'quarantined': len(quarantined),
+        'issues': issues,
+    }
+    return valid, quarantined, report
+
+def format_report(report):
+    """Human readable lines for one dataset's report"""
+    status = 'OK' if not report['quarantined'] else 'WARN'
+    lines = [f"[{status}] {report['dataset']}: {report['rows']:,} rows, {report['quarantined']:,} quarantined"]
+    for issue in report['issues']:
+        sample = ', '.join(str(line) for line in issue['lines'])
+        more = ', ...' if issue['count'] > len(issue['lines']) else ''
+        lines.append(f"    {issue['column']}: {issue['count']:,} failed '{issue['check']}' (lines {sample}{more})")
+    return lines
+
+def write_quarantine(name, quarantined, report, output_dir=QUARANTINE_DIR):
+    """Save a dataset's quarantined rows and report to output_dir"""
+    os.makedirs(output_dir, exist_ok=True)
+    quarantined.to_csv(os.path.join(output_dir, f'{name}.csv'))
+    with open(os.path.join(output_dir, f'{name}.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+
+def main(argv=None):
+    from src.utils.data_loader import DATASET_FILES, read_raw_dataset
+
+    parser = argparse.ArgumentParser(description='Validate the raw datasets against their schemas')
+    parser.add_argument('--write', action='store_true', help='Save quarantined rows and reports')
+    parser.add_argument('--output', default=QUARANTINE_DIR, help='Where --write saves them')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name in DATASET_FILES:
+        _, quarantined, report = validate(name, read_raw_dataset(name))
+        print('\n'.join(format_report(report)))
+        if args.write:
+            write_quarantine(name, quarantined, report, args.output)
+        failed |= bool(report['quarantined'])
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,29 +2,122 @@
 Visualization utilities for creating charts and maps
 """
 
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 from config import LETHALITY_COLORS, COLORS
+from src.utils.rankings import top_rows
+
+# Integer dtypes plotly.js reads as typed arrays, smallest first
+INTEGER_DTYPES = [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32]
+
+def compact_array(values):
+    """values in the smallest dtype that holds them exactly, or None if not numeric
+
+    Whole numbers become 8 to 32 bit integers and other floats become
+    float32 when that round-trips.
+    """
+    array = np.asarray(values)
+    if array.dtype.kind not in 'iuf' or not array.size:
+        return None
+    if array.dtype.kind == 'f':
+        # Whole numbers are only converted within the range of the widest
+        # integer dtype used; larger ones would wrap around in astype
+        whole = np.isfinite(array).all() and np.array_equal(array, np.round(array))
+        if whole and np.iinfo(np.int32).min <= array.min() and array.max() <= np.iinfo(np.uint32).max:
+            array = array.astype(np.int64)
+        else:
+            narrowed = array.astype(np.float32)
+            return narrowed if np.array_equal(narrowed, array, equal_nan=True) else array
+    low, high = array.min(), array.max()
+    for dtype in INTEGER_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return array.astype(dtype)
+    return array
+
+def _array_paths(props, prefix=''):
+    """Yield (path, value) of the array-valued properties of a trace"""
+    for key, value in props.items():
+        if isinstance(value, dict):
+            yield from _array_paths(value, f'{prefix}{key}.')
+        elif isinstance(value, (np.ndarray, list, tuple)):
+            yield f'{prefix}{key}', value
+
+def compact_figure(fig):
+    """Narrow the numeric arrays of a figure's traces (see compact_array)
+
+    plotly 6+ sends numpy arrays to the browser as base64 typed arrays
+    (requirements.txt pins it), so this turns JSON number lists and float64
+    columns into binary data a quarter to an eighth of the size that
+    plotly.js reads without parsing.
+    """
+    for trace in fig.data:
+        for path, values in list(_array_paths(trace.to_plotly_json())):
+            compact = compact_array(values)
+            if compact is not None and (not isinstance(values, np.ndarray) or compact.dtype != values.dtype):
+                # plotly skips assignments of equal values, whatever their dtype
+                trace[path] = None
+                trace[path] = compact
+    return fig
+
+# numpy dtype -> plotly.js typed array code
+TYPED_ARRAY_CODES = {
+    'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+    'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8',
+}
+
+def typed_array_spec(values):
+    """plotly.js typed array ({'dtype', 'bdata'}) of a numeric array, or a plain list"""
+    array = np.asarray(values)
+    if array.ndim != 1 or array.dtype.name not in TYPED_ARRAY_CODES:
+        return array.tolist()
+    import base64
+
+    data = array.astype(array.dtype.newbyteorder('<'), copy=False).tobytes()
+    return {'dtype': TYPED_ARRAY_CODES[array.dtype.name], 'bdata': base64.b64encode(data).decode('ascii')}
+
+# Array-valued trace properties that are styling rather than data
+STYLE_ARRAYS = {'colorscale'}
+
+def figure_patch(fig, layout_paths=()):
+    """Dash Patch that swaps in the trace data of fig, for a graph already showing its builder's output
+
+    Only the array properties of each trace (x, y, lat, marker.size, ...) and
+    the given layout properties (e.g. 'title.text') are sent; the layout,
+    template, colorscales and styling already in the browser are kept. fig
+    must have as many traces as the figure on the page.
+    """
+    from dash import Patch
+
+    patch = Patch()
+    for index, trace in enumerate(fig.data):
+        for path, values in _array_paths(trace.to_plotly_json()):
+            *parents, key = path.split('.')
+            if key in STYLE_ARRAYS:
+                continue
+            target = patch['data'][index]
+            for parent in parents:
+                target = target[parent]
+            target[key] = typed_array_spec(values)
+    layout = fig.layout
+    for path in layout_paths:
+        *parents, key = path.split('.')
+        target, value = patch['layout'], layout
+        for parent in parents:
+            target, value = target[parent], value[parent]
+        target[key] = value[key]
+    return patch
 
 def create_lethality_heatmap(df, title="Snake Lethality Heatmap"):
     """Create a choropleth map showing lethality by region"""
-    # For US data, we need to expand the states column
+    # For US data, a snake counts in every state of its 'states' list
     if 'states' in df.columns:
-        # Create a row for each state a snake is found in
-        rows = []
-        for _, row in df.iterrows():
-            if pd.notna(row['states']):
-                states = row['states'].split(',')
-                for state in states:
-                    new_row = row.copy()
-                    new_row['state'] = state.strip()
-                    rows.append(new_row)
-
-        expanded_df = pd.DataFrame(rows)
+        from src.utils.data_loader import grouped_stats
 
         # Calculate average lethality per state
-        state_lethality = expanded_df.groupby('state')['lethality_score'].mean().reset_index()
+        state_lethality = grouped_stats(df, 'lethality_score', 'states')['mean'].rename_axis('state').reset_index()
         state_lethality.columns = ['state', 'avg_lethality']
 
         # Create choropleth map
@@ -44,7 +137,7 @@ def create_lethality_heatmap(df, title="Snake Lethality Heatmap"):
             height=600
         )
 
-        return fig
+        return compact_figure(fig)
 
     return None
 
@@ -64,7 +157,7 @@ def create_size_distribution(df, title="Snake Size Distribution"):
         height=400
     )
 
-    return fig
+    return compact_figure(fig)
 
 def create_venom_type_pie(df, title="Venom Types"):
     """Create a pie chart showing distribution of venom types"""
@@ -80,7 +173,7 @@ def create_venom_type_pie(df, title="Venom Types"):
 
     fig.update_layout(height=400)
 
-    return fig
+    return compact_figure(fig)
 
 def create_conservation_status_bar(df, title="Conservation Status"):
     """Create a bar chart of conservation status"""
@@ -100,11 +193,11 @@ def create_conservation_status_bar(df, title="Conservation Status"):
         height=400
     )
 
-    return fig
+    return compact_figure(fig)
 
 def create_top_species_bar(df, metric, n=10, title="Top Species"):
     """Create a bar chart of top N species by a given metric"""
-    top_species = df.nlargest(n, metric)[['common_name', metric]]
+    top_species = top_rows(df, metric, n)[['common_name', metric]]
 
     fig = px.bar(
         top_species,
@@ -122,7 +215,39 @@ def create_top_species_bar(df, metric, n=10, title="Top Species"):
         height=400
     )
 
-    return fig
+    return compact_figure(fig)
+
+def rank_rows(df, label, value, n, order='desc'):
+    """The n rows with the highest value, ordered by value ('desc', 'asc') or by label ('name')"""
+    top = top_rows(df[[label, value]], value, n or len(df))
+    if order == 'asc':
+        return top.iloc[::-1]
+    if order == 'name':
+        return top.sort_values(label, kind='stable')
+    return top
+
+def create_ranked_bar(df, label, value, n=10, order='desc', title="Top {n}", labels=None,
+                      color_scale='Viridis', height=400):
+    """Create a vertical bar chart of the top n rows by value
+
+    title may contain '{n}'. The same ranking runs in the browser for
+    src/components/ranked_bar.py, so the trace layout here must stay simple:
+    one bar trace with x = labels, y = values and marker.color = values.
+    """
+    top = rank_rows(df, label, value, n, order)
+    fig = px.bar(
+        top,
+        x=label,
+        y=value,
+        title=title.format(n=len(top)),
+        labels=labels or {},
+        color=value,
+        color_continuous_scale=color_scale
+    )
+
+    fig.update_layout(height=height, xaxis_tickangle=-45)
+
+    return compact_figure(fig)
 
 def create_scatter_size_vs_lethality(df, title="Size vs Lethality"):
     """Create a scatter plot of size vs lethality"""
@@ -145,7 +270,7 @@ def create_scatter_size_vs_lethality(df, title="Size vs Lethality"):
 
     fig.update_layout(height=500)
 
-    return fig
+    return compact_figure(fig)
 
 def create_invasive_species_indicator(df):
     """Create indicator cards for invasive species"""
@@ -154,3 +279,74 @@ def create_invasive_species_indicator(df):
         'count': len(invasive),
         'species_list': invasive['common_name'].tolist()
     }
+
+def create_occurrence_density_map(lat, lon, counts, center, zoom, title="Snake Sightings"):
+    """Create a map of occurrence cells sized and colored by sighting count"""
+    fig = go.Figure(go.Scattermap(
+        # Cell centers; float32 is exact to about a meter
+        lat=np.asarray(lat, dtype=np.float32),
+        lon=np.asarray(lon, dtype=np.float32),
+        mode='markers',
+        marker=dict(
+            size=np.clip(4 + 3 * np.log10(np.maximum(counts, 1)), 4, 24).astype(np.float32),
+            color=np.log10(np.maximum(counts, 1)).astype(np.float32),
+            colorscale='YlOrRd',
+            opacity=0.7,
+            colorbar=dict(title="Sightings (log10)"),
+        ),
+        customdata=counts,
+        hovertemplate="%{customdata:,} sightings<extra></extra>",
+    ))
+
+    fig.update_layout(
+        title_text=title,
+        map=dict(style='carto-positron', center=dict(lat=center[0], lon=center[1]), zoom=zoom),
+        # Keep the user's pan and zoom when the cells are refreshed
+        uirevision='occurrence-map',
+        margin=dict(l=0, r=0, t=40, b=0),
+        height=600
+    )
+
+    return compact_figure(fig)
+
+def create_country_choropleth(stats, title="Snakes by Country"):
+    """Create a world map of per-country stats with buttons to switch the metric"""
+    metrics = [
+        ('species_count', 'Species', 'Greens'),
+        ('venomous_count', 'Venomous Species', 'Oranges'),
+        ('avg_lethality', 'Average Lethality', 'Reds'),
+    ]
+
+    fig = go.Figure()
+    for index, (column, label, colorscale) in enumerate(metrics):
+        fig.add_trace(go.Choropleth(
+            locations=stats['iso3'],
+            z=stats[column],
+            locationmode='ISO-3',
+            text=stats['country'],
+            colorscale=colorscale,
+            colorbar_title=label,
+            name=label,
+            visible=index == 0,
+            hovertemplate="%{text}<br>" + label + ": %{z:.3~f}<extra></extra>",
+        ))
+
+    fig.update_layout(
+        title_text=title,
+        geo=dict(showframe=False, projection_type='natural earth'),
+        updatemenus=[dict(
+            type='buttons',
+            direction='right',
+            x=0,
+            y=1.08,
+            xanchor='left',
+            buttons=[
+                dict(label=label, method='update',
+                     args=[{'visible': [other == index for other in range(len(metrics))]}])
+                for index, (_, label, _) in enumerate(metrics)
+            ],
+        )],
+        height=550
+    )
+
+    return compact_figure(fig)